@@ -1,24 +1,35 @@
 import os
+import re
+import sys
 import glob
 
 from datetime import datetime
+from html import unescape
+from operator import itemgetter
 
 
-def fileRead(folderPathName):
+def find_engine_files(folderPathName):
+    """
+    All .htm / .html files under the folder (recursive), from a single walk.
+    .htm files come first, then .html, same order as the old two-glob search.
+    """
     folderPath = folderPathName.strip().strip('"').strip("'")  # tiny cleanup
-    engineFileList = []
+    htmFiles = []
+    htmlFiles = []
+    for fileName in glob.glob(os.path.join(folderPath, '**', '*.htm*'), recursive=True):
+        ext = os.path.splitext(fileName)[1].lower()
+        if ext == '.htm':
+            htmFiles.append(fileName)
+        elif ext == '.html':
+            htmlFiles.append(fileName)
+    return htmFiles + htmlFiles
 
-    # search .htm recursively
-    for fileName in glob.glob(os.path.join(folderPath, '**', '*.htm'), recursive=True):
-        with open(fileName, 'r', encoding='utf-8', errors='ignore') as f:
-            text = f.read()
-            engineFileList.append(text)
-            # engineFileList.append("NEXT SET OF TEXT ...\n\n")
-            print(fileName)
-            print(len(text))
 
-    # search .html recursively
-    for fileName in glob.glob(os.path.join(folderPath, '**', '*.html'), recursive=True):
+def fileRead(folderPathName):
+    engineFileList = []
+
+    # search .htm and .html recursively
+    for fileName in find_engine_files(folderPathName):
         with open(fileName, 'r', encoding='utf-8', errors='ignore') as f:
             text = f.read()
             engineFileList.append(text)
@@ -36,7 +47,170 @@ def fileRead(folderPathName):
 """
 
 
-def htmlToList(engineFileList):  # takes in a list of the read files with each entry of the list being an entire html text document.
+# Number of data-sort values expected after the game name on a SteamDB row:
+# discount, price, rating, release, follows, online, peak
+EXPECTED_ROW_VALUES = 7
+
+
+class ParseReport:
+    """
+    Parse telemetry for one HTML file (one engine page), filled in by htmlToList.
+
+    rows_seen / rows_kept count game rows, skipped counts dropped rows by
+    reason, defaulted counts kept rows where a field fell back to -1 or
+    "Unreleased", and value_counts records how many data-sort values each row
+    had (a change there usually means SteamDB changed its table layout).
+    """
+
+    def __init__(self, engine_name):
+        self.engine_name = engine_name
+        self.rows_seen = 0
+        self.rows_kept = 0
+        self.skipped = {}       # reason -> rows
+        self.defaulted = {}     # field -> rows
+        self.value_counts = {}  # number of data-sort values -> rows
+        self.header = None      # column names of the table header (None = no header found)
+        self.expected_values = EXPECTED_ROW_VALUES
+
+    def skip(self, reason):
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def record_kept(self, game, n_vals):
+        self.rows_kept += 1
+        self.value_counts[n_vals] = self.value_counts.get(n_vals, 0) + 1
+        for field, missing in (("cost", game.cost == -1),
+                               ("rating", game.rating == -1),
+                               ("releaseDate", game.releaseDate == "Unreleased"),
+                               ("topPlayerCount", game.topPlayerCount == -1)):
+            if missing:
+                self.defaulted[field] = self.defaulted.get(field, 0) + 1
+
+    def layout_drift(self):
+        """True if the table had no header or a row had an unexpected number of values."""
+        return self.header is None or any(n != self.expected_values for n in self.value_counts)
+
+    def to_dict(self):
+        return {
+            "engine_name": self.engine_name,
+            "rows_seen": self.rows_seen,
+            "rows_kept": self.rows_kept,
+            "skipped": dict(self.skipped),
+            "defaulted": dict(self.defaulted),
+            "value_counts": dict(self.value_counts),
+            "header": list(self.header) if self.header is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        """Inverse of to_dict (value_counts keys may come back from JSON as strings)."""
+        report = cls(d["engine_name"])
+        report.rows_seen = d["rows_seen"]
+        report.rows_kept = d["rows_kept"]
+        report.skipped = dict(d["skipped"])
+        report.defaulted = dict(d["defaulted"])
+        report.value_counts = {int(n): rows for n, rows in d["value_counts"].items()}
+        report.header = tuple(d["header"]) if d["header"] is not None else None
+        return report
+
+
+# Game fields read from a row's data-sort values, by SteamDB header column name
+LAYOUT_FIELDS = ("price", "rating", "release", "followers", "online", "peak")
+
+_DATA_SORT_RE = re.compile(r'data-sort="([^"]*)"')
+_TH_NAME_RE = re.compile(r'<th\b[^>]*?\sdata-name="([^"]*)"')
+
+# header signature (tuple of column names) -> RowLayout
+_LAYOUT_CACHE = {}
+
+
+class RowLayout:
+    """
+    Column mapping for one table layout, compiled once from the header.
+
+    Every column after "name" carries a data-sort value on each row, so the
+    header gives the position of each field in parse_row_vals() output.
+    extract(vals) returns the raw values for LAYOUT_FIELDS ("" for columns
+    this layout doesn't have), or None if the row doesn't match the header.
+    """
+
+    def __init__(self, signature):
+        self.signature = signature
+        if "name" in signature:
+            columns = signature[signature.index("name") + 1:]
+        else:
+            columns = signature
+        self.width = len(columns)
+        positions = {col: i for i, col in enumerate(columns)}
+        indices = tuple(positions.get(field) for field in LAYOUT_FIELDS)
+        self.missing = tuple(f for f, i in zip(LAYOUT_FIELDS, indices) if i is None)
+
+        if not self.missing:
+            self._get = itemgetter(*indices)
+        else:
+            def _get(vals):
+                return tuple(vals[i] if i is not None else "" for i in indices)
+            self._get = _get
+
+    def extract(self, vals):
+        if len(vals) != self.width:
+            return None
+        return self._get(vals)
+
+
+class _LegacyRowLayout:
+    """Fallback for pages without a table header: fixed offsets from the end of the row."""
+
+    signature = None
+    width = EXPECTED_ROW_VALUES
+    missing = ()
+
+    def extract(self, vals):
+        if len(vals) < 6:
+            return None
+        # work from the end so we’re robust to discount / extra columns
+        # [.., price (cents), rating, release, follows, online, peak]
+        return vals[-6], vals[-5], vals[-4], vals[-3], vals[-2], vals[-1]
+
+
+_LEGACY_LAYOUT = _LegacyRowLayout()
+
+
+def table_layout(html, theadStart):
+    """
+    Read the <thead> starting at theadStart and return its RowLayout,
+    compiling it only the first time this header signature is seen.
+    Returns (layout, end of the header).
+    """
+    theadEnd = html.find("</thead>", theadStart)
+    if theadEnd == -1:
+        return _LEGACY_LAYOUT, theadStart
+    signature = tuple(_TH_NAME_RE.findall(html, theadStart, theadEnd))
+    if not signature:
+        return _LEGACY_LAYOUT, theadEnd
+    layout = _LAYOUT_CACHE.get(signature)
+    if layout is None:
+        layout = _LAYOUT_CACHE[signature] = RowLayout(signature)
+    return layout, theadEnd
+
+
+def normalize_title(raw, titles):
+    """
+    Entity-decoded, trimmed title for the markup between the link's '>' and '</a>'.
+    titles maps raw markup -> title, so each distinct title in one parse is
+    decoded once and stored as one interned str shared by every row that has it.
+    """
+    title = titles.get(raw)
+    if title is None:
+        title = titles[raw] = sys.intern(unescape(raw).strip())
+    return title
+
+
+def htmlToList(engineFileList, reports=None, titles=None):  # takes in a list of the read files with each entry of the list being an entire html text document.
+    # reports: optional list; one ParseReport per file is appended to it
+    # titles: optional raw -> title table (see normalize_title) to share between
+    # calls for one dataset; by default each call uses its own, dropped when it returns
+    if titles is None:
+        titles = {}
     engineList = []   # contains a list of all engines and the names of the titles
     tempList = []     # used in the loop to make a list for each engine
 
@@ -57,25 +231,12 @@ def htmlToList(engineFileList):  # takes in a list of the read files with each e
             return "-1"
         return raw
 
-    def parse_row_vals(chunk):
+    def parse_row_vals(text, start, end):
         """
-        Given the HTML between the game name </a> and the closing </tr>,
-        return all data-sort= '...' values in order.
+        Given the position of the game name </a> and the closing </tr>,
+        return all data-sort= '...' values in between, in order.
         """
-        vals = []
-        marker = 'data-sort="'
-        s = 0
-        while True:
-            pos = chunk.find(marker, s)
-            if pos == -1:
-                break
-            vs = pos + len(marker)
-            ve = chunk.find('"', vs)
-            if ve == -1:
-                break
-            vals.append(chunk[vs:ve])
-            s = ve + 1
-        return vals
+        return _DATA_SORT_RE.findall(text, start, end)
 
     for lineString in engineFileList:
         tempList.clear()
@@ -86,8 +247,17 @@ def htmlToList(engineFileList):  # takes in a list of the read files with each e
         engine_name = lineString[titleStart:titleEnd]
         tempList.append(engine_name)
 
+        report = None
+        if reports is not None:
+            report = ParseReport(engine_name)
+            reports.append(report)
+
         tempPosition = titleEnd
 
+        # ----- column layout from the table header -----
+        layout = _LEGACY_LAYOUT
+        nextHeader = lineString.find("<thead", tempPosition)
+
         # ----- loop over each game row -----
         while True:
             # find the next game name link
@@ -95,37 +265,47 @@ def htmlToList(engineFileList):  # takes in a list of the read files with each e
             if nameStart == -1:
                 break
 
+            # rows after a header belong to that header's table
+            while nextHeader != -1 and nextHeader < nameStart:
+                layout, headerEnd = table_layout(lineString, nextHeader)
+                nextHeader = lineString.find("<thead", headerEnd)
+                if report is not None:
+                    report.header = layout.signature
+                    report.expected_values = layout.width
+
+            if report is not None:
+                report.rows_seen += 1
+
             nameEnd = lineString.find('</a>', nameStart)
-            tempNameChunk = lineString[nameStart + len('<a class="b" href="'):nameEnd]
-
-            # clean ID + title
-            tempNameChunk = (tempNameChunk
-                             .replace('/app/', '')
-                             .replace('/"', '')
-                             .replace("&apos;", "'")
-                             .replace("&quot;", '"'))
-            gt_pos = tempNameChunk.find(">")
-            tempID = tempNameChunk[:gt_pos]
-            tempName = tempNameChunk[gt_pos + 1:]
+            if nameEnd == -1:
+                if report is not None:
+                    report.skip("unterminated_name")
+                break
+            # href="/app/<id>/">title</a>: id as int, title decoded once (see normalize_title)
+            linkStart = nameStart + len('<a class="b" href="')
+            gt_pos = lineString.find(">", linkStart, nameEnd)
+            if gt_pos == -1:
+                gt_pos = nameEnd   # no title text
+            href = lineString[linkStart:gt_pos]
+            slash = href.find("/", len("/app/"))
+            tempID = href[len("/app/"):slash] if href.startswith("/app/") and slash != -1 else -1
+            tempName = normalize_title(lineString[gt_pos + 1:nameEnd], titles)
 
             # limit ourselves to this <tr> only
             rowEnd = lineString.find('</tr>', nameEnd)
             if rowEnd == -1:
+                if report is not None:
+                    report.skip("unterminated_row")
                 break
-            row_chunk = lineString[nameEnd:rowEnd]
-
-            # collect all data-sort values in the row
-            vals = parse_row_vals(row_chunk)
-            # expected: [appid, discount, price, rating, release, follows, online, peak]
-            if len(vals) < 6:
+            # collect all data-sort values in the row and map them by header column
+            vals = parse_row_vals(lineString, nameEnd, rowEnd)
+            fields = layout.extract(vals)
+            if fields is None:
+                if report is not None:
+                    report.skip("too_few_values" if layout is _LEGACY_LAYOUT else "column_mismatch")
                 tempPosition = rowEnd
                 continue
-
-            # work from the end so we’re robust to discount / extra columns
-            price_raw   = vals[-6]  # cents
-            rating_raw  = vals[-5]
-            release_raw = vals[-4]
-            peak_raw    = vals[-1]
+            price_raw, rating_raw, release_raw, follows_raw, online_raw, peak_raw = fields
 
             tempCost           = _normalize_price(price_raw)
             tempRating         = _normalize_simple(rating_raw)
@@ -133,8 +313,11 @@ def htmlToList(engineFileList):  # takes in a list of the read files with each e
             tempTopPlayerCount = _normalize_simple(peak_raw)
 
             tempGame = Game(tempID, tempName, tempCost,
-                            tempRating, tempRelease, tempTopPlayerCount)
+                            tempRating, tempRelease, tempTopPlayerCount,
+                            _normalize_simple(follows_raw), _normalize_simple(online_raw))
             tempList.append(tempGame)
+            if report is not None:
+                report.record_kept(tempGame, len(vals))
 
             # move on to the next row
             tempPosition = rowEnd
@@ -146,33 +329,52 @@ def htmlToList(engineFileList):  # takes in a list of the read files with each e
 
 
 class Game:
-    def __init__(self, id, title, cost, rating, releaseDate, topPlayerCount):
-        self.id = id
+    # one instance per parsed row, so no per-instance __dict__
+    __slots__ = ("id", "title", "cost", "rating", "releaseDate", "topPlayerCount",
+                 "follows", "online", "revenueEstimate")
+
+    def __init__(self, id, title, cost, rating, releaseDate, topPlayerCount,
+                 follows=-1, online=-1):
+        # Steam app id as an int (-1 if the link had none)
+        try:
+            self.id = int(id)
+        except (TypeError, ValueError):
+            self.id = -1
         self.title = title
+        # only conversion failures fall back to -1 / "Unreleased";
+        # anything else is a real bug and should not be swallowed
         try:
             # self.cost = cost
             self.cost = float(cost)
-        except:
+        except (TypeError, ValueError):
             self.cost = -1
         try:
             self.rating = float(rating)
-        except:
+        except (TypeError, ValueError):
             self.rating = -1
         # self.releaseDate = releaseDate
         try:
             # self.releaseDate = releaseDate
             self.releaseDate = datetime.fromtimestamp(int(releaseDate))
-        except:
+        except (TypeError, ValueError, OverflowError, OSError):
             self.releaseDate = "Unreleased"
         try:
             # self.topPlayerCount = topPlayerCount
             self.topPlayerCount = float(topPlayerCount)  # will be -1 if no top player count
-        except:
+        except (TypeError, ValueError):
             self.topPlayerCount = -1
         try:
-            # self.revenueEstimate = "estimated"
-            self.revenueEstimate = float(cost) * float(topPlayerCount)  # changing this to just make it quick to push
-        except:
+            self.follows = int(follows)
+        except (TypeError, ValueError):
+            self.follows = -1
+        try:
+            self.online = int(online)
+        except (TypeError, ValueError):
+            self.online = -1
+        # default estimate (price x peak players); other models live in revenue_models.py
+        if self.cost >= 0 and self.topPlayerCount >= 0:
+            self.revenueEstimate = self.cost * self.topPlayerCount
+        else:
             self.revenueEstimate = -1
 
     def __repr__(self):
@@ -201,40 +403,13 @@ def build_engine_dict(engineList):
     return engine_dict
 
 
-def _safe_avg(values):
-    usable = [v for v in values if v is not None and v >= 0]
-    if not usable:
-        return None
-    return sum(usable) / len(usable)
-
-
-def _safe_max(values):
-    usable = [v for v in values if v is not None and v >= 0]
-    if not usable:
-        return None
-    return max(usable)
-
-
 def compute_engine_stats(engine_name, games):
     """
     Given an engine name and its list of Game objects,
-    compute averages and max for cost, rating, and top players.
+    compute averages and max for cost, rating, top players and
+    estimated revenue (same single pass as compute_stats_matrix).
     """
-    costs = [g.cost for g in games]
-    ratings = [g.rating for g in games]
-    players = [g.topPlayerCount for g in games]
-
-    stats = {
-        "engine_name": engine_name,
-        "num_games": len(games),
-        "avg_cost": _safe_avg(costs),
-        "max_cost": _safe_max(costs),
-        "avg_rating": _safe_avg(ratings),
-        "max_rating": _safe_max(ratings),
-        "avg_players": _safe_avg(players),
-        "max_players": _safe_max(players),
-    }
-    return stats
+    return compute_stats_matrix({engine_name: games})[0]
 
 
 def filter_games_by_rating_range(engine_dict, min_rating, max_rating):
@@ -254,24 +429,107 @@ def filter_games_by_rating_range(engine_dict, min_rating, max_rating):
     return results
 
 
-def compare_engines(engine_dict, engine_names):
+# Columns of the engine x metric table built by compute_stats_matrix.
+# Any of these can be used as a sort / rank key.
+STAT_COLUMNS = [
+    "engine_name", "num_games",
+    "avg_cost", "max_cost",
+    "avg_rating", "max_rating",
+    "avg_players", "max_players",
+    "avg_revenue", "max_revenue",
+]
+
+
+def compute_stats_matrix(engine_dict, engine_names=None):
     """
-    Given a list of engine names (strings), return list of stats dicts
-    for engines that exist in engine_dict.
+    Compute the full engine x metric table in one pass over the games.
+
+    Every game is visited exactly once; sums, counts and maxima for price,
+    rating, peak players and estimated revenue are accumulated together
+    instead of building a separate list per metric.  Values < 0 mean
+    "missing" and are ignored.
+
+    engine_names: optional list of exact engine names (default: all engines).
+    Returns a list of stats dicts with the keys in STAT_COLUMNS.
     """
-    stats_list = []
-    for raw_name in engine_names:
-        name = raw_name.strip()
-        if not name:
-            continue
-        # simple case-insensitive match
-        matches = [e for e in engine_dict.keys() if e.lower() == name.lower()]
-        if not matches:
+    if engine_names is None:
+        engine_names = list(engine_dict.keys())
+
+    matrix = []
+    for engine_name in engine_names:
+        games = engine_dict.get(engine_name)
+        if games is None:
             continue
-        engine_name = matches[0]
-        games = engine_dict[engine_name]
-        stats_list.append(compute_engine_stats(engine_name, games))
-    return stats_list
+
+        # [sum, count, max] per metric
+        cost = [0.0, 0, None]
+        rating = [0.0, 0, None]
+        players = [0.0, 0, None]
+        revenue = [0.0, 0, None]
+
+        for g in games:
+            c = g.cost
+            p = g.topPlayerCount
+            for acc, v in ((cost, c), (rating, g.rating), (players, p)):
+                if v is not None and v >= 0:
+                    acc[0] += v
+                    acc[1] += 1
+                    if acc[2] is None or v > acc[2]:
+                        acc[2] = v
+            # revenue only counts when both price and players are known
+            if c is not None and c >= 0 and p is not None and p >= 0:
+                r = c * p
+                revenue[0] += r
+                revenue[1] += 1
+                if revenue[2] is None or r > revenue[2]:
+                    revenue[2] = r
+
+        def _avg(acc):
+            return acc[0] / acc[1] if acc[1] else None
+
+        matrix.append({
+            "engine_name": engine_name,
+            "num_games": len(games),
+            "avg_cost": _avg(cost),
+            "max_cost": cost[2],
+            "avg_rating": _avg(rating),
+            "max_rating": rating[2],
+            "avg_players": _avg(players),
+            "max_players": players[2],
+            "avg_revenue": _avg(revenue),
+            "max_revenue": revenue[2],
+        })
+    return matrix
+
+
+def rank_stats(stats_list, sort_key, descending=True, columns=STAT_COLUMNS):
+    """
+    Sort a stats table by any column and number the rows (adds a "rank" key).
+    Missing values (None) always go to the bottom, whatever the direction.
+    columns: the valid sort keys (sketches.SKETCH_COLUMNS for sketch stats).
+    """
+    if sort_key not in columns:
+        raise ValueError(f"Unknown stats column: {sort_key}")
+
+    present = [s for s in stats_list if s.get(sort_key) is not None]
+    missing = [s for s in stats_list if s.get(sort_key) is None]
+    if sort_key == "engine_name":
+        present.sort(key=lambda s: s["engine_name"].lower(), reverse=descending)
+    else:
+        present.sort(key=lambda s: s[sort_key], reverse=descending)
+
+    ranked = []
+    for i, s in enumerate(present + missing, start=1):
+        row = dict(s)
+        row["rank"] = i
+        ranked.append(row)
+    return ranked
+
+
+def write_stats_csv(stats_list, path):
+    """Write a stats table (e.g. from compute_stats_matrix / rank_stats) to CSV."""
+    from export_results import export_stats  # imported here: export_results imports this module
+    return export_stats(stats_list, path, "csv")
 
 
 def _fmt(v, is_money=False):
@@ -295,35 +553,101 @@ def print_engine_stats(stats):
     print()
     print(f" Avg top players:  {_fmt(stats['avg_players'])}")
     print(f" Max top players:  {_fmt(stats['max_players'])}")
+    print()
+    print(f" Avg est. revenue: {_fmt(stats['avg_revenue'], is_money=True)}")
+    print(f" Max est. revenue: {_fmt(stats['max_revenue'], is_money=True)}")
     print("==============================\n")
 
 
-def run_ui(engine_dict):
+def format_parse_report(reports):
+    """
+    Text summary of a list of ParseReport objects: corpus totals first, then
+    one line per file that dropped rows, defaulted fields or looks like a
+    different table layout.
+    """
+    seen = sum(r.rows_seen for r in reports)
+    kept = sum(r.rows_kept for r in reports)
+    skipped = {}
+    defaulted = {}
+    for r in reports:
+        for k, v in r.skipped.items():
+            skipped[k] = skipped.get(k, 0) + v
+        for k, v in r.defaulted.items():
+            defaulted[k] = defaulted.get(k, 0) + v
+
+    def _counts(d):
+        return ", ".join(f"{k}={v}" for k, v in sorted(d.items())) or "none"
+
+    lines = [
+        f"Files parsed:   {len(reports)}",
+        f"Rows seen:      {seen}",
+        f"Rows kept:      {kept}",
+        f"Rows skipped:   {seen - kept} ({_counts(skipped)})",
+        f"Defaulted:      {_counts(defaulted)}",
+        "",
+    ]
+
+    flagged = [r for r in reports if r.skipped or r.layout_drift() or r.rows_seen == 0]
+    if not flagged:
+        lines.append("No dropped rows or layout changes detected.")
+    for r in flagged:
+        notes = []
+        if r.rows_seen == 0:
+            notes.append("no game rows found")
+        if r.skipped:
+            notes.append("skipped " + _counts(r.skipped))
+        if r.header is None and r.rows_seen:
+            notes.append("no table header, used fixed column offsets")
+        elif r.layout_drift():
+            notes.append("values/row " + _counts(r.value_counts)
+                         + f" (expected {r.expected_values})")
+        lines.append(f"  ! {r.engine_name}: {r.rows_kept}/{r.rows_seen} kept; " + "; ".join(notes))
+    return "\n".join(lines)
+
+
+def run_ui(data, parse_reports=None):
     """
     Simple text UI that uses your parsed data + stats helpers.
+
+    data is an engine_core.EngineDataset (a plain engine_dict is wrapped in one),
+    so stats are computed once and shared with the other front ends.
     """
-    engine_names = sorted(engine_dict.keys())
+    from engine_core import EngineDataset  # imported here: engine_core imports this module
+
+    if not isinstance(data, EngineDataset):
+        data = EngineDataset(data, parse_reports)
+    engine_dict = data.engine_dict
+    engine_names = data.engine_names
+
+    # most recent filter result / comparison table, for option 5
+    last_results = None
+    last_stats = None
 
     while True:
         print("\n===== Game Engine Analysis UI =====")
         print("1) Look up a single engine (avg + max price, rating, players)")
         print("2) Filter games by rating range")
-        print("3) Compare up to 5 engines (averages)")
+        print("3) Compare engines (averages, sortable, CSV export)")
         print("4) List all engine names")
+        print("5) Save results to CSV / JSON Lines / JSON / Parquet")
+        print("6) Parse quality report")
+        print("7) Top engines by estimated revenue (choose a model)")
+        print("8) Correlations and price tiers (one engine or all)")
+        print("9) Query games (combine engine, title, rating, price, year, players, revenue)")
         print("0) Exit")
         choice = input("Enter choice: ").strip()
 
         if choice == "1":
-            name = input("Enter engine name (case-insensitive, partial ok): ").strip()
-            name_lower = name.lower()
+            name = input("Enter engine name (case-insensitive, partial or misspelt ok): ").strip()
 
-            # Exact or partial match
-            matches = [e for e in engine_names if name_lower in e.lower()]
+            # Exact (normalized) match first, then ranked prefix / partial / typo matches
+            engine_name = data.resolve(name)
+            matches = [engine_name] if engine_name else data.search(name, limit=None)
             if not matches:
                 print("No engines found matching that name.")
                 continue
             if len(matches) > 1:
-                print("Multiple matches:")
+                print("Closest matches:")
                 for i, e in enumerate(matches, start=1):
                     print(f"{i}. {e}")
                 sel = input("Choose a number: ").strip()
@@ -339,8 +663,7 @@ def run_ui(engine_dict):
             else:
                 engine_name = matches[0]
 
-            stats = compute_engine_stats(engine_name, engine_dict[engine_name])
-            print_engine_stats(stats)
+            print_engine_stats(data.stats(engine_name))
 
         elif choice == "2":
             try:
@@ -354,6 +677,7 @@ def run_ui(engine_dict):
                 min_r, max_r = max_r, min_r
 
             results = filter_games_by_rating_range(engine_dict, min_r, max_r)
+            last_results = results
             if not results:
                 print("No games found in that rating range.")
                 continue
@@ -365,34 +689,58 @@ def run_ui(engine_dict):
             print("------------------------------------------------------------\n")
 
         elif choice == "3":
-            raw = input("Enter up to 5 engine names, separated by commas: ").strip()
-            names = [n.strip() for n in raw.split(",") if n.strip()]
-            if not names:
-                print("No engine names provided.")
-                continue
-            if len(names) > 5:
-                names = names[:5]
-                print("Using first 5 engines only.")
-
-            stats_list = compare_engines(engine_dict, names)
+            raw = input("Enter engine names separated by commas (or 'all'): ").strip()
+            if raw.lower() == "all":
+                stats_list = data.stats_matrix()
+            else:
+                names = [n.strip() for n in raw.split(",") if n.strip()]
+                if not names:
+                    print("No engine names provided.")
+                    continue
+                stats_list = data.compare(names)
             if not stats_list:
                 print("None of the given engines were found.")
                 continue
 
-            print("\nEngine comparison (averages):")
-            print("---------------------------------------------------------------------")
-            print(f"{'Engine':25s} {'Games':>6s} {'Avg $':>10s} {'Avg Rating':>12s} {'Avg Players':>14s}")
-            print("---------------------------------------------------------------------")
-            for s in stats_list:
+            sort_key = input("Sort by column [avg_players]: ").strip() or "avg_players"
+            if sort_key not in STAT_COLUMNS:
+                print("Unknown column. Choose one of: " + ", ".join(STAT_COLUMNS))
+                continue
+            stats_list = rank_stats(stats_list, sort_key,
+                                    descending=(sort_key != "engine_name"))
+            last_stats = stats_list
+
+            top_str = input("Show top N (blank for all): ").strip()
+            shown = stats_list
+            if top_str:
+                try:
+                    shown = stats_list[:max(int(top_str), 0)]
+                except ValueError:
+                    print("Invalid number, showing all.")
+
+            print(f"\nEngine comparison (averages, sorted by {sort_key}):")
+            print("---------------------------------------------------------------------------")
+            print(f"{'#':>4s} {'Engine':25s} {'Games':>6s} {'Avg $':>10s} {'Avg Rating':>12s} {'Avg Players':>14s}")
+            print("---------------------------------------------------------------------------")
+            for s in shown:
                 avg_cost_str = _fmt(s["avg_cost"], is_money=True)
                 avg_rating_str = _fmt(s["avg_rating"])
                 avg_players_str = _fmt(s["avg_players"])
-                print(f"{s['engine_name'][:25]:25s} "
+                print(f"{s['rank']:>4d} "
+                      f"{s['engine_name'][:25]:25s} "
                       f"{s['num_games']:>6d} "
                       f"{avg_cost_str:>10s} "
                       f"{avg_rating_str:>12s} "
                       f"{avg_players_str:>14s}")
-            print("---------------------------------------------------------------------\n")
+            print("---------------------------------------------------------------------------\n")
+
+            csv_path = input("Export full table to CSV (path, blank to skip): ").strip().strip('"')
+            if csv_path:
+                try:
+                    n = write_stats_csv(stats_list, csv_path)
+                    print(f"Wrote {n} rows to {csv_path}")
+                except OSError as e:
+                    print(f"Could not write CSV: {e}")
 
         elif choice == "4":
             print("\nEngines loaded:")
@@ -400,6 +748,116 @@ def run_ui(engine_dict):
                 print("  -", e)
             print()
 
+        elif choice == "5":
+            from export_results import export_games, export_stats
+
+            print("  a) Last filter / query result")
+            print("  b) Last engine comparison table")
+            print("  c) All games")
+            what = input("What to save: ").strip().lower()
+            if what == "a" and last_results is None:
+                print("Run a rating filter (option 2) or a query (option 9) first.")
+                continue
+            if what == "b" and last_stats is None:
+                print("Run a comparison (option 3) first.")
+                continue
+            if what not in ("a", "b", "c"):
+                print("Invalid choice.")
+                continue
+
+            path = input("Output file (.csv, .jsonl, .json or .parquet): ").strip().strip('"')
+            if not path:
+                print("No file given.")
+                continue
+            try:
+                if what == "a":
+                    n = export_games(last_results, path, revenue=data.revenue_of)
+                elif what == "b":
+                    n = export_stats(last_stats, path)
+                else:
+                    n = export_games(data.all_games(), path, revenue=data.revenue_of)
+            except (ValueError, RuntimeError, OSError) as e:
+                print(f"Could not save: {e}")
+                continue
+            print(f"Wrote {n} rows to {path}")
+
+        elif choice == "6":
+            if not data.parse_reports:
+                print("No parse telemetry was collected for this dataset.")
+                continue
+            print("\n===== Parse quality =====")
+            print(format_parse_report(data.parse_reports))
+            print()
+
+        elif choice == "7":
+            from revenue_models import REVENUE_MODELS
+
+            models = list(REVENUE_MODELS)
+            for i, name in enumerate(models, start=1):
+                print(f"  {i}) {REVENUE_MODELS[name][0]}")
+            try:
+                model = models[int(input("Model: ").strip()) - 1]
+            except (ValueError, IndexError):
+                print("Invalid choice.")
+                continue
+
+            # only the revenue column is (re)computed, and only once per model
+            data.set_revenue_model(model)
+            stats_list = rank_stats(data.stats_matrix(), "avg_revenue")
+            print(f"\nTop engines by average estimated revenue ({REVENUE_MODELS[model][0]}):")
+            print("---------------------------------------------------------------------")
+            for s in stats_list[:10]:
+                print(f"{s['rank']:>4d} {s['engine_name'][:25]:25s} "
+                      f"{_fmt(s['avg_revenue'], is_money=True):>18s} "
+                      f"{_fmt(s['max_revenue'], is_money=True):>20s}")
+            print("---------------------------------------------------------------------\n")
+
+        elif choice == "8":
+            from analytics import format_analytics_report
+
+            name = input("Engine name (blank = all engines): ").strip()
+            engine_name = None
+            if name:
+                engine_name = data.resolve(name)
+                if engine_name is None:
+                    matches = data.search(name, limit=1)
+                    if not matches:
+                        print("No engines found matching that name.")
+                        continue
+                    engine_name = matches[0]
+            method = input("Method - pearson or spearman [pearson]: ").strip().lower() or "pearson"
+            if method not in ("pearson", "spearman"):
+                print("Invalid method.")
+                continue
+            print()
+            print(format_analytics_report(data.analytics, engine_name, method))
+            print()
+
+        elif choice == "9":
+            from query_engine import parse_query
+
+            print("Filters, all must match: rating / price / year / players / revenue")
+            print("with >=N, <=N, =N or =A..B; engine=name1,name2; title~text")
+            print('e.g.  rating>=90 price<=10 year=2015..2020 engine=godot title~"dungeon"')
+            try:
+                query = parse_query(input("Query: "), data.resolve)
+            except ValueError as e:
+                print(f"Invalid query: {e}")
+                continue
+            if query.is_empty():
+                print("No filters given.")
+                continue
+
+            result = data.query(query)
+            last_results = result.rows
+            print("\nActive filters: " + ", ".join(query.describe()))
+            print("------------------------------------------------------------")
+            for engine_name, g in result.rows:
+                print(f"[{engine_name}] {g.title} (ID {g.id}) - rating {g.rating}, "
+                      f"price {g.cost}, peak players {g.topPlayerCount}")
+            print("------------------------------------------------------------")
+            print(result.summary() + "\n")
+
         elif choice == "0":
             print("Goodbye.")
             break
@@ -409,12 +867,12 @@ def run_ui(engine_dict):
 
 
 if __name__ == '__main__':
+    from engine_core import EngineDataset
+
     folderPath = input("Please input the folder path: ")
-    engineFileList = fileRead(folderPath)
-    engineList = htmlToList(engineFileList)
 
-    # Build engine_dict for the UI from your existing engineList structure
-    engine_dict = build_engine_dict(engineList)
+    # fileRead + htmlToList + build_engine_dict, wrapped with cached stats
+    data = EngineDataset.from_folder(folderPath)
 
     # ------------------------------------------------------------------
     # OLD DEBUG PRINTING LOOP (kept here but commented, so it's not lost)
@@ -433,4 +891,4 @@ if __name__ == '__main__':
     # ------------------------------------------------------------------
 
     # New: launch the simple text UI
-    run_ui(engine_dict)
+    run_ui(data)
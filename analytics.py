@@ -0,0 +1,241 @@
+# analytics.py
+#
+# Cross-engine analytics over the whole parsed corpus: correlation matrices
+# (rating vs price, peak players vs release year, ...) per engine and for
+# all games, and summaries grouped by price tier.
+#
+# Everything is computed in batch over the column view of the data
+# (revenue_models.GameColumns, shared with the revenue models), one pass per
+# variable pair, instead of walking Game objects per question. Results are
+# cached in CorpusAnalytics; EngineDataset keeps one per loaded corpus, so
+# the cache lasts exactly until the data changes (a new load builds a new
+# dataset).
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from GroupProject_Main import _fmt
+from revenue_models import GameColumns
+
+
+# variable name -> label
+ANALYTICS_VARIABLES = {
+    "price": "Price",
+    "rating": "Rating",
+    "peak_players": "Peak players",
+    "followers": "Followers",
+    "release_year": "Release year",
+}
+
+CORRELATION_METHODS = ("pearson", "spearman")
+
+# Paid tiers start at these prices; free games (price 0) are their own tier.
+PRICE_TIER_EDGES = (0.01, 5.0, 10.0, 20.0, 40.0)
+PRICE_TIER_LABELS = ("Free", "Under $5", "$5 - $9.99", "$10 - $19.99", "$20 - $39.99", "$40+")
+
+# Engines with fewer complete pairs than this get None for that coefficient.
+MIN_CORRELATION_PAIRS = 5
+
+
+def price_tier(cost: float) -> int | None:
+    """Index into PRICE_TIER_LABELS, or None when the price is missing."""
+    if cost < 0:
+        return None
+    return bisect_right(PRICE_TIER_EDGES, cost)
+
+
+def _ranks(values: List[float]) -> List[float]:
+    """1-based ranks, ties get their average rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        avg = (i + j) / 2.0 + 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = avg
+        i = j + 1
+    return ranks
+
+
+def _pearson(xs: List[float], ys: List[float]) -> float | None:
+    n = len(xs)
+    if n < MIN_CORRELATION_PAIRS:
+        return None
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    sxy = sxx = syy = 0.0
+    for x, y in zip(xs, ys):
+        dx = x - mx
+        dy = y - my
+        sxy += dx * dy
+        sxx += dx * dx
+        syy += dy * dy
+    if sxx == 0 or syy == 0:
+        return None   # a constant column has no correlation
+    return sxy / (sxx * syy) ** 0.5
+
+
+def correlation(xs: List[float], ys: List[float], method: str = "pearson") -> Tuple[float | None, int]:
+    """
+    Correlation of two columns over the rows where both are known (>= 0).
+    Returns (coefficient or None, number of complete pairs).
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    pairs = [(x, y) for x, y in zip(xs, ys) if x >= 0 and y >= 0]
+    if not pairs:
+        return None, 0
+    px = [x for x, _ in pairs]
+    py = [y for _, y in pairs]
+    if method == "spearman":
+        px, py = _ranks(px), _ranks(py)
+    return _pearson(px, py), len(pairs)
+
+
+class CorpusAnalytics:
+    """
+    Correlations and price-tier summaries for one engine_dict, cached per
+    (engine, method). engine_name None means all games.
+    """
+
+    def __init__(self, engine_dict, columns: GameColumns | None = None,
+                 revenue: List[float] | None = None):
+        # columns: reuse an existing column view of the same engine_dict
+        # revenue: per-game revenue under the active model (GameColumns order);
+        #          default price x peak players
+        self.columns = columns if columns is not None else GameColumns(engine_dict)
+        cols = self.columns
+        if revenue is None:
+            revenue = [c * p if c >= 0 and p >= 0 else -1 for c, p in zip(cols.cost, cols.peak)]
+        self.revenue = revenue
+        self.variables: Dict[str, List[float]] = {
+            "price": cols.cost,
+            "rating": cols.rating,
+            "peak_players": cols.peak,
+            "followers": cols.follows,
+            "release_year": [datetime.fromtimestamp(ts).year if ts >= 0 else -1
+                             for ts in cols.release_ts],
+        }
+        self._correlations: Dict[Tuple[str | None, str], Dict] = {}
+        self._tiers: Dict[str | None, List[Dict]] = {}
+
+    def set_revenue(self, revenue: List[float]) -> None:
+        """Swap in another revenue model's per-game values; price tiers are recomputed."""
+        self.revenue = revenue
+        self._tiers.clear()
+
+    def _rows(self, engine_name: str | None) -> Tuple[int, int]:
+        if engine_name is None:
+            return 0, len(self.columns)
+        if engine_name not in self.columns.engine_ranges:
+            raise KeyError(engine_name)
+        return self.columns.engine_ranges[engine_name]
+
+    def correlation_matrix(self, engine_name: str | None = None,
+                           method: str = "pearson") -> Dict[Tuple[str, str], Tuple[float | None, int]]:
+        """
+        {(var_a, var_b): (coefficient, pairs)} for every pair of
+        ANALYTICS_VARIABLES (both orders, plus the diagonal).
+        """
+        key = (engine_name, method)
+        if key not in self._correlations:
+            start, end = self._rows(engine_name)
+            names = list(ANALYTICS_VARIABLES)
+            columns = {name: self.variables[name][start:end] for name in names}
+            matrix = {}
+            for i, a in enumerate(names):
+                known = sum(1 for v in columns[a] if v >= 0)
+                matrix[(a, a)] = (1.0 if known >= MIN_CORRELATION_PAIRS else None, known)
+                for b in names[i + 1:]:
+                    matrix[(a, b)] = matrix[(b, a)] = correlation(columns[a], columns[b], method)
+            self._correlations[key] = matrix
+        return self._correlations[key]
+
+    def correlation_by_engine(self, var_a: str, var_b: str,
+                              method: str = "pearson") -> List[Tuple[str, float | None, int]]:
+        """[(engine_name, coefficient, pairs)] for one variable pair, every engine."""
+        return [(name, *self.correlation_matrix(name, method)[(var_a, var_b)])
+                for name in sorted(self.columns.engine_ranges)]
+
+    def price_tiers(self, engine_name: str | None = None) -> List[Dict]:
+        """
+        One summary per price tier: games, share of priced games, and the
+        average rating / peak players / revenue (active revenue model) of the tier.
+        """
+        if engine_name not in self._tiers:
+            start, end = self._rows(engine_name)
+            cols = self.columns
+            # per tier: [games, rating sum, rating n, peak sum, peak n, revenue sum, revenue n]
+            acc = [[0, 0.0, 0, 0.0, 0, 0.0, 0] for _ in PRICE_TIER_LABELS]
+            for c, r, p, rev in zip(cols.cost[start:end], cols.rating[start:end],
+                                    cols.peak[start:end], self.revenue[start:end]):
+                tier = price_tier(c)
+                if tier is None:
+                    continue
+                a = acc[tier]
+                a[0] += 1
+                if r >= 0:
+                    a[1] += r
+                    a[2] += 1
+                if p >= 0:
+                    a[3] += p
+                    a[4] += 1
+                if rev >= 0:
+                    a[5] += rev
+                    a[6] += 1
+            priced = sum(a[0] for a in acc)
+            self._tiers[engine_name] = [{
+                "tier": label,
+                "num_games": a[0],
+                "share": a[0] / priced if priced else None,
+                "avg_rating": a[1] / a[2] if a[2] else None,
+                "avg_players": a[3] / a[4] if a[4] else None,
+                "avg_revenue": a[5] / a[6] if a[6] else None,
+            } for label, a in zip(PRICE_TIER_LABELS, acc)]
+        return self._tiers[engine_name]
+
+
+def _fmt_r(coefficient):
+    return "   n/a" if coefficient is None else f"{coefficient:+.2f}"
+
+
+def format_analytics_report(analytics: CorpusAnalytics, engine_name: str | None = None,
+                            method: str = "pearson") -> str:
+    """Text report: correlation matrix and price tiers (one engine, or all games)."""
+    scope = engine_name or "all engines"
+    names = list(ANALYTICS_VARIABLES)
+    matrix = analytics.correlation_matrix(engine_name, method)
+
+    lines = [f"Correlations ({method}) - {scope}", ""]
+    lines.append(f"{'':14s}" + "".join(f"{ANALYTICS_VARIABLES[n][:12]:>13s}" for n in names))
+    for a in names:
+        lines.append(f"{ANALYTICS_VARIABLES[a][:14]:14s}"
+                     + "".join(f"{_fmt_r(matrix[(a, b)][0]):>13s}" for b in names))
+    r, n = matrix[("rating", "price")]
+    lines.append(f"\nRating vs price: {_fmt_r(r)} over {n:,} games")
+    r, n = matrix[("peak_players", "release_year")]
+    lines.append(f"Peak players vs release year: {_fmt_r(r)} over {n:,} games")
+
+    if engine_name is None:
+        per_engine = [row for row in analytics.correlation_by_engine("rating", "price", method)
+                      if row[1] is not None]
+        per_engine.sort(key=lambda row: row[1])
+        if per_engine:
+            lines.append("\nRating vs price by engine (strongest negative / positive):")
+            shown = per_engine[:5] + [row for row in per_engine[-5:] if row not in per_engine[:5]]
+            for name, coefficient, pairs in shown:
+                lines.append(f"  {name[:30]:30s} {_fmt_r(coefficient):>6s}  ({pairs} games)")
+
+    lines.append(f"\nPrice tiers - {scope}")
+    lines.append(f"{'Tier':14s} {'Games':>7s} {'Share':>7s} {'Avg rating':>11s} "
+                 f"{'Avg players':>12s} {'Avg revenue':>16s}")
+    for t in analytics.price_tiers(engine_name):
+        share = f"{t['share'] * 100:.1f}%" if t["share"] is not None else "N/A"
+        lines.append(f"{t['tier']:14s} {t['num_games']:>7d} {share:>7s} "
+                     f"{_fmt(t['avg_rating']):>11s} {_fmt(t['avg_players']):>12s} "
+                     f"{_fmt(t['avg_revenue'], is_money=True):>16s}")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+# batch_report.py
+#
+# Headless batch rendering of the weekly chart report.
+#
+# Writes one bar chart per metric (avg / max of price, rating, peak players
+# and revenue across all engines) plus a peak-players timeline for every
+# engine, as PNG and/or SVG, and an index.html that links them.
+#
+# The corpus is parsed once in the parent process. The stats table and the
+# per-engine line series (charts.line_series) are computed there and handed
+# to each worker process once, through the pool initializer; jobs then only
+# name the chart to draw. Workers render with the Agg backend and the same
+# figure builders the Tk app uses (charts.py), largest charts first, so the
+# total time scales with the number of cores.
+#
+# Usage:
+#     python batch_report.py FOLDER [--out build/report] [--formats png,svg]
+#                            [--workers N] [--scaling]
+
+import argparse
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Tuple
+
+from engine_core import EngineDataset
+
+
+BAR_METRICS = [f"{mode}_{base}" for base in ("cost", "rating", "players", "revenue")
+               for mode in ("avg", "max")]
+
+REPORT_FORMATS = ("png", "svg")
+
+# dpi for raster output
+REPORT_DPI = 110
+
+# Set in each worker by _init_worker: stats table, line series, output settings.
+_SHARED: Dict[str, Any] = {}
+
+
+def chart_slug(name: str) -> str:
+    """Engine name -> file-name-safe slug ("Lime OR OpenFL Engine" -> "Lime_OR_OpenFL_Engine")."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "engine"
+
+
+def precompute(data: EngineDataset) -> Tuple[List[Dict[str, Any]], Dict[str, list]]:
+    """Stats for every engine and the (date, peak, title) series for every engine."""
+    from charts import line_series
+
+    stats_list = data.stats_matrix()
+    series = {name: line_series(data.games(name)) for name in data.engine_names}
+    return stats_list, series
+
+
+def _init_worker(stats_list, series, out_dir, formats):
+    import matplotlib
+    matplotlib.use("Agg")
+
+    _SHARED.update(stats_list=stats_list, series=series, out_dir=out_dir, formats=formats)
+
+
+def _save(fig, stem: str) -> List[str]:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    FigureCanvasAgg(fig)
+    paths = []
+    for fmt in _SHARED["formats"]:
+        path = os.path.join(_SHARED["out_dir"], f"{stem}.{fmt}")
+        fig.savefig(path, format=fmt, dpi=REPORT_DPI)
+        paths.append(path)
+    return paths
+
+
+def _render(job: Tuple[str, str]) -> Tuple[Tuple[str, str], List[str], float]:
+    """Worker: draw one chart ("bar", metric_key) or ("line", engine_name) and save it."""
+    from charts import bar_figure, line_figure
+
+    start = time.perf_counter()
+    kind, name = job
+    if kind == "bar":
+        fig = bar_figure(_SHARED["stats_list"], name)
+        paths = _save(fig, f"bar_{name}")
+    else:
+        fig = line_figure(name, _SHARED["series"][name])
+        paths = _save(fig, os.path.join("lines", chart_slug(name)))
+    return job, paths, time.perf_counter() - start
+
+
+def _jobs(stats_list, series) -> List[Tuple[str, str]]:
+    """Every chart, biggest first so the long ones don't finish last."""
+    jobs = [("bar", metric) for metric in BAR_METRICS]
+    jobs += sorted((("line", name) for name in series),
+                   key=lambda job: len(series[job[1]]), reverse=True)
+    return jobs
+
+
+def _write_index(out_dir: str, rendered: Dict[Tuple[str, str], List[str]], formats) -> str:
+    from charts import metric_label
+
+    def img(paths):
+        path = next((p for p in paths if p.endswith(".svg")), paths[0]) if "svg" in formats else paths[0]
+        rel = os.path.relpath(path, out_dir).replace(os.sep, "/")
+        return f'<img src="{html.escape(rel)}" loading="lazy">'
+
+    parts = ["<!doctype html><meta charset='utf-8'><title>Engine report</title>",
+             "<h1>Engine report</h1>", "<h2>Metrics</h2>"]
+    for metric in BAR_METRICS:
+        if ("bar", metric) in rendered:
+            parts.append(f"<h3>{html.escape(metric_label(metric))}</h3>"
+                         + img(rendered[("bar", metric)]))
+    parts.append("<h2>Peak players over time</h2>")
+    for (kind, name), paths in sorted(rendered.items()):
+        if kind == "line":
+            parts.append(f"<h3>{html.escape(name)}</h3>" + img(paths))
+    index = os.path.join(out_dir, "index.html")
+    with open(index, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return index
+
+
+def render_report(stats_list, series, out_dir: str, formats=("png",),
+                  workers: int | None = None, quiet: bool = False) -> Tuple[Dict, float]:
+    """
+    Render every chart into out_dir with a pool of workers.
+    Returns ({job: [paths]}, wall seconds).
+    """
+    os.makedirs(os.path.join(out_dir, "lines"), exist_ok=True)
+    jobs = _jobs(stats_list, series)
+    rendered: Dict[Tuple[str, str], List[str]] = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(stats_list, series, out_dir, tuple(formats))) as pool:
+        futures = [pool.submit(_render, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            job, paths, seconds = future.result()
+            rendered[job] = paths
+            if not quiet:
+                print(f"  [{done}/{len(jobs)}] {job[0]} {job[1]} ({seconds:.2f}s)")
+    return rendered, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batch chart report")
+    parser.add_argument("folder")
+    parser.add_argument("--out", default=os.path.join("build", "report"))
+    parser.add_argument("--formats", default="png", help="comma separated: png, svg")
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--scaling", action="store_true",
+                        help="render with 1, 2, 4, ... workers and report the speedup")
+    args = parser.parse_args()
+
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()]
+    bad = [f for f in formats if f not in REPORT_FORMATS]
+    if bad or not formats:
+        raise SystemExit(f"Formats must be among: {', '.join(REPORT_FORMATS)}")
+
+    start = time.perf_counter()
+    data = EngineDataset.from_folder(args.folder, quiet=True)
+    stats_list, series = precompute(data)
+    prep = time.perf_counter() - start
+    print(f"Parsed {len(data)} engines / {data.num_games} games and precomputed series "
+          f"in {prep:.2f}s")
+
+    if args.scaling:
+        cores = os.cpu_count() or 1
+        counts = sorted({1, cores} | {2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores})
+        base = None
+        print(f"\n{'Workers':>8s} {'Charts':>7s} {'Wall (s)':>9s} {'Speedup':>8s}")
+        for n in counts:
+            rendered, wall = render_report(stats_list, series, args.out, formats, n, quiet=True)
+            base = base or wall
+            print(f"{n:>8d} {len(rendered):>7d} {wall:>9.2f} {base / wall:>7.2f}x")
+    else:
+        rendered, wall = render_report(stats_list, series, args.out, formats, args.workers)
+        files = sum(len(paths) for paths in rendered.values())
+        print(f"\nRendered {len(rendered)} charts ({files} files) in {wall:.2f}s "
+              f"with {args.workers or os.cpu_count()} workers")
+
+    index = _write_index(args.out, rendered, formats)
+    print(f"Report: {index}")
+
+
+if __name__ == "__main__":
+    main()
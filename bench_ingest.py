@@ -0,0 +1,74 @@
+# bench_ingest.py
+#
+# Compare serial fileRead + htmlToList against the asyncio ingestion path.
+#
+# Usage:
+#     python bench_ingest.py [folder] [--repeat N] [--workers N]
+#
+# The folder defaults to the bundled SteamDB pages next to this script.
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from GroupProject_Main import fileRead, find_engine_files, htmlToList
+from ingest import ingest_folder
+
+
+def _serial(folder):
+    # fileRead prints every file name; keep that out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        engineFileList = fileRead(folder)
+    return htmlToList(engineFileList)
+
+
+def _best_of(repeat, fn):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = find_engine_files(args.folder)
+    total_mb = sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+    print(f"{len(paths)} files, {total_mb:.1f} MB in {args.folder}\n")
+
+    runs = [
+        ("serial fileRead + htmlToList", lambda: _serial(args.folder)),
+        ("async ingest (thread parse)",
+         lambda: ingest_folder(args.folder, workers=args.workers, executor="thread")),
+        ("async ingest (process parse)",
+         lambda: ingest_folder(args.folder, workers=args.workers, executor="process")),
+    ]
+
+    baseline = None
+    games = None
+    print(f"{'Method':32s} {'Best (s)':>9s} {'Files/s':>9s} {'MB/s':>8s} {'Speedup':>8s}")
+    print("-" * 70)
+    for label, fn in runs:
+        elapsed, engineList = _best_of(args.repeat, fn)
+        n_games = sum(len(e) - 1 for e in engineList)
+        if games is None:
+            games = n_games
+        elif n_games != games:
+            print(f"  !! {label} parsed {n_games} games, serial parsed {games}")
+        baseline = baseline or elapsed
+        print(f"{label:32s} {elapsed:>9.3f} {len(paths) / elapsed:>9.1f} "
+              f"{total_mb / elapsed:>8.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
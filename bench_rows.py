@@ -0,0 +1,138 @@
+# bench_rows.py
+#
+# Per-row memory and render time for parsed games, against the baseline.
+#
+# "before" is the real parser from before titles were normalized: the
+# GroupProject_Main.py of --baseline (a git revision, loaded with git show;
+# default: the merge-base with the main branch), whose Game keeps a
+# per-instance __dict__, the app id as a str and a raw title that renderers
+# cleaned with .lstrip('>').strip() every time. "after" is what htmlToList
+# produces now: __slots__ Game, int id, titles decoded once per parse and
+# interned.
+#
+# The int id saves memory but has to be formatted on every render, which
+# costs more than the title clean-up it replaced: rendering is measurably
+# slower than the baseline, and the report says so.
+#
+# Usage:
+#     python bench_rows.py [folder] [--snapshots 3] [--repeat 5] [--baseline REV]
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import time
+import tracemalloc
+import types
+
+import GroupProject_Main
+
+
+# branches whose merge-base with HEAD is the default baseline
+MAIN_BRANCHES = ("main", "origin/main")
+
+
+def _git(*args: str) -> subprocess.CompletedProcess:
+    here = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.run(["git", *args], cwd=here, capture_output=True, text=True)
+
+
+def default_baseline() -> str:
+    """Merge-base of HEAD with the main branch (the tree before this work)."""
+    for branch in MAIN_BRANCHES:
+        result = _git("merge-base", "HEAD", branch)
+        if result.returncode == 0:
+            return result.stdout.strip()
+    raise SystemExit(f"No {' or '.join(MAIN_BRANCHES)} branch to compare against; "
+                     f"pass --baseline REV")
+
+
+def load_baseline(rev: str) -> types.ModuleType:
+    """GroupProject_Main.py as of git revision rev, as a separate module."""
+    result = _git("show", f"{rev}:GroupProject_Main.py")
+    if result.returncode != 0:
+        raise SystemExit(f"Cannot load the baseline parser: {result.stderr.strip()}")
+    source = result.stdout
+    module = types.ModuleType("baseline_main")
+    exec(compile(source, f"{rev}:GroupProject_Main.py", "exec"), module.__dict__)
+    return module
+
+
+def _parse(main, folder, snapshots):
+    """All rows from the folder, parsed snapshots times (as daily scrapes would be)."""
+    rows = []
+    for _ in range(snapshots):
+        with contextlib.redirect_stdout(io.StringIO()):
+            pages = main.fileRead(folder)
+        for entry in main.htmlToList(pages):
+            rows.extend(entry[1:])
+        del pages
+    return rows
+
+
+def _traced(build):
+    """(bytes still allocated by build() once its temporaries are gone, seconds, result)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, elapsed, result
+
+
+def _render_before(rows):
+    return "".join(f"{g.title.lstrip('>').strip()} (ID {g.id})\n" for g in rows)
+
+
+def _render_after(rows):
+    return "".join(f"{g.title} (ID {g.id})\n" for g in rows)
+
+
+def _best(repeat, fn, rows):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-row memory and render time vs the baseline")
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--snapshots", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=None,
+                        help="git revision to compare against (default: merge-base with main)")
+    args = parser.parse_args()
+
+    args.baseline = args.baseline or default_baseline()
+    baseline = load_baseline(args.baseline)
+    before_bytes, before_parse, old_rows = _traced(lambda: _parse(baseline, args.folder, args.snapshots))
+    after_bytes, after_parse, rows = _traced(
+        lambda: _parse(GroupProject_Main, args.folder, args.snapshots))
+
+    n = len(rows)
+    print(f"{n:,} rows ({len(old_rows):,} baseline), {args.snapshots} snapshots, "
+          f"baseline {args.baseline}\n")
+    print(f"{'Layout':34s} {'Total MB':>9s} {'Bytes/row':>10s} {'Parse s*':>9s}")
+    print(f"{'before (baseline Game)':34s} {before_bytes / 2**20:>9.1f} "
+          f"{before_bytes / len(old_rows):>10.0f} {before_parse:>9.2f}")
+    print(f"{'after (slots, int id, interned)':34s} {after_bytes / 2**20:>9.1f} "
+          f"{after_bytes / n:>10.0f} {after_parse:>9.2f}")
+    print("* parse times include tracemalloc overhead")
+
+    before_s = _best(args.repeat, _render_before, old_rows)
+    after_s = _best(args.repeat, _render_after, rows)
+    change = (after_s / before_s - 1) * 100
+    verdict = f"{change:.0f}% slower" if change > 0 else f"{-change:.0f}% faster"
+    print(f"\nRender {n:,} result lines: before {before_s * 1000:.1f} ms, "
+          f"after {after_s * 1000:.1f} ms ({verdict} than the baseline)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# bench_sketches.py
+#
+# Sketch-based stats (sketches.py) against the exact compute_engine_stats.
+#
+# The folder is loaded --snapshots times to stand in for that many daily
+# scrapes of the same engines. Reported:
+#   - time and peak traced memory: exact (hold every Game, then
+#     compute_engine_stats) vs streaming sketches (sketch_folders)
+#   - errors: avg/max vs exact, quantile rank error, HyperLogLog relative
+#     error, count-min overcount on the true heavy hitters
+#
+# Usage:
+#     python bench_sketches.py [folder] [--snapshots 3]
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+import tracemalloc
+from bisect import bisect_left, bisect_right
+
+from GroupProject_Main import compute_engine_stats, fileRead, htmlToList
+from sketches import (CM_EPSILON, HEAVY_HITTERS, SKETCH_METRICS, SKETCH_QUANTILES,
+                      sketch_engine_dict, sketch_folders)
+
+
+def _load_exact(folder, snapshots):
+    """{engine: [Game, ...]} with every snapshot's games appended."""
+    engine_dict = {}
+    for _ in range(snapshots):
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine_file_list = fileRead(folder)
+        for entry in htmlToList(engine_file_list):
+            engine_dict.setdefault(entry[0], []).extend(entry[1:])
+    return engine_dict
+
+
+def _exact_run(folder, snapshots):
+    engine_dict = _load_exact(folder, snapshots)
+    stats = {name: compute_engine_stats(name, games) for name, games in engine_dict.items()}
+    return engine_dict, stats
+
+
+def _sketch_run(folder, snapshots):
+    return sketch_folders([folder] * snapshots, executor="thread", workers=1)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def _peak_mb(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak / (1024 * 1024)
+
+
+def _metric_values(games, metric):
+    out = []
+    for g in games:
+        if metric == "revenue":
+            if g.cost >= 0 and g.topPlayerCount >= 0:
+                out.append(g.cost * g.topPlayerCount)
+        else:
+            v = {"cost": g.cost, "rating": g.rating, "players": g.topPlayerCount}[metric]
+            if v >= 0:
+                out.append(v)
+    return sorted(out)
+
+
+def _rel(a, b):
+    if a is None or b is None:
+        return 0.0 if a is b else float("inf")
+    return abs(a - b) / abs(b) if b else abs(a)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sketch stats vs exact compute_engine_stats")
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--snapshots", type=int, default=3)
+    args = parser.parse_args()
+
+    exact_s, (engine_dict, exact) = _timed(_exact_run, args.folder, args.snapshots)
+    sketch_s, sketches = _timed(_sketch_run, args.folder, args.snapshots)
+    n_games = sum(len(games) for games in engine_dict.values())
+    print(f"{len(engine_dict)} engines, {n_games} game rows ({args.snapshots} snapshots)\n")
+
+    exact_mb = _peak_mb(_exact_run, args.folder, args.snapshots)
+    sketch_mb = _peak_mb(_sketch_run, args.folder, args.snapshots)
+    print(f"{'Mode':26s} {'Time (s)':>9s} {'Peak MB':>9s}")
+    print(f"{'exact (all Games held)':26s} {exact_s:>9.2f} {exact_mb:>9.1f}")
+    print(f"{'sketch (streamed)':26s} {sketch_s:>9.2f} {sketch_mb:>9.1f}\n")
+
+    # only the stats step, on data already in memory
+    stats_s, _ = _timed(lambda: [compute_engine_stats(n, g) for n, g in engine_dict.items()])
+    build_s, _ = _timed(sketch_engine_dict, engine_dict)
+    print(f"stats only: compute_engine_stats {stats_s * 1000:.1f} ms, "
+          f"sketch_engine_dict {build_s * 1000:.1f} ms\n")
+
+    # --- accuracy ---
+    moment_err = 0.0
+    rank_errs = []
+    hll_errs = []
+    cm_over = []
+    for name, games in engine_dict.items():
+        approx = sketches[name].to_stats()
+        for metric in SKETCH_METRICS:
+            for col in (f"avg_{metric}", f"max_{metric}"):
+                moment_err = max(moment_err, _rel(approx[col], exact[name][col]))
+            values = _metric_values(games, metric)
+            if not values:
+                continue
+            for q in SKETCH_QUANTILES:
+                est = approx[f"p{round(q * 100)}_{metric}"]
+                # 0 when est is a true q-quantile (ties make that a range of ranks)
+                lo = bisect_left(values, est) / len(values)
+                hi = bisect_right(values, est) / len(values)
+                rank_errs.append(max(0.0, lo - q, q - hi))
+
+        distinct = {g.id for g in games}
+        hll_errs.append(abs(approx["distinct_apps"] - len(distinct)) / len(distinct))
+
+        weights = {}
+        for g in games:
+            if g.topPlayerCount > 0:
+                weights[g.id] = weights.get(g.id, 0.0) + g.topPlayerCount
+        total = sum(weights.values())
+        cm = sketches[name].top_apps
+        for app_id, w in sorted(weights.items(), key=lambda kv: kv[1], reverse=True)[:HEAVY_HITTERS]:
+            cm_over.append((cm.estimate(str(app_id)) - w) / total)
+
+    print("Accuracy vs exact:")
+    print(f"  avg / max columns:   max relative error {moment_err:.2e}")
+    print(f"  quantiles (KLL):     rank error mean {statistics.mean(rank_errs):.4f}, "
+          f"max {max(rank_errs):.4f}")
+    print(f"  distinct apps (HLL): relative error mean {statistics.mean(hll_errs):.4f}, "
+          f"max {max(hll_errs):.4f}")
+    print(f"  heavy hitters (CM):  overcount / total mean {statistics.mean(cm_over):.5f}, "
+          f"max {max(cm_over):.5f} (bound eps = {CM_EPSILON})")
+
+
+if __name__ == "__main__":
+    main()
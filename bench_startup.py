@@ -0,0 +1,123 @@
+# bench_startup.py
+#
+# Startup-time report for engine_ui, based on `python -X importtime`.
+#
+# "before" is the real pre-change app: the .py files of --baseline (a git
+# revision, default: the merge-base with the main branch) are checked out
+# into a temporary folder, whose engine_ui imports matplotlib at module load.
+# "after" is engine_ui in this tree, with plotting deferred to the first
+# chart. Both run the same `import engine_ui`.
+#
+# Usage:
+#     python bench_startup.py [--repeat 5] [--top 10] [--baseline REV]
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from bench_rows import default_baseline
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CODE = "import engine_ui"
+
+
+def checkout_sources(rev, dest):
+    """Write every .py file of git revision rev into dest."""
+    names = subprocess.run(["git", "ls-tree", "-r", "--name-only", rev], cwd=HERE,
+                           capture_output=True, text=True)
+    if names.returncode != 0:
+        raise SystemExit(f"Cannot read baseline {rev}: {names.stderr.strip()}")
+    for name in names.stdout.splitlines():
+        if not name.endswith(".py"):
+            continue
+        source = subprocess.run(["git", "show", f"{rev}:{name}"], cwd=HERE,
+                                capture_output=True, check=True).stdout
+        path = os.path.join(dest, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(source)
+
+
+def _importtime(code, cwd=HERE):
+    """
+    Run code in a fresh interpreter with -X importtime.
+    Returns ({module: cumulative_us}, total_us) or None if the import failed.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+
+    cumulative = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        cum = int(parts[1])
+        name = parts[2].rstrip()
+        # top-level imports have no leading indentation beyond one space
+        if not name.startswith("  "):
+            total += cum
+        cumulative[name.strip()] = max(cumulative.get(name.strip(), 0), cum)
+    return cumulative, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup import-time report for engine_ui")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--baseline", default=None,
+                        help="git revision to compare against (default: merge-base with main)")
+    args = parser.parse_args()
+
+    baseline = args.baseline or default_baseline()
+    old_tree = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        checkout_sources(baseline, old_tree)
+        scenarios = [(f"before ({baseline[:10]})", old_tree), ("after (this tree)", HERE)]
+
+        totals = {}
+        for label, cwd in scenarios:
+            runs = []
+            last = None
+            for _ in range(args.repeat):
+                result = _importtime(CODE, cwd)
+                if result is None:
+                    break
+                last, total = result
+                runs.append(total)
+            if not runs:
+                print(f"{label}: import failed (is matplotlib installed?)\n")
+                continue
+            totals[label] = statistics.median(runs)
+
+            print(f"{label}: `{CODE}`")
+            print(f"  median total import time: {totals[label] / 1000:.1f} ms over {len(runs)} runs")
+            print(f"  slowest modules (cumulative):")
+            for name, us in sorted(last.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+                print(f"    {us / 1000:>8.1f} ms  {name}")
+            print()
+    finally:
+        shutil.rmtree(old_tree, ignore_errors=True)
+
+    if len(totals) == len(scenarios):
+        before = totals[scenarios[0][0]]
+        after = totals[scenarios[1][0]]
+        print(f"Startup imports: {before / 1000:.1f} ms -> {after / 1000:.1f} ms "
+              f"({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
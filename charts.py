@@ -0,0 +1,198 @@
+# charts.py
+#
+# Figure builders for the engine charts.
+# Uses matplotlib's object API (Figure, not pyplot), so the same figures can
+# be embedded in the Tk app or rendered without a display.
+
+from datetime import datetime
+from typing import Dict, List, Tuple, Any
+
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+
+from GroupProject_Main import Game, rank_stats
+
+
+# Above this many engines the bar chart switches to a horizontal layout,
+# which keeps hundreds of engine names readable.
+HORIZONTAL_BAR_THRESHOLD = 12
+
+# Line charts with more points than this are downsampled (LTTB) before drawing.
+LINE_MAX_POINTS = 1000
+
+# Only this many game titles are written on a line chart; when there are more
+# points, the biggest games (by peak players) get the labels.
+ANNOTATE_MAX_POINTS = 25
+
+# Line markers are only drawn when the series is small enough to read them.
+MARKER_MAX_POINTS = 200
+
+BASE_LABELS = {
+    "cost": "Price ($)",
+    "rating": "Rating",
+    "players": "Peak Players",
+    "revenue": "Est. Revenue ($)",
+}
+
+
+def metric_label(metric_key: str) -> str:
+    """ "avg_cost" -> "Average Price ($)", "max_players" -> "Max Peak Players" """
+    prefix, _, base = metric_key.partition("_")
+    stat_prefix = "Average" if prefix == "avg" else "Max"
+    return f"{stat_prefix} {BASE_LABELS.get(base, base)}"
+
+
+def line_series(games: List[Game]) -> List[Tuple[datetime, float, str]]:
+    """
+    (release date, peak players, title) for every game that has a real
+    release date and peak players > 0, oldest first.
+    """
+    points: List[Tuple[datetime, float, str]] = []
+    for g in games:
+        rd = getattr(g, "releaseDate", None)
+        if not isinstance(rd, datetime):
+            continue
+        if g.topPlayerCount is None or g.topPlayerCount <= 0:
+            continue
+        points.append((rd, g.topPlayerCount, g.title))
+    points.sort(key=lambda p: p[0])
+    return points
+
+
+def lttb_downsample(xs: List[float], ys: List[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of at most `threshold` points that keep the visual
+    shape of the series (peaks and dips survive, flat runs get thinned).
+    xs must be sorted ascending.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    kept = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # index of the previously kept point
+
+    for i in range(threshold - 2):
+        # current bucket
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # average of the next bucket (the last bucket is just the final point)
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        kept.append(best)
+        a = best
+
+    kept.append(n - 1)
+    return kept
+
+
+def bar_figure(stats_list: List[Dict[str, Any]], metric_key: str,
+               top_n: int | None = None) -> Figure:
+    """
+    Bar chart of one metric across engines, ranked best first.
+    top_n keeps only the first N engines (None = all).
+    """
+    label = metric_label(metric_key)
+
+    ranked = rank_stats(stats_list, metric_key, descending=True)
+    if top_n is not None:
+        ranked = ranked[:top_n]
+
+    names = [s["engine_name"] for s in ranked]
+    values: List[float] = []
+    for s in ranked:
+        v = s.get(metric_key)
+        values.append(0.0 if v is None or v < 0 else float(v))
+
+    positions = list(range(len(names)))
+    title = f"{label} by Engine"
+    if len(stats_list) > len(ranked):
+        title += f" (top {len(ranked)} of {len(stats_list)})"
+
+    if len(names) > HORIZONTAL_BAR_THRESHOLD:
+        # one row per engine, best at the top; grow the figure with the count
+        fig = Figure(figsize=(9, max(4.0, 0.22 * len(names))))
+        ax = fig.add_subplot()
+        ax.barh(positions, values)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(names, fontsize=7)
+        ax.invert_yaxis()
+        ax.set_xlabel(label)
+    else:
+        fig = Figure(figsize=(8, 5))
+        ax = fig.add_subplot()
+        ax.bar(positions, values)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(names, rotation=45, ha="right")
+        ax.set_ylabel(label)
+
+    ax.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+def line_figure(engine_name: str, points: List[Tuple[datetime, float, str]]) -> Figure:
+    """
+    Peak players over release date for one engine (points from line_series).
+
+    Large series are downsampled with LTTB and only the biggest games are
+    annotated, so engines with thousands of games still draw quickly.
+    """
+    total = len(points)
+    if total > LINE_MAX_POINTS:
+        xs = [mdates.date2num(p[0]) for p in points]
+        ys = [p[1] for p in points]
+        points = [points[i] for i in lttb_downsample(xs, ys, LINE_MAX_POINTS)]
+
+    dates = [p[0] for p in points]
+    peaks = [p[1] for p in points]
+
+    fig = Figure(figsize=(9, 5))
+    ax = fig.add_subplot()
+    ax.plot(dates, peaks, marker="o" if len(points) <= MARKER_MAX_POINTS else None)
+
+    # format x-axis as dates
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
+    fig.autofmt_xdate(rotation=45, ha="right")
+
+    ax.set_ylabel("Peak Players")
+    title = f"Peak Players Over Time – {engine_name}"
+    if total > len(points):
+        title += f" ({len(points)} of {total} points)"
+    ax.set_title(title)
+
+    # label each point with the game title, or only the biggest ones
+    if len(points) <= ANNOTATE_MAX_POINTS:
+        labelled = points
+    else:
+        labelled = sorted(points, key=lambda p: p[1], reverse=True)[:ANNOTATE_MAX_POINTS]
+    for d, p, label in labelled:
+        ax.annotate(
+            label,
+            (d, p),
+            textcoords="offset points",
+            xytext=(0, 5),
+            ha="center",
+            fontsize=8,
+        )
+
+    fig.tight_layout()
+    return fig
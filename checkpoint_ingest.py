@@ -0,0 +1,250 @@
+# checkpoint_ingest.py
+#
+# Checkpointed, resumable ingestion for very large scrape folders.
+#
+# fileRead + htmlToList (and ingest.ingest_folder) keep everything in memory
+# until the last page is parsed, so an interrupted backfill starts over.
+# ingest_checkpointed() parses pages in worker processes and commits the
+# parsed games to a SQLite store every CHECKPOINT_FILES files, together with
+# a per-file progress row (path, size, mtime, ParseReport). On restart, files
+# whose progress row matches their current size and mtime are skipped and
+# only the rest are parsed; a file that changed since it was stored is parsed
+# again and replaces its old rows. The result is read back from the store as
+# the same engineList htmlToList() builds, in the same file order.
+#
+# One store can hold several folders (paths are stored absolute).
+#
+# Usage:
+#     python checkpoint_ingest.py FOLDER [--store build/ingest_checkpoint.sqlite]
+#                                 [--workers N] [--batch 32] [--restart]
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from GroupProject_Main import Game, ParseReport, build_engine_dict, find_engine_files
+from ingest import parse_page, read_text
+
+
+# under build/ (git-ignored), like batch_report's output
+DEFAULT_STORE = os.path.join("build", "ingest_checkpoint.sqlite")
+
+# files parsed between two commits (one transaction per checkpoint)
+CHECKPOINT_FILES = 32
+
+# pages in flight per worker; bounds how many parsed pages wait for a commit
+IN_FLIGHT_PER_WORKER = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    engine_name TEXT,
+    report      TEXT NOT NULL,
+    parsed_at   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    path       TEXT NOT NULL,
+    pos        INTEGER NOT NULL,
+    id         INTEGER NOT NULL,
+    title      TEXT NOT NULL,
+    cost       REAL NOT NULL,
+    rating     REAL NOT NULL,
+    release_ts INTEGER,
+    peak       REAL NOT NULL,
+    follows    INTEGER NOT NULL,
+    online     INTEGER NOT NULL,
+    PRIMARY KEY (path, pos)
+) WITHOUT ROWID;
+"""
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    # WAL: a crash mid-batch loses only that batch; commits stay cheap
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _file_key(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _parse_file(path: str):
+    """Read and parse one engine page (runs in a worker process)."""
+    size, mtime_ns = _file_key(path)
+    entry, report = parse_page(read_text(path))
+    return path, size, mtime_ns, entry, report
+
+
+def _game_row(path: str, pos: int, g: Game) -> tuple:
+    rd = g.releaseDate
+    release_ts = int(rd.timestamp()) if isinstance(rd, datetime) else None
+    return (path, pos, g.id, g.title, g.cost, g.rating, release_ts,
+            g.topPlayerCount, g.follows, g.online)
+
+
+def _row_game(row) -> Game:
+    game_id, title, cost, rating, release_ts, peak, follows, online = row
+    return Game(game_id, sys.intern(title), cost, rating,
+                release_ts if release_ts is not None else "", peak, follows, online)
+
+
+def _commit_batch(conn: sqlite3.Connection, batch: list) -> int:
+    """Store the parsed pages in batch plus their progress rows, in one transaction."""
+    now = datetime.now().isoformat(timespec="seconds")
+    games = 0
+    with conn:
+        for path, size, mtime_ns, entry, report in batch:
+            conn.execute("DELETE FROM games WHERE path = ?", (path,))
+            rows = [_game_row(path, pos, g) for pos, g in enumerate(entry[1:])]
+            conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                         (path, size, mtime_ns, entry[0] if entry else None,
+                          json.dumps(report.to_dict()), now))
+            games += len(rows)
+    return games
+
+
+def pending_files(conn: sqlite3.Connection, paths: List[str]) -> List[str]:
+    """Paths with no progress row, or whose size / mtime changed since it was written."""
+    done: Dict[str, Tuple[int, int]] = {
+        path: (size, mtime_ns)
+        for path, size, mtime_ns in conn.execute("SELECT path, size, mtime_ns FROM files")
+    }
+    return [p for p in paths if done.get(p) != _file_key(p)]
+
+
+def load_engine_list(conn: sqlite3.Connection, paths: List[str],
+                     reports: List[ParseReport] | None = None) -> list:
+    """engineList ([[engine_name, Game, ...], ...]) for paths, read back from the store."""
+    engineList = []
+    for path in paths:
+        row = conn.execute("SELECT engine_name, report FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            continue
+        engine_name, report = row
+        if reports is not None:
+            reports.append(ParseReport.from_dict(json.loads(report)))
+        if engine_name is None:
+            engineList.append([])
+            continue
+        games = conn.execute(
+            "SELECT id, title, cost, rating, release_ts, peak, follows, online "
+            "FROM games WHERE path = ? ORDER BY pos", (path,))
+        engineList.append([engine_name] + [_row_game(r) for r in games])
+    return engineList
+
+
+def ingest_checkpointed(folder: str, store: str = DEFAULT_STORE,
+                        reports: List[ParseReport] | None = None,
+                        workers: int | None = None,
+                        batch_files: int = CHECKPOINT_FILES,
+                        restart: bool = False, quiet: bool = True) -> list:
+    """
+    Parse every engine page under folder, checkpointing to the SQLite store.
+
+    Pages already stored (same size and mtime) are not parsed again, so an
+    interrupted run picks up from its last committed batch. restart drops
+    the stored progress for this folder first. reports is filled with one
+    ParseReport per file, in file order.
+    Returns the engineList, like htmlToList / ingest_folder.
+    """
+    paths = [os.path.abspath(p) for p in find_engine_files(folder)]
+    workers = workers or os.cpu_count() or 1
+    conn = open_store(store)
+    try:
+        if restart:
+            with conn:
+                conn.executemany("DELETE FROM games WHERE path = ?", ((p,) for p in paths))
+                conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in paths))
+
+        todo = pending_files(conn, paths)
+        if not quiet:
+            print(f"{len(paths) - len(todo)} of {len(paths)} files already stored, "
+                  f"{len(todo)} to parse")
+
+        if todo:
+            start = time.perf_counter()
+            done = 0
+            batch = []
+
+            def checkpoint():
+                nonlocal batch, done
+                games = _commit_batch(conn, batch)
+                done += len(batch)
+                batch = []
+                if not quiet:
+                    print(f"  checkpoint: {done}/{len(todo)} files, +{games} games "
+                          f"({time.perf_counter() - start:.1f}s)")
+
+            queue = iter(todo)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                running = set()
+                while True:
+                    try:
+                        # keep a bounded number of pages in flight
+                        while len(running) < workers * IN_FLIGHT_PER_WORKER:
+                            path = next(queue, None)
+                            if path is None:
+                                break
+                            running.add(pool.submit(_parse_file, path))
+                        if not running:
+                            break
+                        finished, running = wait(running, return_when=FIRST_COMPLETED)
+                        batch.extend(f.result() for f in finished)
+                    except (Exception, KeyboardInterrupt):
+                        # a page failed or the run was interrupted: keep what was
+                        # already parsed; the rest is picked up on the next run
+                        if batch:
+                            checkpoint()
+                        raise
+                    # a failed commit is not retried; its error propagates as is
+                    if len(batch) >= batch_files:
+                        checkpoint()
+            if batch:
+                checkpoint()
+
+        return load_engine_list(conn, paths, reports)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpointed, resumable folder ingestion")
+    parser.add_argument("folder")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--batch", type=int, default=CHECKPOINT_FILES,
+                        help="files per checkpoint (commit)")
+    parser.add_argument("--restart", action="store_true",
+                        help="forget stored progress for this folder and parse everything")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reports: List[ParseReport] = []
+    try:
+        engineList = ingest_checkpointed(args.folder, args.store, reports, args.workers,
+                                         max(1, args.batch), args.restart, quiet=False)
+    except KeyboardInterrupt:
+        raise SystemExit("\nInterrupted. Parsed files are kept in the store; "
+                         "run again to resume.")
+    engine_dict = build_engine_dict(engineList)
+    games = sum(len(g) for g in engine_dict.values())
+    print(f"{len(engine_dict)} engines / {games} games from {len(reports)} files "
+          f"in {time.perf_counter() - start:.2f}s (store: {args.store})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# engine_core.py
+#
+# Shared data + analytics core used by every front end (run_ui in
+# GroupProject_Main.py, the Tk app in engine_ui.py and engine_server.py).
+#
+# EngineDataset owns the loaded engine_dict and everything derived from it:
+# the name index, the per-engine stats (computed once for all engines by
+# compute_stats_matrix), the revenue model columns, the corpus analytics and
+# the game query index. Front ends ask the dataset instead of recomputing
+# stats themselves.
+
+import contextlib
+import io
+from typing import Any, Dict, Iterator, List, Tuple
+
+from GroupProject_Main import (Game, ParseReport, build_engine_dict, compute_stats_matrix,
+                               fileRead, htmlToList)
+from analytics import CorpusAnalytics
+from name_index import EngineNameIndex
+from query_engine import GameQuery, QueryIndex, QueryResult
+from revenue_models import DEFAULT_REVENUE_MODEL, REVENUE_MODELS, RevenueModels
+
+
+class EngineDataset:
+    """
+    One loaded corpus plus cached aggregates.
+
+    Stats dicts handed out are copies, so callers may add keys (e.g. "rank")
+    or sort them without touching the cache.
+    """
+
+    def __init__(self, engine_dict: Dict[str, List[Game]] | None = None,
+                 parse_reports: List[ParseReport] | None = None,
+                 folder: str | None = None):
+        self.engine_dict: Dict[str, List[Game]] = engine_dict or {}
+        self.parse_reports: List[ParseReport] = parse_reports or []
+        self.folder = folder
+        self.engine_names: List[str] = sorted(self.engine_dict.keys())
+        self.name_index = EngineNameIndex(self.engine_names)
+
+        self.revenue_model = DEFAULT_REVENUE_MODEL
+        self._revenue: RevenueModels | None = None
+        self._analytics: CorpusAnalytics | None = None
+        self._query_index: QueryIndex | None = None
+        self._revenue_by_game: Tuple[str, Dict[int, float]] | None = None
+        self._stats: Dict[str, Dict[str, Any]] | None = None
+
+    @classmethod
+    def from_folder(cls, folder: str, quiet: bool = False,
+                    checkpoint: str | None = None) -> "EngineDataset":
+        """
+        Read and parse every engine page under folder (quiet: hide fileRead's output).
+        checkpoint: path of a SQLite store; pages are then parsed in parallel
+        and committed there in batches, and already stored pages are reused
+        (see checkpoint_ingest.py).
+        """
+        if checkpoint is not None:
+            from checkpoint_ingest import ingest_checkpointed
+
+            reports: List[ParseReport] = []
+            engine_list = ingest_checkpointed(folder, checkpoint, reports, quiet=quiet)
+            return cls(build_engine_dict(engine_list), reports, folder)
+        if quiet:
+            with contextlib.redirect_stdout(io.StringIO()):
+                engine_file_list = fileRead(folder)
+        else:
+            engine_file_list = fileRead(folder)
+        reports: List[ParseReport] = []
+        engine_dict = build_engine_dict(htmlToList(engine_file_list, reports))
+        return cls(engine_dict, reports, folder)
+
+    # --- lookups ---
+
+    def __len__(self):
+        return len(self.engine_dict)
+
+    @property
+    def num_games(self) -> int:
+        return sum(len(games) for games in self.engine_dict.values())
+
+    def resolve(self, name: str) -> str | None:
+        """Exact engine name for a normalized name ("lime openfl"), or None."""
+        return self.name_index.lookup(name)
+
+    def search(self, query: str, limit: int | None = 10) -> List[str]:
+        """Engine names ranked by how well they match query (prefix, partial, typos); limit=None: all."""
+        return self.name_index.search(query, limit)
+
+    def games(self, engine_name: str) -> List[Game]:
+        return self.engine_dict.get(engine_name, [])
+
+    def all_games(self) -> Iterator[Tuple[str, Game]]:
+        for engine_name, games in self.engine_dict.items():
+            for g in games:
+                yield engine_name, g
+
+    # --- stats ---
+
+    def _stats_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self._stats is None:
+            matrix = compute_stats_matrix(self.engine_dict)
+            if self.revenue_model != DEFAULT_REVENUE_MODEL:
+                self.revenue.apply(matrix, self.revenue_model)
+            self._stats = {s["engine_name"]: s for s in matrix}
+        return self._stats
+
+    def stats(self, engine_name: str) -> Dict[str, Any] | None:
+        """Stats for one engine (exact name), or None if it isn't loaded."""
+        s = self._stats_cache().get(engine_name)
+        return dict(s) if s is not None else None
+
+    def stats_matrix(self, engine_names: List[str] | None = None) -> List[Dict[str, Any]]:
+        """Stats for the given exact engine names (default: all engines)."""
+        cache = self._stats_cache()
+        if engine_names is None:
+            engine_names = self.engine_names
+        return [dict(cache[n]) for n in engine_names if n in cache]
+
+    def compare(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Stats for normalized engine names; unknown names are skipped."""
+        resolved = []
+        for raw in names:
+            engine_name = self.resolve(raw)
+            if engine_name is not None and engine_name not in resolved:
+                resolved.append(engine_name)
+        return self.stats_matrix(resolved)
+
+    # --- revenue models ---
+
+    @property
+    def revenue(self) -> RevenueModels:
+        if self._revenue is None:
+            self._revenue = RevenueModels(self.engine_dict)
+        return self._revenue
+
+    def set_revenue_model(self, model: str) -> None:
+        """Switch revenue model; only the cached revenue columns are recomputed."""
+        if model not in REVENUE_MODELS:
+            raise ValueError(f"Unknown revenue model: {model}")
+        self.revenue_model = model
+        if self._stats is not None:
+            self.revenue.apply(list(self._stats.values()), model)
+        if self._query_index is not None:
+            self._query_index.set_revenue(self.revenue.values(model))
+        if self._analytics is not None:
+            self._analytics.set_revenue(self.revenue.values(model))
+
+    def revenue_of(self, game: Game) -> float:
+        """One game's revenue under the active model (-1 = no estimate), e.g. for exports."""
+        if self._revenue_by_game is None or self._revenue_by_game[0] != self.revenue_model:
+            values = self.revenue.values(self.revenue_model)
+            # values follow GameColumns rows, i.e. all_games() order
+            by_game = {id(g): v for (_, g), v in zip(self.all_games(), values)}
+            self._revenue_by_game = (self.revenue_model, by_game)
+        return self._revenue_by_game[1].get(id(game), -1)
+
+    # --- analytics ---
+
+    @property
+    def analytics(self) -> CorpusAnalytics:
+        """Correlations / price tiers, computed on first use and cached with the dataset."""
+        if self._analytics is None:
+            self._analytics = CorpusAnalytics(self.engine_dict, self.revenue.columns,
+                                              self.revenue.values(self.revenue_model))
+        return self._analytics
+
+    # --- game queries ---
+
+    @property
+    def query_index(self) -> QueryIndex:
+        """Columns + sorted indexes for game queries, built on first use."""
+        if self._query_index is None:
+            self._query_index = QueryIndex(self.engine_dict, self.revenue.columns,
+                                           self.revenue.values(self.revenue_model))
+        return self._query_index
+
+    def query(self, query: GameQuery) -> QueryResult:
+        """All (engine_name, Game) rows matching every predicate, sorted by engine, title."""
+        return self.query_index.run(query)
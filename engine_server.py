@@ -0,0 +1,327 @@
+# engine_server.py
+#
+# Resident query server: loads the engine pages once and answers stats /
+# filter / compare / top-K queries over a local HTTP/JSON API, so dashboards
+# don't each have to re-parse the whole corpus.
+#
+# Usage:
+#     python engine_server.py FOLDER [--port 8538] [--threads 8]
+#
+# Endpoints (all GET, JSON responses):
+#     /engines                                  list of engine names
+#     /stats?engine=Godot Engine                stats for one engine
+#     /compare?engines=A,B,C&sort=avg_players   ranked stats for several engines
+#     /top?metric=avg_players&k=10              top K engines by a stats column
+#     /filter?min_rating=90&max_rating=100&min_price=0&max_price=20
+#            &engine=Unity Engine&limit=100     games matching all given filters
+#     /health                                   dataset size, load time, version
+#
+# The folder is re-checked at most every RELOAD_CHECK_SECONDS; if any page was
+# added, removed or modified, a background thread reloads the data while every
+# request keeps using the old snapshot, then the new one is swapped in
+# atomically.
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from engine_core import EngineDataset
+from GroupProject_Main import Game, STAT_COLUMNS, find_engine_files, rank_stats
+from query_engine import GameQuery
+
+
+DEFAULT_PORT = 8538
+DEFAULT_THREADS = 8
+RELOAD_CHECK_SECONDS = 5.0
+MAX_FILTER_LIMIT = 10000
+
+
+class QueryError(Exception):
+    """Bad request parameters; reported to the client as HTTP 400."""
+
+
+class EngineNotFound(Exception):
+    """No engine matches the requested name; reported as HTTP 404."""
+
+
+# ---------- Warm dataset ----------
+
+class EngineSnapshot:
+    """
+    One loaded version of the corpus plus the indexes built from it.
+    Never modified after construction, so request threads can share it freely.
+    """
+
+    def __init__(self, folder: str, version: int):
+        start = time.perf_counter()
+        self.folder = folder
+        self.version = version
+        self.signature = folder_signature(folder)
+
+        self.data = EngineDataset.from_folder(folder, quiet=True)
+        self.engine_dict: Dict[str, List[Game]] = self.data.engine_dict
+        self.engine_names = self.data.engine_names
+
+        # stats for every engine, computed once by the shared core
+        self.stats = {s["engine_name"]: s for s in self.data.stats_matrix()}
+
+        # column index for /filter, built here rather than by the first request
+        self.data.query_index
+
+        self.num_games = sum(len(games) for games in self.engine_dict.values())
+        self.loaded_at = datetime.now()
+        self.load_seconds = time.perf_counter() - start
+
+    def resolve(self, name: str) -> str:
+        engine_name = self.data.resolve(name)
+        if engine_name is None:
+            raise EngineNotFound(name)
+        return engine_name
+
+
+def folder_signature(folder: str) -> Tuple:
+    """(path, size, mtime) for every engine page; changes when any page changes."""
+    sig = []
+    for path in find_engine_files(folder):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sig.append((path, st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+
+class EngineStore:
+    """Holds the current EngineSnapshot and reloads it when the folder changes."""
+
+    def __init__(self, folder: str, check_every: float = RELOAD_CHECK_SECONDS):
+        self.folder = folder
+        self.check_every = check_every
+        self._snapshot = EngineSnapshot(folder, 1)
+        self._last_check = time.monotonic()
+        self._reload_lock = threading.Lock()
+
+    def current(self) -> EngineSnapshot:
+        """The latest loaded snapshot; never waits for a check or a reload."""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_every and self._reload_lock.acquire(blocking=False):
+            # one reload thread at a time; requests keep using the old snapshot
+            self._last_check = now
+            threading.Thread(target=self._reload, name="engine-reload", daemon=True).start()
+        return self._snapshot
+
+    def _reload(self) -> None:
+        """Check the folder and, if it changed, build and swap in a new snapshot."""
+        try:
+            snap = self._snapshot
+            if folder_signature(self.folder) != snap.signature:
+                self._snapshot = EngineSnapshot(self.folder, snap.version + 1)
+        except Exception as e:
+            print(f"Reload of {self.folder} failed, still serving version "
+                  f"{self._snapshot.version}: {e!r}", file=sys.stderr)
+        finally:
+            self._reload_lock.release()
+
+
+# ---------- Queries ----------
+
+def _float_param(params: Dict[str, str], key: str) -> float | None:
+    if key not in params or params[key] == "":
+        return None
+    try:
+        return float(params[key])
+    except ValueError:
+        raise QueryError(f"'{key}' must be a number") from None
+
+
+def _int_param(params: Dict[str, str], key: str, default: int) -> int:
+    if key not in params or params[key] == "":
+        return default
+    try:
+        return int(params[key])
+    except ValueError:
+        raise QueryError(f"'{key}' must be a whole number") from None
+
+
+def _stats_column(params: Dict[str, str], key: str, default: str) -> str:
+    column = params.get(key) or default
+    if column not in STAT_COLUMNS:
+        raise QueryError(f"'{key}' must be one of: {', '.join(STAT_COLUMNS)}")
+    return column
+
+
+def game_json(engine_name: str, g: Game) -> Dict[str, Any]:
+    rd = g.releaseDate
+    return {
+        "engine": engine_name,
+        "id": g.id,
+        "title": g.title,
+        "cost": g.cost if g.cost >= 0 else None,
+        "rating": g.rating if g.rating >= 0 else None,
+        "release_date": rd.strftime("%Y-%m-%d") if isinstance(rd, datetime) else None,
+        "top_players": g.topPlayerCount if g.topPlayerCount >= 0 else None,
+    }
+
+
+def query_engines(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    return snap.engine_names
+
+
+def query_stats(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    if not params.get("engine"):
+        raise QueryError("missing 'engine'")
+    return snap.stats[snap.resolve(params["engine"])]
+
+
+def query_compare(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    names = [n for n in params.get("engines", "").split(",") if n.strip()]
+    if not names:
+        raise QueryError("missing 'engines' (comma separated)")
+    stats_list = [snap.stats[snap.resolve(n)] for n in names]
+    sort_key = _stats_column(params, "sort", "avg_players")
+    return rank_stats(stats_list, sort_key, descending=(sort_key != "engine_name"))
+
+
+def query_top(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    metric = _stats_column(params, "metric", "avg_players")
+    k = _int_param(params, "k", 10)
+    return rank_stats(list(snap.stats.values()), metric)[:max(k, 0)]
+
+
+def query_filter(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    query = GameQuery()
+    query.set_range("rating", _float_param(params, "min_rating"), _float_param(params, "max_rating"))
+    query.set_range("price", _float_param(params, "min_price"), _float_param(params, "max_price"))
+    if params.get("engine"):
+        query.engines = {snap.resolve(params["engine"])}
+    limit = min(_int_param(params, "limit", 100), MAX_FILTER_LIMIT)
+
+    # same query plans as the CLI and the Tk app
+    rows = snap.data.query(query).rows
+    if "rating" in query.ranges:
+        rows.sort(key=lambda row: row[1].rating, reverse=True)  # best rated first
+    return {"total": len(rows),
+            "games": [game_json(engine_name, g) for engine_name, g in rows[:max(limit, 0)]]}
+
+
+def query_health(snap: EngineSnapshot, params: Dict[str, str]) -> Any:
+    return {
+        "folder": snap.folder,
+        "version": snap.version,
+        "engines": len(snap.engine_names),
+        "games": snap.num_games,
+        "loaded_at": snap.loaded_at.isoformat(timespec="seconds"),
+        "load_seconds": round(snap.load_seconds, 3),
+    }
+
+
+ROUTES = {
+    "/engines": query_engines,
+    "/stats": query_stats,
+    "/compare": query_compare,
+    "/top": query_top,
+    "/filter": query_filter,
+    "/health": query_health,
+}
+
+
+# ---------- HTTP ----------
+
+class EngineRequestHandler(BaseHTTPRequestHandler):
+    server_version = "EngineServer/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            self._send(404, {"error": f"unknown endpoint {url.path}", "endpoints": sorted(ROUTES)})
+            return
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            self._send(200, route(self.server.store.current(), params))
+        except QueryError as e:
+            self._send(400, {"error": str(e)})
+        except EngineNotFound as e:
+            self._send(404, {"error": f"engine not found: {e.args[0]}"})
+        except Exception as e:
+            self.log_error("%s failed: %r", url.path, e)
+            self._send(500, {"error": "internal error"})
+
+    def _send(self, status: int, payload: Any):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles each connection on a fixed-size thread pool."""
+
+    daemon_threads = True
+
+    def __init__(self, address, store: EngineStore, threads: int = DEFAULT_THREADS,
+                 quiet: bool = False):
+        super().__init__(address, EngineRequestHandler)
+        self.store = store
+        self.quiet = quiet
+        self._pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def serve(folder: str, port: int = DEFAULT_PORT, threads: int = DEFAULT_THREADS,
+          quiet: bool = False) -> None:
+    store = EngineStore(folder)
+    snap = store.current()
+    print(f"Loaded {len(snap.engine_names)} engines / {snap.num_games} games "
+          f"in {snap.load_seconds:.2f}s")
+    # localhost only: this is a local helper for dashboards, not a public service
+    server = PooledHTTPServer(("127.0.0.1", port), store, threads, quiet)
+    print(f"Serving on http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping.")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON query server for engine stats.")
+    parser.add_argument("folder", help="folder containing the SteamDB engine pages")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS)
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    args = parser.parse_args()
+    serve(args.folder, args.port, args.threads, args.quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,131 +1,66 @@
 # engine_ui.py
 #
 # Tkinter UI for the Game Engine analysis project.
-# Uses parsing logic and Game class from GroupProject_Main.py
+# Data loading and stats come from the shared core (engine_core.EngineDataset),
+# which uses the parsing logic and Game class from GroupProject_Main.py
 
+import threading
 import tkinter as tk
+from collections import OrderedDict
 from datetime import datetime
 from tkinter import ttk, messagebox, filedialog, simpledialog
-from typing import Dict, List, Tuple, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Any
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+# matplotlib is only needed for the two chart buttons and is slow to import,
+# so charts.py and the Tk backend are imported on first use (and pre-warmed in
+# a background thread once the window is up), not at startup.
+if TYPE_CHECKING:
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
 
+from analytics import CORRELATION_METHODS, format_analytics_report
+from export_results import export_games, export_stats
+from query_engine import GameQuery, parse_query
+from revenue_models import REVENUE_MODELS
+from engine_core import EngineDataset
+from GroupProject_Main import (Game, ParseReport, _fmt, format_parse_report,
+                               rank_stats, write_stats_csv)
 
-from GroupProject_Main import fileRead, htmlToList, Game, compare_engines
 
+# ---------- Plotting helpers ----------
 
-# ---------- Data helpers ----------
+# How many built figures the app keeps around (keyed by engine set + metric).
+FIGURE_CACHE_SIZE = 16
 
-def build_engine_dict(engine_list: List[list]) -> Dict[str, List[Game]]:
-    """
-    Convert engineList:
-        [ [engine_name, Game, Game, ...], [engine_name2, Game, ...], ... ]
-    into:
-        { "Engine Name": [Game, Game, ...], ... }
-    """
-    engine_dict: Dict[str, List[Game]] = {}
-    for entry in engine_list:
-        if not entry:
-            continue
-        engine_name = entry[0]  # engine name is the first item
-        games = entry[1:]       # the following items are game objects
-        engine_dict[engine_name] = games
-    return engine_dict
-
-
-def _safe_avg(values: List[float]) -> float | None:
-    usable = [v for v in values if v is not None and v >= 0]
-    if not usable:
-        return None
-    return sum(usable) / len(usable)
+# How long after startup (ms) the plotting modules are imported in the background.
+PREWARM_DELAY_MS = 300
 
 
-def _safe_max(values: List[float]) -> float | None:
-    usable = [v for v in values if v is not None and v >= 0]
-    if not usable:
-        return None
-    return max(usable)
+def _import_plotting() -> None:
+    """Import the plotting modules so the first chart doesn't pay for it."""
+    try:
+        import charts  # noqa: F401  (pulls in matplotlib.figure / matplotlib.dates)
+        import matplotlib.backends.backend_tkagg  # noqa: F401
+    except ImportError:
+        # reported properly when a chart is actually requested
+        pass
 
 
-def compute_engine_stats(engine_name: str, games: List[Game]) -> Dict[str, Any]:
+def plot_bar_comparison(stats_list: List[Dict[str, Any]], metric_key: str,
+                        top_n: int | None = None) -> "Figure | None":
     """
-    Compute averages and max values for one engine, including revenue estimates.
-    Revenue per game = cost * topPlayerCount (only when both are valid >= 0).
-    """
-    costs = [g.cost for g in games]
-    ratings = [g.rating for g in games]
-    players = [g.topPlayerCount for g in games]
-
-    revenues: List[float] = []
-    for g in games:
-        if g.cost is not None and g.cost >= 0 and \
-           g.topPlayerCount is not None and g.topPlayerCount >= 0:
-            revenues.append(g.cost * g.topPlayerCount)
-
-    return {
-        "engine_name": engine_name,
-        "num_games": len(games),
-        "avg_cost": _safe_avg(costs),
-        "max_cost": _safe_max(costs),
-        "avg_rating": _safe_avg(ratings),
-        "max_rating": _safe_max(ratings),
-        "avg_players": _safe_avg(players),
-        "max_players": _safe_max(players),
-        "avg_revenue": _safe_avg(revenues),
-        "max_revenue": _safe_max(revenues),
-    }
-
-
-def _fmt(v: float | None, money: bool = False) -> str:
-    if v is None or v < 0:
-        return "N/A"
-    if money:
-        return f"${v:,.2f}"
-    return f"{v:,.2f}"
-
-
-# ---------- Plotting helpers ----------
-
-def plot_bar_comparison(stats_list: List[Dict[str, Any]], metric_key: str) -> None:
-    """
-    metric_key is like "avg_cost", "max_rating", "avg_players", "max_players".
-    (Revenue isn't wired into the bar chart yet.)
+    metric_key is like "avg_cost", "max_rating", "avg_players", "max_revenue".
+    Engines are ranked by the metric; top_n keeps only the first N (None = all).
+    Returns the figure (the app embeds it), or None if there is nothing to plot.
     """
     if not stats_list:
         messagebox.showinfo("Bar Chart", "No data to plot.")
-        return
-
-    prefix, _, base = metric_key.partition("_")  # "avg", "_", "cost"
-    base_labels = {
-        "cost": "Price ($)",
-        "rating": "Rating",
-        "players": "Peak Players",
-    }
-    stat_prefix = "Average" if prefix == "avg" else "Max"
-    y_label = f"{stat_prefix} {base_labels.get(base, base)}"
-
-    names = [s["engine_name"] for s in stats_list]
-    values: List[float] = []
-    for s in stats_list:
-        v = s.get(metric_key)
-        if v is None or v < 0:
-            values.append(0.0)
-        else:
-            values.append(float(v))
-
-    x_positions = range(len(names))
-
-    plt.figure()
-    plt.bar(x_positions, values)
-    plt.xticks(list(x_positions), names, rotation=45, ha="right")
-    plt.ylabel(y_label)
-    plt.title(f"{y_label} by Engine")
-    plt.tight_layout()
-    plt.show()
+        return None
+    from charts import bar_figure
+    return bar_figure(stats_list, metric_key, top_n)
 
 
-def plot_line_for_engine(engine_name: str, games: List[Game]) -> None:
+def plot_line_for_engine(engine_name: str, games: List[Game]) -> "Figure | None":
     """
     Line chart for a single engine.
 
@@ -138,59 +73,19 @@ def plot_line_for_engine(engine_name: str, games: List[Game]) -> None:
     """
     if not games:
         messagebox.showinfo("Line Chart", "No games to plot.")
-        return
-
-    points: List[Tuple[datetime, float, str]] = []
-
-    for g in games:
-        rd = getattr(g, "releaseDate", None)
-        if not isinstance(rd, datetime):
-            continue
-        if g.topPlayerCount is None or g.topPlayerCount <= 0:
-            continue
+        return None
 
-        title_clean = g.title.lstrip(">").strip()
-        points.append((rd, g.topPlayerCount, title_clean))
+    from charts import line_figure, line_series
 
+    points = line_series(games)
     if not points:
         messagebox.showinfo(
             "Line Chart",
             "No games with valid release date and peak players > 0."
         )
-        return
-
-    # sort by release date (oldest -> newest)
-    points.sort(key=lambda p: p[0])
-
-    dates = [p[0] for p in points]
-    peaks = [p[1] for p in points]
-    labels = [p[2] for p in points]
-
-    fig, ax = plt.subplots()
-    ax.plot(dates, peaks, marker="o")
-
-    # format x-axis as dates
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d"))
-    fig.autofmt_xdate(rotation=45, ha="right")
-
-    ax.set_ylabel("Peak Players")
-    ax.set_title(f"Peak Players Over Time – {engine_name}")
-
-    # Optional: label each point with the game title
-    for d, p, label in zip(dates, peaks, labels):
-        ax.annotate(
-            label,
-            (d, p),
-            textcoords="offset points",
-            xytext=(0, 5),
-            ha="center",
-            fontsize=8,
-        )
-
-    plt.tight_layout()
-    plt.show()
-
+        return None
 
+    return line_figure(engine_name, points)
 
 
 # ---------- Tkinter App ----------
@@ -202,19 +97,43 @@ class EngineApp(tk.Tk):
         self.title("Game Engine Analysis UI")
         self.geometry("1000x640")
 
-        self.engine_dict: Dict[str, List[Game]] = {}
-        self.engine_names: List[str] = []
+        # loaded corpus + cached stats / revenue columns (shared core, see engine_core.py)
+        self.data = EngineDataset()
+        self.revenue_model = self.data.revenue_model
+
+        # Active filters: one combined query (engines, title, rating / price /
+        # year / players / revenue ranges), set by the filter buttons or typed
+        # in the Query dialog and evaluated by query_engine.
+        self.game_query = GameQuery()
 
-        # Active filters (None = no filter)
-        # rating_filter: (min_rating, max_rating)
-        # release_filter: (start_year, end_year)
-        # price_filter: (min_price, max_price or None)
-        self.rating_filter: Tuple[float, float] | None = None
-        self.release_filter: Tuple[int | None, int | None] | None = None
-        self.price_filter: Tuple[float, float | None] | None = None
+        # Built chart figures, keyed by (chart kind, engine names, metric, ...).
+        # Cleared whenever a new folder is loaded.
+        self._figure_cache: "OrderedDict[tuple, Figure]" = OrderedDict()
+        self._chart_win: tk.Toplevel | None = None
+        self._chart_canvas: "FigureCanvasTkAgg | None" = None
+
+        # last comparison table shown, so it can be saved
+        self._last_stats: List[Dict[str, Any]] | None = None
 
         self._build_widgets()
 
+        # load matplotlib in the background once the window is showing
+        self.after(PREWARM_DELAY_MS, self._prewarm_plotting)
+
+    # --- dataset shortcuts ---
+
+    @property
+    def engine_dict(self) -> Dict[str, List[Game]]:
+        return self.data.engine_dict
+
+    @property
+    def engine_names(self) -> List[str]:
+        return self.data.engine_names
+
+    @property
+    def parse_reports(self) -> List[ParseReport]:
+        return self.data.parse_reports
+
     # --- UI layout ---
 
     def _build_widgets(self):
@@ -231,6 +150,15 @@ class EngineApp(tk.Tk):
 
         ttk.Button(top, text="Load Folder...", command=self.load_folder).pack(side=tk.RIGHT, padx=4)
 
+        # revenue model picker: switching only recomputes the revenue column
+        self._revenue_labels = {label: name for name, (label, _) in REVENUE_MODELS.items()}
+        self.revenue_var = tk.StringVar(value=REVENUE_MODELS[self.revenue_model][0])
+        revenue_box = ttk.Combobox(top, textvariable=self.revenue_var, state="readonly", width=26,
+                                   values=list(self._revenue_labels))
+        revenue_box.pack(side=tk.RIGHT, padx=4)
+        revenue_box.bind("<<ComboboxSelected>>", self._on_revenue_model)
+        ttk.Label(top, text="Revenue model:").pack(side=tk.RIGHT)
+
         # Middle frame: two listboxes (all engines, selected engines)
         mid = ttk.Frame(self)
         mid.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=8, pady=4)
@@ -240,6 +168,12 @@ class EngineApp(tk.Tk):
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         ttk.Label(left_frame, text="All Engines").pack(anchor="w")
+        # Type-ahead: narrows list_all as you type (prefix, partial and typo matches)
+        self.engine_query = tk.StringVar()
+        self.engine_query.trace_add("write", lambda *_: self._refresh_all_listbox())
+        search_entry = ttk.Entry(left_frame, textvariable=self.engine_query)
+        search_entry.pack(side=tk.TOP, fill=tk.X, pady=(0, 2))
+        search_entry.bind("<Return>", self._add_top_match)
         self.list_all = tk.Listbox(left_frame, selectmode=tk.EXTENDED)
         self.list_all.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar_all = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.list_all.yview)
@@ -276,10 +210,14 @@ class EngineApp(tk.Tk):
         ttk.Button(button_frame, text="Filter by rating range", command=self.ui_rating_filter).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Filter by release year", command=self.ui_release_filter).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Filter by price", command=self.ui_price_filter).pack(side=tk.LEFT, padx=4, pady=2)
+        ttk.Button(button_frame, text="Query...", command=self.ui_query).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Clear filters", command=self.ui_clear_filters).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Compare selected (text)", command=self.ui_compare_selected).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Bar chart (selected)", command=self.ui_bar_chart).pack(side=tk.LEFT, padx=4, pady=2)
         ttk.Button(button_frame, text="Line chart (selected one)", command=self.ui_line_chart).pack(side=tk.LEFT, padx=4, pady=2)
+        ttk.Button(button_frame, text="Save results...", command=self.ui_save_results).pack(side=tk.LEFT, padx=4, pady=2)
+        ttk.Button(button_frame, text="Parse report", command=self.ui_parse_report).pack(side=tk.LEFT, padx=4, pady=2)
+        ttk.Button(button_frame, text="Analytics report", command=self.ui_analytics_report).pack(side=tk.LEFT, padx=4, pady=2)
 
         # Log output
         ttk.Label(bottom, text="Output:").pack(anchor="w")
@@ -294,24 +232,22 @@ class EngineApp(tk.Tk):
             return
 
         try:
-            engine_file_list = fileRead(folder)
-            engine_list = htmlToList(engine_file_list)
-            engine_dict = build_engine_dict(engine_list)
+            data = EngineDataset.from_folder(folder)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data:\n{e}")
             return
 
-        if not engine_dict:
+        if not data.engine_dict:
             messagebox.showwarning("No Data", "No engines found in that folder.")
             return
 
-        self.engine_dict = engine_dict
-        self.engine_names = sorted(engine_dict.keys())
+        data.set_revenue_model(self.revenue_model)
+        self.data = data
+        self._figure_cache.clear()
 
         # reset filters when loading a new folder
-        self.rating_filter = None
-        self.release_filter = None
-        self.price_filter = None
+        self.game_query = GameQuery()
+        self._last_stats = None
 
         self.folder_label.config(text=folder)
         self._refresh_all_listbox()
@@ -323,11 +259,30 @@ class EngineApp(tk.Tk):
         if len(self.engine_names) > 10:
             self.output_text.insert(tk.END, "  ...\n")
 
+        dropped = sum(r.rows_seen - r.rows_kept for r in self.parse_reports)
+        drifted = sum(1 for r in self.parse_reports if r.layout_drift())
+        if dropped or drifted:
+            self.output_text.insert(
+                tk.END,
+                f"\nWarning: {dropped} rows dropped, {drifted} files with an unexpected "
+                f"table layout. See 'Parse report'.\n"
+            )
+
     def _refresh_all_listbox(self):
+        query = self.engine_query.get().strip()
+        names = self.data.search(query, limit=len(self.data)) if query else self.engine_names
         self.list_all.delete(0, tk.END)
-        for name in self.engine_names:
+        for name in names:
             self.list_all.insert(tk.END, name)
 
+    def _add_top_match(self, event=None):
+        """Enter in the type-ahead box adds the best match to the selection."""
+        if self.list_all.size() == 0:
+            return
+        name = self.list_all.get(0)
+        if name not in self.list_selected.get(0, tk.END):
+            self.list_selected.insert(tk.END, name)
+
     # --- listbox manipulation ---
 
     def add_selected(self):
@@ -349,91 +304,44 @@ class EngineApp(tk.Tk):
 
     def _get_filtered_games(self) -> List[Tuple[str, Game]]:
         """
-        Apply all active filters (rating, release year, price) and
-        return a list of (engine_name, Game) that satisfy ALL of them.
+        Apply all active filters and return a list of (engine_name, Game)
+        that satisfy ALL of them, sorted by engine then title.
         """
-        results: List[Tuple[str, Game]] = []
-
-        for engine_name, games in self.engine_dict.items():
-            for g in games:
-                # Rating filter
-                if self.rating_filter is not None:
-                    min_r, max_r = self.rating_filter
-                    if g.rating < 0 or g.rating < min_r or g.rating > max_r:
-                        continue
-
-                # Price filter
-                if self.price_filter is not None:
-                    min_p, max_p = self.price_filter
-                    price = g.cost
-                    if price is None or price < 0:
-                        continue
-                    if price < min_p:
-                        continue
-                    if max_p is not None and price > max_p:
-                        continue
-
-                # Release year filter
-                if self.release_filter is not None:
-                    start_year, end_year = self.release_filter
-                    rd = getattr(g, "releaseDate", None)
-                    if not isinstance(rd, datetime):
-                        continue
-                    year = rd.year
-                    if start_year is not None and year < start_year:
-                        continue
-                    if end_year is not None and year > end_year:
-                        continue
-
-                results.append((engine_name, g))
-
-        # Sort by engine then title
-        results.sort(key=lambda tup: (tup[0], tup[1].title))
-        return results
+        return self.data.query(self.game_query).rows
 
     def _render_filtered_results(self):
         """
-        Print the current filter settings + the filtered game list into the output box.
+        Print the current filter settings, the evaluation time and the
+        filtered game list into the output box.
         """
         self.output_text.delete("1.0", tk.END)
 
-        # Build filter summary
-        parts = []
-        if self.rating_filter is not None:
-            rmin, rmax = self.rating_filter
-            parts.append(f"rating {rmin}–{rmax}")
-        if self.release_filter is not None:
-            sy, ey = self.release_filter
-            s_str = str(sy) if sy is not None else "-∞"
-            e_str = str(ey) if ey is not None else "+∞"
-            parts.append(f"release years {s_str}–{e_str}")
-        if self.price_filter is not None:
-            pmin, pmax = self.price_filter
-            pmax_str = f"{pmax:.2f}" if pmax is not None else "∞"
-            parts.append(f"price {pmin:.2f}–{pmax_str}")
-
+        parts = self.game_query.describe()
         if not parts:
-            self.output_text.insert(tk.END, "No active filters. Set a rating, release year, or price filter.\n")
+            self.output_text.insert(tk.END, "No active filters. Set a rating, release year, "
+                                            "or price filter, or type a query.\n")
             return
 
+        result = self.data.query(self.game_query)
         self.output_text.insert(tk.END, "Active filters: " + ", ".join(parts) + "\n")
+        self.output_text.insert(tk.END, result.summary() + "\n")
         self.output_text.insert(tk.END, "-" * 80 + "\n")
 
-        results = self._get_filtered_games()
-        if not results:
+        if not result.rows:
             self.output_text.insert(tk.END, "No games found matching the current filter combination.\n")
             return
 
-        for engine_name, g in results:
+        lines = []
+        for engine_name, g in result.rows:
             rd = getattr(g, "releaseDate", None)
             date_str = rd.strftime("%Y-%m-%d") if isinstance(rd, datetime) else "Unknown"
             price_str = f"${g.cost:.2f}" if g.cost is not None and g.cost >= 0 else "N/A"
             rating_str = f"{g.rating:.2f}" if g.rating >= 0 else "N/A"
-            line = (
-                f"[{engine_name}] {g.title.lstrip('>').strip()} "
+            lines.append(
+                f"[{engine_name}] {g.title} "
                 f"(ID {g.id}) – rating {rating_str}, price {price_str}, release {date_str}\n"
             )
-            self.output_text.insert(tk.END, line)
+        self.output_text.insert(tk.END, "".join(lines))
 
     # --- UI actions ---
 
@@ -442,20 +350,22 @@ class EngineApp(tk.Tk):
         if not name:
             return
 
-        games = self.engine_dict.get(name, [])
-        stats = compute_engine_stats(name, games)
+        stats = self.data.stats(name)
+        if stats is None:
+            return
 
         self.output_text.delete("1.0", tk.END)
         self.output_text.insert(tk.END, f"Engine: {stats['engine_name']}\n")
         self.output_text.insert(tk.END, f"Games counted: {stats['num_games']}\n\n")
-        self.output_text.insert(tk.END, f"Avg price:        {_fmt(stats['avg_cost'], money=True)}\n")
-        self.output_text.insert(tk.END, f"Max price:        {_fmt(stats['max_cost'], money=True)}\n\n")
+        self.output_text.insert(tk.END, f"Avg price:        {_fmt(stats['avg_cost'], is_money=True)}\n")
+        self.output_text.insert(tk.END, f"Max price:        {_fmt(stats['max_cost'], is_money=True)}\n\n")
         self.output_text.insert(tk.END, f"Avg rating:       {_fmt(stats['avg_rating'])}\n")
         self.output_text.insert(tk.END, f"Max rating:       {_fmt(stats['max_rating'])}\n\n")
         self.output_text.insert(tk.END, f"Avg peak players: {_fmt(stats['avg_players'])}\n")
         self.output_text.insert(tk.END, f"Max peak players: {_fmt(stats['max_players'])}\n\n")
-        self.output_text.insert(tk.END, f"Avg est. revenue: {_fmt(stats['avg_revenue'], money=True)}\n")
-        self.output_text.insert(tk.END, f"Max est. revenue: {_fmt(stats['max_revenue'], money=True)}\n")
+        self.output_text.insert(tk.END, f"Avg est. revenue: {_fmt(stats['avg_revenue'], is_money=True)}\n")
+        self.output_text.insert(tk.END, f"Max est. revenue: {_fmt(stats['max_revenue'], is_money=True)}\n")
+        self.output_text.insert(tk.END, f"(revenue model: {REVENUE_MODELS[self.revenue_model][0]})\n")
 
     def ui_rating_filter(self):
         if not self.engine_dict:
@@ -479,13 +389,14 @@ class EngineApp(tk.Tk):
         if min_r > max_r:
             min_r, max_r = max_r, min_r
 
-        self.rating_filter = (min_r, max_r)
+        self.game_query.set_range("rating", min_r, max_r)
         self._render_filtered_results()
 
     def ui_release_filter(self):
         """
         Filter games by release year range (inclusive).
-        Uses Game.releaseDate if it is a datetime; skips 'Unreleased'.
+        Uses Game.releaseDate if it is a datetime; skips 'Unreleased'
+        (both years blank: every released game).
         """
         if not self.engine_dict:
             messagebox.showinfo("Release Filter", "Load a folder first.")
@@ -511,7 +422,9 @@ class EngineApp(tk.Tk):
             messagebox.showerror("Error", "Years must be integers like 2010.")
             return
 
-        self.release_filter = (start_year, end_year)
+        if start_year is None and end_year is None:
+            start_year = 0  # still a range, so unreleased games (year -1) stay out
+        self.game_query.set_range("year", start_year, end_year)
         self._render_filtered_results()
 
     def ui_price_filter(self):
@@ -537,36 +450,77 @@ class EngineApp(tk.Tk):
             messagebox.showerror("Error", "Prices must be numbers like 14.99.")
             return
 
-        self.price_filter = (min_p, max_p)
+        self.game_query.set_range("price", min_p, max_p)
+        self._render_filtered_results()
+
+    def ui_query(self):
+        """
+        Type any combination of filters as one query, e.g.
+        rating>=90 price<=10 year=2015..2020 players>=1000 engine=godot title~rogue
+        The typed query replaces the current filters.
+        """
+        if not self.engine_dict:
+            messagebox.showinfo("Query", "Load a folder first.")
+            return
+
+        text = simpledialog.askstring(
+            "Query",
+            "Filters (all must match):\n"
+            "  rating / price / year / players / revenue: >=N, <=N, =N or =A..B\n"
+            "  engine=name1,name2   title~text   (quote values with spaces)",
+            initialvalue=self.game_query.to_text(),
+        )
+        if text is None:
+            return
+
+        try:
+            self.game_query = parse_query(text, self.data.resolve)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid query:\n{e}")
+            return
         self._render_filtered_results()
 
     def ui_clear_filters(self):
         """Reset all active filters and clear the filtered output."""
-        self.rating_filter = None
-        self.release_filter = None
-        self.price_filter = None
+        self.game_query = GameQuery()
         self.output_text.delete("1.0", tk.END)
         self.output_text.insert(tk.END, "All filters cleared.\n")
 
-    def ui_compare_selected(self):
+    def _comparison_names(self, title: str) -> List[str]:
+        """
+        Engines to compare: everything in the Selected list, or (if it is
+        empty) every loaded engine after confirming with the user.
+        """
         selected_names = list(self.list_selected.get(0, tk.END))
+        if selected_names:
+            return selected_names
+        if not self.engine_names:
+            messagebox.showinfo(title, "Load a folder first.")
+            return []
+        if messagebox.askyesno(
+            title, f"No engines selected. Compare all {len(self.engine_names)} loaded engines?"
+        ):
+            return list(self.engine_names)
+        return []
+
+    def ui_compare_selected(self):
+        selected_names = self._comparison_names("Compare")
         if not selected_names:
-            messagebox.showinfo("Compare", "Pick engines in the Selected list first.")
             return
-        if len(selected_names) > 5:
-            selected_names = selected_names[:5]
-            messagebox.showinfo("Compare", "Using first 5 selected engines.")
 
-        stats_list = compare_engines(self.engine_dict, selected_names)
+        # cached stats from the shared dataset (includes revenue)
+        stats_list = self.data.compare(selected_names)
         if not stats_list:
             messagebox.showinfo("Compare", "None of the selected engines were found.")
             return
 
-        # --- Ask: averages or max? ---
+        # --- Ask: averages or max? sort column? ---
         mode_win = tk.Toplevel(self)
         mode_win.title("Choose stat type")
 
         mode_var = tk.StringVar(value="avg")
+        sort_var = tk.StringVar(value="players")
+        top_var = tk.StringVar(value="")
 
         ttk.Radiobutton(
             mode_win, text="Averages", value="avg", variable=mode_var
@@ -575,19 +529,36 @@ class EngineApp(tk.Tk):
             mode_win, text="Max / Top values", value="max", variable=mode_var
         ).pack(anchor="w", padx=8, pady=2)
 
+        ttk.Label(mode_win, text="Sort by:").pack(anchor="w", padx=8, pady=(8, 2))
+        ttk.Combobox(
+            mode_win, textvariable=sort_var, state="readonly",
+            values=["name", "games", "cost", "rating", "players", "revenue"],
+        ).pack(anchor="w", padx=16, pady=2)
+
+        ttk.Label(mode_win, text="Show top N (blank for all):").pack(anchor="w", padx=8, pady=(8, 2))
+        ttk.Entry(mode_win, textvariable=top_var, width=8).pack(anchor="w", padx=16, pady=2)
+
+        def ranked_table() -> Tuple[List[Dict[str, Any]], bool]:
+            use_avg = (mode_var.get() == "avg")
+            base = sort_var.get()
+            if base == "name":
+                return rank_stats(stats_list, "engine_name", descending=False), use_avg
+            if base == "games":
+                return rank_stats(stats_list, "num_games"), use_avg
+            prefix = "avg" if use_avg else "max"
+            return rank_stats(stats_list, f"{prefix}_{base}"), use_avg
+
         def on_ok():
-            mode = mode_var.get()  # "avg" or "max"
+            top_str = top_var.get().strip()
+            try:
+                top_n = int(top_str) if top_str else None
+            except ValueError:
+                messagebox.showerror("Error", "Top N must be a whole number.")
+                return
+            ranked, use_avg = ranked_table()
             mode_win.destroy()
+            self._last_stats = ranked
 
-            # Enrich stats_list with revenue stats per engine
-            for s in stats_list:
-                eng_name = s["engine_name"]
-                games = self.engine_dict.get(eng_name, [])
-                rev_stats = compute_engine_stats(eng_name, games)
-                s["avg_revenue"] = rev_stats.get("avg_revenue")
-                s["max_revenue"] = rev_stats.get("max_revenue")
-
-            use_avg = (mode == "avg")
             label_prefix = "Average" if use_avg else "Max"
 
             cost_key = "avg_cost" if use_avg else "max_cost"
@@ -595,12 +566,17 @@ class EngineApp(tk.Tk):
             players_key = "avg_players" if use_avg else "max_players"
             revenue_key = "avg_revenue" if use_avg else "max_revenue"
 
+            shown = ranked if top_n is None else ranked[:max(top_n, 0)]
+
             self.output_text.delete("1.0", tk.END)
             self.output_text.insert(
-                tk.END, f"Engine comparison ({label_prefix.lower()} values):\n"
+                tk.END,
+                f"Engine comparison ({label_prefix.lower()} values, "
+                f"{len(shown)} of {len(ranked)} engines):\n"
             )
-            self.output_text.insert(tk.END, "-" * 95 + "\n")
+            self.output_text.insert(tk.END, "-" * 100 + "\n")
             header = (
+                f"{'#':>4s} "
                 f"{'Engine':25s} "
                 f"{'Games':>6s} "
                 f"{label_prefix + ' $':>10s} "
@@ -609,31 +585,51 @@ class EngineApp(tk.Tk):
                 f"{label_prefix + ' Revenue':>18s}\n"
             )
             self.output_text.insert(tk.END, header)
-            self.output_text.insert(tk.END, "-" * 95 + "\n")
-
-            for s in stats_list:
-                line = (
+            self.output_text.insert(tk.END, "-" * 100 + "\n")
+
+            # build the whole block first; one insert is much faster than
+            # hundreds of small ones on a Text widget
+            lines = []
+            for s in shown:
+                lines.append(
+                    f"{s['rank']:>4d} "
                     f"{s['engine_name'][:25]:25s} "
                     f"{s['num_games']:>6d} "
-                    f"{_fmt(s[cost_key], money=True):>10s} "
+                    f"{_fmt(s[cost_key], is_money=True):>10s} "
                     f"{_fmt(s[rating_key]):>12s} "
                     f"{_fmt(s[players_key]):>14s} "
-                    f"{_fmt(s[revenue_key], money=True):>18s}\n"
+                    f"{_fmt(s[revenue_key], is_money=True):>18s}\n"
                 )
-                self.output_text.insert(tk.END, line)
-
-        ttk.Button(mode_win, text="OK", command=on_ok).pack(pady=8)
+            self.output_text.insert(tk.END, "".join(lines))
+
+        def on_export():
+            path = filedialog.asksaveasfilename(
+                parent=mode_win,
+                title="Export comparison",
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            )
+            if not path:
+                return
+            ranked, _ = ranked_table()
+            try:
+                n = write_stats_csv(ranked, path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not write CSV:\n{e}", parent=mode_win)
+                return
+            messagebox.showinfo("Export", f"Wrote {n} engines to\n{path}", parent=mode_win)
+
+        buttons = ttk.Frame(mode_win)
+        buttons.pack(pady=8)
+        ttk.Button(buttons, text="OK", command=on_ok).pack(side=tk.LEFT, padx=4)
+        ttk.Button(buttons, text="Export CSV...", command=on_export).pack(side=tk.LEFT, padx=4)
 
     def ui_bar_chart(self):
-        selected_names = list(self.list_selected.get(0, tk.END))
+        selected_names = self._comparison_names("Bar Chart")
         if not selected_names:
-            messagebox.showinfo("Bar Chart", "Pick engines in the Selected list first.")
             return
-        if len(selected_names) > 5:
-            selected_names = selected_names[:5]
-            messagebox.showinfo("Bar Chart", "Using first 5 selected engines.")
 
-        stats_list = compare_engines(self.engine_dict, selected_names)
+        stats_list = self.data.compare(selected_names)
         if not stats_list:
             messagebox.showinfo("Bar Chart", "No valid engines to compare.")
             return
@@ -643,25 +639,150 @@ class EngineApp(tk.Tk):
 
         metric_var = tk.StringVar(value="cost")   # base metric
         mode_var = tk.StringVar(value="avg")      # "avg" or "max"
+        # default to a readable chart when comparing lots of engines
+        top_var = tk.StringVar(value="25" if len(stats_list) > 25 else "")
 
         ttk.Label(metric_win, text="Metric:").pack(anchor="w", padx=8, pady=(8, 2))
         ttk.Radiobutton(metric_win, text="Price", value="cost", variable=metric_var).pack(anchor="w", padx=16, pady=2)
         ttk.Radiobutton(metric_win, text="Rating", value="rating", variable=metric_var).pack(anchor="w", padx=16, pady=2)
         ttk.Radiobutton(metric_win, text="Peak players", value="players", variable=metric_var).pack(anchor="w", padx=16, pady=2)
+        ttk.Radiobutton(metric_win, text="Est. revenue", value="revenue", variable=metric_var).pack(anchor="w", padx=16, pady=2)
 
         ttk.Label(metric_win, text="Stat type:").pack(anchor="w", padx=8, pady=(8, 2))
         ttk.Radiobutton(metric_win, text="Averages", value="avg", variable=mode_var).pack(anchor="w", padx=16, pady=2)
         ttk.Radiobutton(metric_win, text="Max / Top values", value="max", variable=mode_var).pack(anchor="w", padx=16, pady=2)
 
+        ttk.Label(metric_win, text="Top N engines (blank for all):").pack(anchor="w", padx=8, pady=(8, 2))
+        ttk.Entry(metric_win, textvariable=top_var, width=8).pack(anchor="w", padx=16, pady=2)
+
         def on_ok():
-            base = metric_var.get()   # "cost"/"rating"/"players"
+            base = metric_var.get()   # "cost"/"rating"/"players"/"revenue"
             mode = mode_var.get()     # "avg"/"max"
             metric_key = f"{mode}_{base}"   # e.g. "avg_cost" or "max_players"
+            top_str = top_var.get().strip()
+            try:
+                top_n = int(top_str) if top_str else None
+            except ValueError:
+                messagebox.showerror("Error", "Top N must be a whole number.")
+                return
             metric_win.destroy()
-            plot_bar_comparison(stats_list, metric_key)
+            key = ("bar", tuple(s["engine_name"] for s in stats_list), metric_key, top_n,
+                   self.revenue_model if base == "revenue" else None)
+            self._show_chart(key, "Bar Chart",
+                             lambda: plot_bar_comparison(stats_list, metric_key, top_n))
 
         ttk.Button(metric_win, text="OK", command=on_ok).pack(pady=8)
 
+    def ui_parse_report(self):
+        """Show parse telemetry for the loaded folder (rows kept / skipped / defaulted)."""
+        if not self.parse_reports:
+            messagebox.showinfo("Parse Report", "Load a folder first.")
+            return
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, "Parse quality report\n")
+        self.output_text.insert(tk.END, "-" * 80 + "\n")
+        self.output_text.insert(tk.END, format_parse_report(self.parse_reports) + "\n")
+
+    def ui_analytics_report(self):
+        """
+        Correlation matrix and price-tier summary for the selected engine,
+        or for all games when no engine is selected (cached by the dataset).
+        """
+        if not self.engine_dict:
+            messagebox.showinfo("Analytics", "Load a folder first.")
+            return
+
+        sel = self.list_selected.curselection()
+        engine_name = self.list_selected.get(sel[0]) if sel else None
+        if engine_name is None and self.list_all.curselection():
+            engine_name = self.list_all.get(self.list_all.curselection()[0])
+
+        report_win = tk.Toplevel(self)
+        report_win.title("Analytics report")
+
+        scope_var = tk.StringVar(value="engine" if engine_name else "all")
+        method_var = tk.StringVar(value="pearson")
+
+        ttk.Label(report_win, text="Scope:").pack(anchor="w", padx=8, pady=(8, 2))
+        ttk.Radiobutton(report_win, text="All engines", value="all", variable=scope_var).pack(anchor="w", padx=16, pady=2)
+        engine_radio = ttk.Radiobutton(report_win, text=f"Selected: {engine_name or '(none)'}",
+                                       value="engine", variable=scope_var)
+        engine_radio.pack(anchor="w", padx=16, pady=2)
+        if engine_name is None:
+            engine_radio.state(["disabled"])
+
+        ttk.Label(report_win, text="Correlation:").pack(anchor="w", padx=8, pady=(8, 2))
+        for method in CORRELATION_METHODS:
+            ttk.Radiobutton(report_win, text=method.capitalize(), value=method,
+                            variable=method_var).pack(anchor="w", padx=16, pady=2)
+
+        def on_ok():
+            scope = engine_name if scope_var.get() == "engine" else None
+            report_win.destroy()
+            report = format_analytics_report(self.data.analytics, scope, method_var.get())
+            self.output_text.delete("1.0", tk.END)
+            self.output_text.insert(tk.END, report + "\n")
+
+        ttk.Button(report_win, text="OK", command=on_ok).pack(pady=8)
+
+    def ui_save_results(self):
+        """
+        Save the filtered games, the last comparison table, or every game
+        to CSV / JSON Lines / JSON / Parquet (picked by file extension).
+        """
+        if not self.engine_dict:
+            messagebox.showinfo("Save Results", "Load a folder first.")
+            return
+
+        has_filters = not self.game_query.is_empty()
+
+        save_win = tk.Toplevel(self)
+        save_win.title("Save results")
+
+        what_var = tk.StringVar(value="filtered" if has_filters else
+                                "stats" if self._last_stats else "all")
+        filtered_rb = ttk.Radiobutton(save_win, text="Games matching current filters",
+                                      value="filtered", variable=what_var)
+        filtered_rb.pack(anchor="w", padx=8, pady=2)
+        stats_rb = ttk.Radiobutton(save_win, text="Last comparison table",
+                                   value="stats", variable=what_var)
+        stats_rb.pack(anchor="w", padx=8, pady=2)
+        ttk.Radiobutton(save_win, text="All games", value="all",
+                        variable=what_var).pack(anchor="w", padx=8, pady=2)
+        if not has_filters:
+            filtered_rb.state(["disabled"])
+        if not self._last_stats:
+            stats_rb.state(["disabled"])
+
+        def on_ok():
+            what = what_var.get()
+            path = filedialog.asksaveasfilename(
+                parent=save_win,
+                title="Save results",
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv"),
+                           ("JSON Lines", "*.jsonl"),
+                           ("JSON", "*.json"),
+                           ("Parquet (needs pyarrow)", "*.parquet")],
+            )
+            if not path:
+                return
+            save_win.destroy()
+            try:
+                if what == "filtered":
+                    n = export_games(self._get_filtered_games(), path, revenue=self.data.revenue_of)
+                elif what == "stats":
+                    n = export_stats(self._last_stats, path)
+                else:
+                    n = export_games(self.data.all_games(), path, revenue=self.data.revenue_of)
+            except (ValueError, RuntimeError, OSError) as e:
+                messagebox.showerror("Error", f"Could not save results:\n{e}")
+                return
+            self.output_text.insert(tk.END, f"\nSaved {n} rows to {path}\n")
+            self.output_text.see(tk.END)
+
+        ttk.Button(save_win, text="Choose file...", command=on_ok).pack(pady=8)
+
     def ui_line_chart(self):
         """
         Plot a line chart for a single engine:
@@ -676,7 +797,67 @@ class EngineApp(tk.Tk):
             messagebox.showinfo("Line Chart", f"No games found for engine '{name}'.")
             return
 
-        plot_line_for_engine(name, games)
+        self._show_chart(("line", (name,), "peak_players"), "Line Chart",
+                         lambda: plot_line_for_engine(name, games))
+
+    # --- embedded charts ---
+
+    def _prewarm_plotting(self):
+        threading.Thread(target=_import_plotting, name="prewarm-plotting", daemon=True).start()
+
+    def _show_chart(self, key: tuple, title: str, build: Callable[[], "Figure | None"]):
+        """
+        Show a chart inside the app's chart window.
+
+        Figures are cached by key, so asking for the same engines + metric
+        again just re-attaches the already built figure. The chart window
+        itself is reused rather than opening a new one per click.
+        """
+        try:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        except ImportError:
+            messagebox.showerror("Charts", "Charts need matplotlib (pip install matplotlib).")
+            return
+
+        fig = self._figure_cache.get(key)
+        if fig is None:
+            fig = build()
+            if fig is None:
+                return
+            self._figure_cache[key] = fig
+            if len(self._figure_cache) > FIGURE_CACHE_SIZE:
+                self._figure_cache.popitem(last=False)
+        else:
+            self._figure_cache.move_to_end(key)
+
+        if self._chart_win is None or not self._chart_win.winfo_exists():
+            self._chart_win = tk.Toplevel(self)
+            self._chart_win.geometry("900x600")
+        else:
+            for child in self._chart_win.winfo_children():
+                child.destroy()
+        self._chart_win.title(title)
+
+        self._chart_canvas = FigureCanvasTkAgg(fig, master=self._chart_win)
+        toolbar = NavigationToolbar2Tk(self._chart_canvas, self._chart_win, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self._chart_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self._chart_canvas.draw_idle()
+        self._chart_win.lift()
+
+    # --- revenue model ---
+
+    def _on_revenue_model(self, _event=None):
+        self.revenue_model = self._revenue_labels[self.revenue_var.get()]
+        # computes this model's revenue column the first time only
+        self.data.set_revenue_model(self.revenue_model)
+        if self.engine_dict and self._last_stats:
+            self.data.revenue.apply(self._last_stats, self.revenue_model)
+        self.output_text.insert(
+            tk.END, f"\nRevenue model: {REVENUE_MODELS[self.revenue_model][0]}\n"
+        )
+        self.output_text.see(tk.END)
 
     # --- helper to pick a single engine ---
 
@@ -0,0 +1,221 @@
+# export_results.py
+#
+# Streaming export of parsed results to CSV, JSON Lines, JSON or Parquet.
+# Used by the text UI (run_ui) and the "Save results..." button in engine_ui.
+#
+# Records are written in chunks of EXPORT_CHUNK_SIZE rows, so memory use stays
+# flat no matter how many games are exported. Parquet needs pyarrow, which is
+# optional: it is only imported when a .parquet file is requested.
+
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from GroupProject_Main import Game, STAT_COLUMNS
+
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".json": "json",
+    ".parquet": "parquet",
+}
+
+# (field name, kind) for each exported table; kind is "str", "int" or "float".
+GAME_FIELDS: List[Tuple[str, str]] = [
+    ("engine", "str"),
+    ("id", "int"),
+    ("title", "str"),
+    ("cost", "float"),
+    ("rating", "float"),
+    ("release_date", "str"),
+    ("top_players", "float"),
+    ("follows", "int"),
+    ("online", "int"),
+    ("revenue_estimate", "float"),
+]
+
+STATS_FIELDS: List[Tuple[str, str]] = [("rank", "int")] + [
+    (c, "str" if c == "engine_name" else "int" if c == "num_games" else "float")
+    for c in STAT_COLUMNS
+]
+
+
+def format_from_path(path: str) -> str:
+    """Pick the export format from the file extension (.csv, .jsonl, .json, .parquet)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export type '{ext}'. Use .csv, .jsonl, .json or .parquet.")
+    return EXPORT_FORMATS[ext]
+
+
+def _missing_to_none(v):
+    # the parser uses -1 for "missing"
+    if v is None or v < 0:
+        return None
+    return v
+
+
+def game_record(engine_name: str, g: Game, revenue: float | None = None) -> Dict[str, Any]:
+    """
+    Flatten one (engine, Game) pair into an export row. revenue is the
+    game's estimate under the active revenue model (-1 = none); by default
+    price x peak players.
+    """
+    rd = getattr(g, "releaseDate", None)
+    cost = _missing_to_none(g.cost)
+    players = _missing_to_none(g.topPlayerCount)
+    return {
+        "engine": engine_name,
+        "id": g.id,
+        "title": g.title,
+        "cost": cost,
+        "rating": _missing_to_none(g.rating),
+        "release_date": rd.strftime("%Y-%m-%d") if isinstance(rd, datetime) else None,
+        "top_players": players,
+        "follows": _missing_to_none(getattr(g, "follows", -1)),
+        "online": _missing_to_none(getattr(g, "online", -1)),
+        "revenue_estimate": (_missing_to_none(revenue) if revenue is not None else
+                             # only meaningful when both price and players are known
+                             cost * players if cost is not None and players is not None else None),
+    }
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------- Writers ----------
+
+class _CsvWriter:
+    def __init__(self, path: str, fields: List[Tuple[str, str]]):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._f, fieldnames=[name for name, _ in fields],
+                                      extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write_chunk(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _JsonlWriter:
+    def __init__(self, path: str, fields: List[Tuple[str, str]]):
+        self._f = open(path, "w", encoding="utf-8")
+        self._names = [name for name, _ in fields]
+
+    def write_chunk(self, rows: List[Dict[str, Any]]) -> None:
+        self._f.write("".join(
+            json.dumps({k: row.get(k) for k in self._names}, ensure_ascii=False) + "\n"
+            for row in rows
+        ))
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _JsonWriter(_JsonlWriter):
+    """One JSON array, still written a chunk at a time."""
+
+    def __init__(self, path: str, fields: List[Tuple[str, str]]):
+        super().__init__(path, fields)
+        self._f.write("[")
+        self._first = True
+
+    def write_chunk(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._f.write("\n" if self._first else ",\n")
+            self._f.write(json.dumps({k: row.get(k) for k in self._names}, ensure_ascii=False))
+            self._first = False
+
+    def close(self) -> None:
+        self._f.write("\n]\n")
+        self._f.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str, fields: List[Tuple[str, str]]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).") from None
+
+        types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in fields])
+        # one row group per chunk
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_chunk(self, rows: List[Dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pylist(rows, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS = {
+    "csv": _CsvWriter,
+    "jsonl": _JsonlWriter,
+    "json": _JsonWriter,
+    "parquet": _ParquetWriter,
+}
+
+
+def _write(rows: Iterable[Dict[str, Any]], path: str, fmt: str | None,
+           fields: List[Tuple[str, str]], chunk_size: int) -> int:
+    fmt = fmt or format_from_path(path)
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    writer = _WRITERS[fmt](path, fields)
+    count = 0
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            writer.write_chunk(chunk)
+            count += len(chunk)
+    finally:
+        writer.close()
+    return count
+
+
+# ---------- Public API ----------
+
+def export_games(results: Iterable[Tuple[str, Game]], path: str, fmt: str | None = None,
+                 chunk_size: int = EXPORT_CHUNK_SIZE,
+                 revenue: Callable[[Game], float] | None = None) -> int:
+    """
+    Write (engine_name, Game) pairs, e.g. a filter result or EngineDataset.all_games(),
+    to path. fmt is "csv", "jsonl", "json" or "parquet" (default: from the extension).
+    revenue gives each game's estimate under the active model, e.g.
+    EngineDataset.revenue_of (default: price x peak players).
+    Returns the number of rows written.
+    """
+    if revenue is None:
+        rows = (game_record(engine_name, g) for engine_name, g in results)
+    else:
+        rows = (game_record(engine_name, g, revenue(g)) for engine_name, g in results)
+    return _write(rows, path, fmt, GAME_FIELDS, chunk_size)
+
+
+def export_stats(stats_list: Iterable[Dict[str, Any]], path: str, fmt: str | None = None,
+                 chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """
+    Write a stats table (compute_stats_matrix / rank_stats output) to path.
+    The "rank" column is filled only when the rows have been ranked.
+    """
+    return _write(stats_list, path, fmt, STATS_FIELDS, chunk_size)
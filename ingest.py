@@ -0,0 +1,114 @@
+# ingest.py
+#
+# Concurrent folder ingestion with asyncio.
+#
+# fileRead() opens and reads the engine pages one after another, which is
+# latency bound on network-mounted storage. ingest_folder() walks the folder
+# once, reads up to MAX_OPEN_FILES files at a time, and hands each finished
+# buffer to a pool of parse workers through a bounded queue, so reading and
+# parsing overlap. At most MAX_OPEN_FILES + MAX_QUEUED_FILES file texts are held
+# in memory at once (read-ahead is bounded).
+#
+# The result is the same engineList htmlToList() builds, in the same file order.
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
+
+from GroupProject_Main import ParseReport, find_engine_files, htmlToList
+
+
+MAX_OPEN_FILES = 16     # concurrent reads
+MAX_QUEUED_FILES = 8    # read buffers waiting for a parse worker
+
+
+def read_text(path: str) -> str:
+    """Text of one engine page (undecodable bytes dropped, as fileRead does)."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def parse_page(text: str) -> Tuple[list, ParseReport]:
+    """Parse one engine page's text into (engine entry, ParseReport); runs in a worker."""
+    reports: List[ParseReport] = []
+    engine = htmlToList([text], reports)[0]
+    return engine, reports[0]
+
+
+def _make_executor(kind: str, workers: int | None) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+async def ingest_folder_async(folder: str, reports: List[ParseReport] | None = None,
+                              max_open: int = MAX_OPEN_FILES,
+                              max_queued: int = MAX_QUEUED_FILES,
+                              workers: int | None = None,
+                              executor: str = "process",
+                              parse: Callable[[str], Tuple[Any, ParseReport]] = parse_page) -> list:
+    """
+    Read and parse every engine page under folder concurrently.
+
+    reports: optional list, filled with one ParseReport per file (file order).
+    executor: "process" (parse in worker processes, the default) or "thread".
+    parse: per-page worker, text -> (result, ParseReport); must be a
+           module-level function for the process executor. The default
+           returns the page's [engine_name, Game, ...] entry.
+    Returns the per-page results in file order; with the default parse,
+    that is the engineList: [[engine_name, Game, ...], ...].
+    """
+    paths = find_engine_files(folder)
+    if not paths:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    open_slots = asyncio.Semaphore(max_open)
+    # read-ahead: a file may only be read once there is room for its buffer
+    ahead = asyncio.Semaphore(max_open + max_queued)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+    results: List[Tuple[list, ParseReport] | None] = [None] * len(paths)
+
+    async def reader(index: int, path: str):
+        async with open_slots:
+            text = await asyncio.to_thread(read_text, path)
+        await queue.put((index, text))
+
+    async def producer():
+        tasks = []
+        for index, path in enumerate(paths):
+            await ahead.acquire()
+            tasks.append(asyncio.create_task(reader(index, path)))
+        await asyncio.gather(*tasks)
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def consumer(pool: Executor):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, text = item
+            try:
+                results[index] = await loop.run_in_executor(pool, parse, text)
+            finally:
+                ahead.release()
+
+    with _make_executor(executor, workers) as pool:
+        await asyncio.gather(producer(), *(consumer(pool) for _ in range(workers)))
+
+    engineList = []
+    for item, report in results:
+        engineList.append(item)
+        if reports is not None:
+            reports.append(report)
+    return engineList
+
+
+def ingest_folder(folder: str, reports: List[ParseReport] | None = None, **kwargs) -> list:
+    """Blocking wrapper around ingest_folder_async (same arguments)."""
+    return asyncio.run(ingest_folder_async(folder, reports, **kwargs))
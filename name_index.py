@@ -0,0 +1,191 @@
+# name_index.py
+#
+# Engine-name lookup index used by EngineDataset (and through it run_ui and
+# engine_server) and the type-ahead box in engine_ui.
+#
+# Names are normalized once (lower case, punctuation dropped, optional
+# trailing "Engine" ignored), so "lime openfl", "Lime OR OpenFL Engine" and
+# "LIME-OR-OPENFL" all find the same engine with a dict lookup. search()
+# ranks candidates: exact, then prefix, then substring, then typo-tolerant
+# matches found through a trigram index and scored by edit distance (only
+# when nothing matched exactly or by prefix, and ignoring the "engine" suffix
+# that almost every name ends in).
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Minimum similarity (1 - edit distance / length) for a typo match.
+FUZZY_MIN_SIMILARITY = 0.55
+
+# Only this many trigram candidates are scored with the (slower) edit distance.
+FUZZY_MAX_CANDIDATES = 25
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Joining words that may be left out of a name: "lime openfl" = "Lime OR OpenFL".
+_CONNECTIVES = frozenset({"and", "or"})
+
+
+def normalize_tokens(name: str) -> List[str]:
+    """ "Lime OR OpenFL Engine" -> ["lime", "or", "openfl", "engine"] """
+    return _NON_ALNUM_RE.sub(" ", name.lower().replace("&", " and ")).split()
+
+
+def _without_connectives(tokens: List[str]) -> List[str]:
+    return [t for t in tokens if t not in _CONNECTIVES] or tokens
+
+
+def _core(compact: str) -> str:
+    """Compact key without a trailing "engine", which nearly every name shares."""
+    return compact[:-6] if compact.endswith("engine") and len(compact) > 6 else compact
+
+
+def _trigrams(compact: str) -> Set[str]:
+    padded = f"^{compact}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance (two-row dynamic programming)."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            current.append(min(previous[j] + 1,            # deletion
+                               current[j - 1] + 1,         # insertion
+                               previous[j - 1] + (ca != cb)))  # substitution
+        previous = current
+    return previous[-1]
+
+
+class EngineNameIndex:
+    """Prebuilt lookup structures over a fixed list of engine names."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = list(names)
+        self._exact: Dict[str, int] = {}
+        self._compact: List[Tuple[str, ...]] = []      # per name: its compact keys
+        self._prefix_keys: List[Tuple[str, int]] = []  # sorted (key, name index)
+        self._grams: Dict[str, Set[int]] = {}
+
+        for i, name in enumerate(self.names):
+            tokens = normalize_tokens(name)
+            forms = [tokens]
+            if len(tokens) > 1 and tokens[-1] == "engine":
+                forms.append(tokens[:-1])
+            forms += [f for f in map(_without_connectives, forms) if f not in forms]
+            keys = []
+            for form in forms:
+                for key in (" ".join(form), "".join(form)):
+                    self._exact.setdefault(key, i)
+                keys.append("".join(form))
+            # "apexengine" style names: also index without the glued suffix
+            if len(tokens) == 1 and tokens[0].endswith("engine") and len(tokens[0]) > 6:
+                self._exact.setdefault(tokens[0][:-6], i)
+                keys.append(tokens[0][:-6])
+            self._compact.append(tuple(keys))
+
+            for key in set(keys) | set(tokens):
+                self._prefix_keys.append((key, i))
+            for gram in _trigrams(keys[0]):
+                self._grams.setdefault(gram, set()).add(i)
+
+        self._prefix_keys.sort()
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, query: str) -> str | None:
+        """Exact (normalized) match: O(1) dict lookup. None if there is no such engine."""
+        i = self._exact_index(normalize_tokens(query))
+        return self.names[i] if i is not None else None
+
+    def _exact_index(self, tokens: List[str]) -> int | None:
+        for form in (tokens, _without_connectives(tokens)):
+            for key in (" ".join(form), "".join(form)):
+                i = self._exact.get(key)
+                if i is not None:
+                    return i
+        return None
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        found = set()
+        pos = bisect_left(self._prefix_keys, (prefix, -1))
+        while pos < len(self._prefix_keys) and self._prefix_keys[pos][0].startswith(prefix):
+            found.add(self._prefix_keys[pos][1])
+            pos += 1
+        return found
+
+    def search(self, query: str, limit: int | None = 10) -> List[str]:
+        """
+        Engine names matching query, best first:
+        exact, prefix (of the name or any word), substring, then typo matches
+        (only if there is no exact or prefix match). limit=None returns every match.
+        """
+        tokens = normalize_tokens(query)
+        if not tokens:
+            return []
+        compact = "".join(tokens)
+
+        ranked: Dict[int, Tuple[int, float]] = {}   # name index -> (tier, -score)
+
+        def offer(i, tier, score=0.0):
+            best = ranked.get(i)
+            if best is None or (tier, -score) < best:
+                ranked[i] = (tier, -score)
+
+        exact = self._exact_index(tokens)
+        if exact is not None:
+            offer(exact, 0)
+
+        for i in self._prefix_matches(compact):
+            offer(i, 1)
+        if len(tokens) > 1:
+            # every query word must start some word of the name
+            hits = [self._prefix_matches(t) for t in tokens]
+            for i in set.intersection(*hits):
+                offer(i, 1)
+
+        # substring / typo candidates from the trigram index
+        query_grams = _trigrams(compact)
+        counts: Dict[int, int] = {}
+        for gram in query_grams:
+            for i in self._grams.get(gram, ()):
+                counts[i] = counts.get(i, 0) + 1
+
+        inner = {g for g in query_grams if "^" not in g and "$" not in g}
+        for i, shared in counts.items():
+            if i in ranked:
+                continue
+            if len(compact) < 3 or shared >= len(inner):
+                if any(compact in key for key in self._compact[i]):
+                    offer(i, 2)
+        if len(compact) < 3:
+            for i, keys in enumerate(self._compact):
+                if i not in ranked and any(compact in key for key in keys):
+                    offer(i, 2)
+
+        # typo matches only when nothing matched exactly or by prefix; scored
+        # without the shared "engine" suffix, so it cannot carry a match alone
+        if any(tier <= 1 for tier, _ in ranked.values()):
+            candidates = []
+        else:
+            candidates = sorted(
+                (i for i in counts if i not in ranked),
+                key=lambda i: counts[i], reverse=True,
+            )[:FUZZY_MAX_CANDIDATES]
+        core = _core(compact)
+        for i in candidates:
+            best = 0.0
+            for key in map(_core, self._compact[i]):
+                dist = _edit_distance(core, key)
+                best = max(best, 1.0 - dist / max(len(core), len(key)))
+            if best >= FUZZY_MIN_SIMILARITY:
+                offer(i, 3, best)
+
+        order = sorted(ranked, key=lambda i: (ranked[i], self.names[i].lower()))
+        return [self.names[i] for i in order[:limit]]
@@ -0,0 +1,395 @@
+# parser_diff.py
+#
+# Differential test harness for parser implementations.
+#
+# reference_parse() is a frozen, deliberately plain copy of what htmlToList +
+# Game produce as of this revision: int app ids, entity-decoded and trimmed
+# titles, header-driven column mapping (fixed offsets from the end of the row
+# for tables without a header), the same price / missing-value normalization
+# and the same skip rules. It returns plain records, so later edits to
+# htmlToList or Game can't silently move the oracle.
+#
+# Every parser in PARSERS (engineFileList -> [[engine_name, Game, ...], ...])
+# is run against the reference on three input sets:
+#   bundled   every SteamDB page in the folder
+#   mutated   bundled pages with seeded random damage: missing </tr>,
+#             dropped / blank / junk data-sort values, HTML entities in
+#             titles, broken app links, duplicated rows, extra columns,
+#             no <thead>, truncation
+#   scaled    bundled pages with their table rows repeated --scale times
+# and compared field by field (RECORD_FIELDS). Mismatches are reported with
+# the seed, page and row that produced them, next to the timings.
+#
+# To try a faster parser, add it to PARSERS and run:
+#     python parser_diff.py [folder] [--mutations 300] [--seed 0] [--scale 4]
+# The exit status is 1 if any parser disagrees with the reference.
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from html import unescape
+from typing import Callable, Dict, List, Tuple
+
+from GroupProject_Main import fileRead, htmlToList
+
+
+# parser name -> engineFileList -> engineList
+PARSERS: Dict[str, Callable[[List[str]], list]] = {
+    "htmlToList": htmlToList,
+}
+
+RECORD_FIELDS = ("id", "title", "cost", "rating", "releaseDate", "topPlayerCount",
+                 "follows", "online", "revenueEstimate")
+
+MAX_EXAMPLES = 5
+
+
+# ---------- Frozen reference ----------
+
+_REF_DATA_SORT = re.compile(r'data-sort="([^"]*)"')
+_REF_TH_NAME = re.compile(r'<th\b[^>]*?\sdata-name="([^"]*)"')
+_REF_FIELDS = ("price", "rating", "release", "followers", "online", "peak")
+
+
+def _ref_missing(raw):
+    return raw is None or raw == "" or raw == "-"
+
+
+def _ref_float(raw):
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _ref_int(raw):
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _ref_record(app_id, title, price, rating, release, follows, online, peak):
+    """One row as a {field: value} dict, with htmlToList + Game conversions."""
+    if _ref_missing(price):
+        cost = -1
+    else:
+        try:
+            cost = float(f"{float(price) / 100.0:.2f}")
+        except ValueError:
+            cost = -1
+    rating = _ref_float("-1" if _ref_missing(rating) else rating)
+    try:
+        release_date = datetime.fromtimestamp(int("-1" if _ref_missing(release) else release))
+    except (TypeError, ValueError, OverflowError, OSError):
+        release_date = "Unreleased"
+    peak = _ref_float("-1" if _ref_missing(peak) else peak)
+    return {
+        "id": app_id,
+        "title": title,
+        "cost": cost,
+        "rating": rating,
+        "releaseDate": release_date,
+        "topPlayerCount": peak,
+        "follows": _ref_int("-1" if _ref_missing(follows) else follows),
+        "online": _ref_int("-1" if _ref_missing(online) else online),
+        "revenueEstimate": cost * peak if cost >= 0 and peak >= 0 else -1,
+    }
+
+
+def _ref_columns(html, thead_start):
+    """(columns after "name", or None for the offset fallback; end of header)."""
+    thead_end = html.find("</thead>", thead_start)
+    if thead_end == -1:
+        return None, thead_start
+    names = _REF_TH_NAME.findall(html, thead_start, thead_end)
+    if not names:
+        return None, thead_end
+    if "name" in names:
+        names = names[names.index("name") + 1:]
+    return names, thead_end
+
+
+def _ref_fields(columns, vals):
+    """Raw values for _REF_FIELDS, or None if the row doesn't fit the table."""
+    if columns is None:
+        if len(vals) < 6:
+            return None
+        return tuple(vals[-6:])
+    if len(vals) != len(columns):
+        return None
+    last = {col: i for i, col in enumerate(columns)}   # a repeated column: last one wins
+    return tuple(vals[last[f]] if f in last else "" for f in _REF_FIELDS)
+
+
+def reference_parse(engineFileList: List[str]) -> List[Tuple[str, List[dict]]]:
+    """[(engine_name, [record, ...]), ...] for each page, in input order."""
+    link = '<a class="b" href="'
+    out = []
+    for html in engineFileList:
+        title_start = html.find("<title>") + len("<title>")
+        title_end = html.find(" · SteamDB")
+        engine_name = html[title_start:title_end]
+        records = []
+
+        pos = title_end
+        columns = None
+        next_header = html.find("<thead", pos)
+        while True:
+            name_start = html.find(link, pos)
+            if name_start == -1:
+                break
+            while next_header != -1 and next_header < name_start:
+                columns, header_end = _ref_columns(html, next_header)
+                next_header = html.find("<thead", header_end)
+
+            name_end = html.find("</a>", name_start)
+            if name_end == -1:
+                break
+            chunk = html[name_start + len(link):name_end]
+            gt = chunk.find(">")
+            href, raw_title = (chunk, "") if gt == -1 else (chunk[:gt], chunk[gt + 1:])
+            parts = href.split("/")   # '/app/123/"' -> ['', 'app', '123', '"']
+            app_id = _ref_int(parts[2]) if len(parts) >= 4 and parts[:2] == ["", "app"] else -1
+            title = unescape(raw_title).strip()
+
+            row_end = html.find("</tr>", name_end)
+            if row_end == -1:
+                break
+            fields = _ref_fields(columns, _REF_DATA_SORT.findall(html, name_end, row_end))
+            if fields is not None:
+                records.append(_ref_record(app_id, title, *fields))
+            pos = row_end
+        out.append((engine_name, records))
+    return out
+
+
+# ---------- Inputs ----------
+
+def _occurrences(text, needle):
+    return [m.start() for m in re.finditer(re.escape(needle), text)]
+
+
+def _pick(text, needle, rng):
+    spots = _occurrences(text, needle)
+    return rng.choice(spots) if spots else None
+
+
+def _drop_tr_close(text, rng):
+    at = _pick(text, "</tr>", rng)
+    return text if at is None else text[:at] + text[at + 5:]
+
+
+def _drop_data_sort(text, rng):
+    spots = list(_REF_DATA_SORT.finditer(text))
+    if not spots:
+        return text
+    m = rng.choice(spots)
+    return text[:m.start()] + text[m.end():]
+
+
+def _replace_value(text, rng, values):
+    spots = list(_REF_DATA_SORT.finditer(text))
+    if not spots:
+        return text
+    m = rng.choice(spots)
+    return text[:m.start(1)] + rng.choice(values) + text[m.end(1):]
+
+
+def _blank_value(text, rng):
+    return _replace_value(text, rng, ["", "-"])
+
+
+def _junk_value(text, rng):
+    return _replace_value(text, rng, ["abc", "nan", "1e999", "-5", "3.5",
+                                      "99999999999999999999", " 12 ", "0x10"])
+
+
+def _entity_title(text, rng):
+    at = _pick(text, '<a class="b" href="', rng)
+    if at is None:
+        return text
+    gt = text.find(">", at + 19)
+    if gt == -1:
+        return text
+    entity = rng.choice(["&amp;", "&quot;", "&apos;", "&#39;", "&lt;b&gt;", " & "])
+    return text[:gt + 1] + entity + text[gt + 1:]
+
+
+def _junk_href(text, rng):
+    at = _pick(text, '<a class="b" href="/app/', rng)
+    if at is None:
+        return text
+    start = at + len('<a class="b" href="/app/')
+    end = text.find("/", start)
+    if end == -1:
+        return text
+    return text[:start] + rng.choice(["", "abc", " 12", "12x", "-3"]) + text[end:]
+
+
+def _duplicate_row(text, rng):
+    at = _pick(text, "<tr", rng)
+    if at is None:
+        return text
+    end = text.find("</tr>", at)
+    if end == -1:
+        return text
+    end += 5
+    return text[:end] + text[at:end] + text[end:]
+
+
+def _extra_column(text, rng):
+    at = _pick(text, "</tr>", rng)
+    return text if at is None else text[:at] + '<td data-sort="7">7</td>' + text[at:]
+
+
+def _drop_thead(text, rng):
+    start = text.find("<thead")
+    end = text.find("</thead>", start)
+    if start == -1 or end == -1:
+        return text
+    return text[:start] + text[end + len("</thead>"):]
+
+
+def _truncate(text, rng):
+    return text[:rng.randrange(len(text) + 1)]
+
+
+MUTATIONS: Dict[str, Callable[[str, random.Random], str]] = {
+    "drop_tr_close": _drop_tr_close,
+    "drop_data_sort": _drop_data_sort,
+    "blank_value": _blank_value,
+    "junk_value": _junk_value,
+    "entity_title": _entity_title,
+    "junk_href": _junk_href,
+    "duplicate_row": _duplicate_row,
+    "extra_column": _extra_column,
+    "drop_thead": _drop_thead,
+    "truncate": _truncate,
+}
+
+
+def mutated_pages(pages: List[str], count: int, seed: int) -> Tuple[List[str], List[str]]:
+    """count damaged copies of random pages; returns (pages, labels)."""
+    rng = random.Random(seed)
+    out, labels = [], []
+    for i in range(count):
+        text = rng.choice(pages)
+        applied = rng.sample(sorted(MUTATIONS), rng.randint(1, 3))
+        for name in applied:
+            text = MUTATIONS[name](text, rng)
+        out.append(text)
+        labels.append(f"mutation #{i} (seed {seed}): {'+'.join(applied)}")
+    return out, labels
+
+
+def scaled_pages(pages: List[str], scale: int) -> List[str]:
+    """Each page with the rows of its first <tbody> repeated scale times."""
+    out = []
+    for text in pages:
+        start = text.find("<tbody")
+        body = text.find(">", start) + 1 if start != -1 else 0
+        end = text.find("</tbody>", body)
+        if start == -1 or end == -1:
+            out.append(text)
+            continue
+        out.append(text[:body] + text[body:end] * scale + text[end:])
+    return out
+
+
+# ---------- Comparison ----------
+
+def _same(a, b):
+    if a == b:
+        return type(a) is type(b) or (isinstance(a, (int, float)) and isinstance(b, (int, float)))
+    return isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b)
+
+
+def compare(reference, candidate, labels: List[str]) -> Dict:
+    """
+    Field-by-field diff of a candidate engineList against reference_parse
+    output. Returns {"pages", "rows", "mismatches": {field: n}, "examples": [...]}.
+    """
+    result = {"pages": 0, "rows": 0, "mismatches": {}, "examples": []}
+
+    def note(field, where):
+        result["mismatches"][field] = result["mismatches"].get(field, 0) + 1
+        if len(result["examples"]) < MAX_EXAMPLES:
+            result["examples"].append(where)
+
+    if len(candidate) != len(reference):
+        note("pages", f"{len(candidate)} pages, reference has {len(reference)}")
+    for label, (engine_name, records), entry in zip(labels, reference, candidate):
+        result["pages"] += 1
+        if not entry or entry[0] != engine_name:
+            note("engine_name", f"{label}: engine {entry[0] if entry else None!r} != {engine_name!r}")
+            continue
+        games = entry[1:]
+        result["rows"] += len(records)
+        if len(games) != len(records):
+            note("rows", f"{label}: {len(games)} rows, reference has {len(records)}")
+        for row, (record, g) in enumerate(zip(records, games)):
+            for field in RECORD_FIELDS:
+                got = getattr(g, field, "<missing>")
+                if not _same(got, record[field]):
+                    note(field, f"{label} row {row}: {field} {got!r} != {record[field]!r}")
+    return result
+
+
+def _timed(fn, pages):
+    start = time.perf_counter()
+    result = fn(pages)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential test harness for parsers")
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--mutations", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scale", type=int, default=4)
+    parser.add_argument("--parser", action="append", choices=sorted(PARSERS),
+                        help="only run these parsers (default: all)")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pages = fileRead(args.folder)
+    if not pages:
+        raise SystemExit(f"No engine pages found in {args.folder}")
+
+    mutated, mutated_labels = mutated_pages(pages, args.mutations, args.seed)
+    input_sets = [
+        ("bundled", pages, [f"page #{i}" for i in range(len(pages))]),
+        ("mutated", mutated, mutated_labels),
+        (f"scaled x{args.scale}", scaled_pages(pages, args.scale),
+         [f"scaled page #{i}" for i in range(len(pages))]),
+    ]
+
+    failed = False
+    print(f"{'Input':12s} {'Parser':14s} {'Pages':>6s} {'Rows':>9s} {'Ref (s)':>8s} "
+          f"{'Parser (s)':>10s} {'Speedup':>8s}  Result")
+    print("-" * 86)
+    for set_name, set_pages, labels in input_sets:
+        ref_s, reference = _timed(reference_parse, set_pages)
+        for name in args.parser or sorted(PARSERS):
+            cand_s, candidate = _timed(PARSERS[name], set_pages)
+            diff = compare(reference, candidate, labels)
+            total = sum(diff["mismatches"].values())
+            failed = failed or total > 0
+            status = "ok" if total == 0 else f"{total} mismatches " + str(diff["mismatches"])
+            print(f"{set_name:12s} {name:14s} {diff['pages']:>6d} {diff['rows']:>9,d} "
+                  f"{ref_s:>8.3f} {cand_s:>10.3f} {ref_s / cand_s:>7.2f}x  {status}")
+            for example in diff["examples"]:
+                print(f"    {example}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+# perf_budget.py
+#
+# Latency and memory budgets for the Tk app's interactive paths.
+#
+# Drives an EngineApp (engine_ui.py) headlessly: the folder, filter and
+# confirmation dialogs are replaced by scripted answers, and each action is
+# timed from the call until Tk has processed the resulting events and drawn
+# (app.update()), i.e. click to result. Measured per corpus scale:
+#
+#     load_folder                  latency, then process RSS
+#     ui_show_stats                largest engine
+#     ui_compare_selected          all engines, "OK" pressed
+#     ui_rating_filter / ui_price_filter / ui_release_filter / ui_query
+#     ui_line_chart                largest engine, figure cache cleared first
+#
+# Scale 1 is the given folder; larger scales are synthetic copies with every
+# page's rows repeated (parser_diff.scaled_pages), written to a temp folder.
+# Each scale runs in its own process so RSS figures don't carry over. The
+# default is 1x and 10x; 100x (~3 GB of temp HTML, several GB of RSS) only
+# runs when asked for with --scales 1,10,100.
+#
+# The median latency of --repeat runs is checked against LATENCY_BUDGETS_MS
+# and the RSS after loading against RSS_BUDGETS_MB (or a --budgets JSON file
+# in the same shape, see --write-budgets). Exits 1 if any budget is exceeded.
+# If Tk can't run (no display), nothing is measured and the run fails with
+# exit 2, unless --allow-skip is given (then it exits 0 with "Skipped").
+#
+# Usage:
+#     python perf_budget.py [folder] [--scales 1,10] [--repeat 5] [--allow-skip]
+#                           [--budgets budgets.json] [--write-budgets budgets.json]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from GroupProject_Main import find_engine_files
+from ingest import read_text
+from parser_diff import scaled_pages
+
+
+# default scales; 100x is opt-in (--scales 1,10,100)
+SCALES = (1, 10)
+
+# exit status when Tk is unavailable and --allow-skip was not given
+EXIT_NOT_MEASURED = 2
+
+# budget per action and scale: median click-to-result time in milliseconds
+LATENCY_BUDGETS_MS: Dict[str, Dict[int, float]] = {
+    "load_folder":         {1: 3000, 10: 30000, 100: 300000},
+    "ui_show_stats":       {1: 50, 10: 50, 100: 50},
+    "ui_compare_selected": {1: 250, 10: 250, 100: 250},
+    "ui_rating_filter":    {1: 250, 10: 2500, 100: 25000},
+    "ui_price_filter":     {1: 500, 10: 5000, 100: 50000},
+    "ui_release_filter":   {1: 500, 10: 5000, 100: 50000},
+    "ui_query":            {1: 250, 10: 2500, 100: 25000},
+    "ui_line_chart":       {1: 1500, 10: 2000, 100: 4000},
+}
+
+# process RSS after load_folder, in MB
+RSS_BUDGETS_MB: Dict[int, float] = {1: 300, 10: 1200, 100: 9000}
+
+# scripted answers for the filter dialogs (simpledialog.askstring, in order)
+FILTER_ANSWERS = {
+    "ui_rating_filter": ["90", "100"],
+    "ui_price_filter": ["0", "5"],
+    "ui_release_filter": ["2020", "2021"],
+    "ui_query": ["rating>=80 price<=10 year=2018..2022"],
+}
+
+# --write-budgets: measured value x this
+BUDGET_HEADROOM = 1.5
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process (MB); peak RSS where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def has_display() -> bool:
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+def make_corpus(folder: str, scale: int, out_dir: str) -> int:
+    """Write folder's pages with their rows repeated scale times into out_dir."""
+    paths = find_engine_files(folder)
+    for path in paths:
+        page = scaled_pages([read_text(path)], scale)[0]
+        with open(os.path.join(out_dir, os.path.basename(path)), "w", encoding="utf-8") as f:
+            f.write(page)
+    return len(paths)
+
+
+# ---------- Driving the app (child process) ----------
+
+def _timed(app, action: Callable[[], Any]) -> float:
+    """Seconds from calling action until Tk has handled everything it queued."""
+    app.update()
+    start = time.perf_counter()
+    action()
+    app.update()
+    return time.perf_counter() - start
+
+
+def _select(listbox, name: str) -> None:
+    import tkinter as tk
+    listbox.selection_clear(0, tk.END)
+    listbox.selection_set(list(listbox.get(0, tk.END)).index(name))
+
+
+def _press(app, text: str) -> None:
+    """Invoke the button labelled text in the newest dialog window that has one."""
+    import tkinter as tk
+    from tkinter import ttk
+
+    dialogs = [w for w in app.winfo_children() if isinstance(w, tk.Toplevel)]
+    for dialog in reversed(dialogs):
+        stack = [dialog]
+        while stack:
+            widget = stack.pop()
+            if isinstance(widget, (tk.Button, ttk.Button)) and widget.cget("text") == text:
+                widget.invoke()
+                return
+            stack.extend(widget.winfo_children())
+    raise RuntimeError(f"No '{text}' button in an open dialog")
+
+
+def drive_app(folder: str, repeat: int) -> Dict[str, Any]:
+    """Run every measured action on a fresh EngineApp; {"latency": {action: [s]}, "rss_mb": x}."""
+    import engine_ui
+
+    answers: List[str] = []
+    errors: List[str] = []
+    patches = [
+        mock.patch.object(engine_ui.filedialog, "askdirectory", lambda **kw: folder),
+        mock.patch.object(engine_ui.simpledialog, "askstring", lambda *a, **kw: answers.pop(0)),
+        mock.patch.object(engine_ui.messagebox, "askyesno", lambda *a, **kw: True),
+        mock.patch.object(engine_ui.messagebox, "showinfo", lambda *a, **kw: None),
+        mock.patch.object(engine_ui.messagebox, "showwarning",
+                          lambda title, msg, **kw: errors.append(f"{title}: {msg}")),
+        mock.patch.object(engine_ui.messagebox, "showerror",
+                          lambda title, msg, **kw: errors.append(f"{title}: {msg}")),
+    ]
+    latency: Dict[str, List[float]] = {}
+
+    def measure(name: str, action: Callable[[], Any], before: Callable[[], Any] | None = None):
+        for _ in range(repeat):
+            if before is not None:
+                before()
+            latency.setdefault(name, []).append(_timed(app, action))
+            if errors:
+                raise RuntimeError(f"{name}: {errors[0]}")
+
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        # load_folder's fileRead prints every file name
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+        app = engine_ui.EngineApp()
+        stack.callback(app.destroy)
+        app.withdraw()
+
+        latency["load_folder"] = [_timed(app, app.load_folder)]
+        rss = _rss_mb()
+        if errors:
+            raise RuntimeError(f"load_folder: {errors[0]}")
+        biggest = max(app.engine_names, key=lambda n: len(app.engine_dict[n]))
+
+        measure("ui_show_stats", app.ui_show_stats,
+                before=lambda: (app.clear_selected(), _select(app.list_all, biggest)))
+
+        def compare_all():
+            app.ui_compare_selected()
+            _press(app, "OK")
+        measure("ui_compare_selected", compare_all, before=app.clear_selected)
+
+        for name, replies in FILTER_ANSWERS.items():
+            def before(replies=replies):
+                app.ui_clear_filters()
+                answers[:] = list(replies)
+            measure(name, getattr(app, name), before=before)
+        app.ui_clear_filters()
+
+        def cold_chart():
+            app.clear_selected()
+            _select(app.list_all, biggest)
+            app._figure_cache.clear()
+        measure("ui_line_chart", app.ui_line_chart, before=cold_chart)
+        games = app.data.num_games
+
+    return {"latency": latency, "rss_mb": rss, "games": games}
+
+
+def _child(folder: str, repeat: int) -> None:
+    import tkinter as tk
+    try:
+        result = drive_app(folder, repeat)
+    except tk.TclError as e:
+        result = {"skipped": f"Tk unavailable: {e}"}
+    print(json.dumps(result))
+
+
+# ---------- Budgets ----------
+
+def load_budgets(path: str | None):
+    """(latency budgets, rss budgets) from the defaults, overridden by a JSON file."""
+    latency = {name: dict(per_scale) for name, per_scale in LATENCY_BUDGETS_MS.items()}
+    rss = dict(RSS_BUDGETS_MB)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            custom = json.load(f)
+        for name, per_scale in custom.get("latency_ms", {}).items():
+            latency.setdefault(name, {}).update({int(s): v for s, v in per_scale.items()})
+        rss.update({int(s): v for s, v in custom.get("rss_mb", {}).items()})
+    return latency, rss
+
+
+def write_budgets(path: str, results: Dict[int, Dict[str, Any]]) -> None:
+    """Budgets = measured medians / RSS x BUDGET_HEADROOM, for calibrating on a reference machine."""
+    latency: Dict[str, Dict[str, float]] = {}
+    rss: Dict[str, float] = {}
+    for scale, result in results.items():
+        for name, times in result["latency"].items():
+            latency.setdefault(name, {})[str(scale)] = round(
+                statistics.median(times) * 1000 * BUDGET_HEADROOM, 1)
+        rss[str(scale)] = round(result["rss_mb"] * BUDGET_HEADROOM)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"latency_ms": latency, "rss_mb": rss}, f, indent=2)
+
+
+def check(results: Dict[int, Dict[str, Any]], latency_budgets, rss_budgets) -> List[str]:
+    """Print the results table; returns one message per exceeded budget."""
+    failures = []
+    print(f"{'Scale':>6s} {'Action':22s} {'p50 ms':>10s} {'max ms':>10s} {'Budget':>10s}  Status")
+    for scale, result in results.items():
+        for name, times in result["latency"].items():
+            p50 = statistics.median(times) * 1000
+            budget = latency_budgets.get(name, {}).get(scale)
+            ok = budget is None or p50 <= budget
+            if not ok:
+                failures.append(f"{scale}x {name}: {p50:.1f} ms > {budget:g} ms")
+            print(f"{scale:>5d}x {name:22s} {p50:>10.1f} {max(times) * 1000:>10.1f} "
+                  f"{'-' if budget is None else f'{budget:g}':>10s}  {'ok' if ok else 'OVER'}")
+        budget = rss_budgets.get(scale)
+        ok = budget is None or result["rss_mb"] <= budget
+        if not ok:
+            failures.append(f"{scale}x RSS after load: {result['rss_mb']:.0f} MB > {budget:g} MB")
+        print(f"{scale:>5d}x {'RSS after load (MB)':22s} {result['rss_mb']:>10.0f} {'':>10s} "
+              f"{'-' if budget is None else f'{budget:g}':>10s}  {'ok' if ok else 'OVER'}"
+              f"   ({result['games']:,} games)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency / memory budgets for the Tk app")
+    parser.add_argument("folder", nargs="?", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budgets", help="JSON file overriding the default budgets")
+    parser.add_argument("--write-budgets", metavar="PATH",
+                        help=f"write measured values x {BUDGET_HEADROOM} as a budgets file")
+    parser.add_argument("--allow-skip", action="store_true",
+                        help="exit 0 instead of failing when Tk can't run (no display)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.folder, args.repeat)
+        return
+
+    def not_measured(reason: str):
+        if args.allow_skip:
+            print(f"Skipped: {reason}")
+            return
+        print(f"Not measured: {reason} (pass --allow-skip to accept this)", file=sys.stderr)
+        sys.exit(EXIT_NOT_MEASURED)
+
+    if not has_display():
+        not_measured("no display (set DISPLAY, e.g. run under xvfb-run)")
+        return
+
+    try:
+        scales = sorted({int(s) for s in args.scales.split(",") if s.strip()})
+    except ValueError:
+        raise SystemExit("--scales must be whole numbers, e.g. 1,10 or 1,10,100")
+    latency_budgets, rss_budgets = load_budgets(args.budgets)
+
+    results: Dict[int, Dict[str, Any]] = {}
+    for scale in scales:
+        tmp = tempfile.mkdtemp(prefix=f"perf_budget_{scale}x_") if scale > 1 else None
+        try:
+            folder = args.folder
+            if tmp is not None:
+                make_corpus(args.folder, scale, tmp)
+                folder = tmp
+            print(f"Running {scale}x ...", flush=True)
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), folder,
+                 "--child", "--repeat", str(args.repeat)],
+                capture_output=True, text=True,
+            )
+        finally:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+        if proc.returncode != 0:
+            sys.stderr.write(proc.stderr)
+            raise SystemExit(f"{scale}x run failed")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if "skipped" in result:
+            not_measured(result["skipped"])
+            return
+        results[scale] = result
+
+    print()
+    failures = check(results, latency_budgets, rss_budgets)
+    if args.write_budgets:
+        write_budgets(args.write_budgets, results)
+        print(f"\nBudgets written to {args.write_budgets}")
+    if failures:
+        print(f"\n{len(failures)} budget(s) exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll within budget.")
+
+
+if __name__ == "__main__":
+    main()
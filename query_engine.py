@@ -0,0 +1,281 @@
+# query_engine.py
+#
+# Combined game filters, compiled into one query plan.
+#
+# A GameQuery holds any combination of predicates: engine set, title text,
+# and inclusive ranges on rating, price, release year, peak players and
+# estimated revenue (missing values, -1 / "Unreleased", never match a range).
+#
+# QueryIndex keeps the corpus in columns (revenue_models.GameColumns plus
+# release years and lower-cased titles) and evaluates a query as a plan:
+#   1. candidate rows come from the engine row ranges, or from a sorted
+#      column index (bisect) when one range predicate is selective enough,
+#      or else from a full scan;
+#   2. every remaining predicate is applied column at a time to the
+#      candidate row ids (one pass per predicate, title match last).
+# The chosen plan and the evaluation time come back with the rows.
+#
+# Query text (CLI / UI): whitespace-separated terms with no spaces around
+# the operator; quote values that contain spaces:
+#     rating>=90 price<=9.99 year=2015..2020 players>1000 revenue>=1e6
+#     engine=godot,unity title~"rogue like"
+# Ranges are inclusive, so > and < read as >= and <=.
+
+import re
+import shlex
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Dict, List, Set, Tuple
+
+from GroupProject_Main import Game
+from revenue_models import GameColumns
+
+
+# range fields -> label used in summaries
+QUERY_FIELDS = {
+    "rating": "rating",
+    "price": "price",
+    "year": "release year",
+    "players": "peak players",
+    "revenue": "est. revenue",
+}
+
+# An indexed range is used to pick candidates when it keeps at most this
+# fraction of all rows; otherwise a scan is cheaper than the index lookup.
+INDEX_PLAN_MAX_FRACTION = 0.25
+
+# field, operator, value ("rating>=80", "title~rogue", "year=2015..2020")
+_TERM = re.compile(r"^\s*([A-Za-z_]+)\s*(>=|<=|==|~|>|<|=)(.*)$", re.DOTALL)
+
+
+class GameQuery:
+    """
+    Predicates combined with AND. ranges maps a QUERY_FIELDS name to an
+    inclusive (low, high) pair; either end may be None (open).
+    """
+
+    def __init__(self):
+        self.engines: Set[str] | None = None
+        self.title: str | None = None
+        self.ranges: Dict[str, Tuple[float | None, float | None]] = {}
+
+    def is_empty(self) -> bool:
+        return self.engines is None and not self.title and not self.ranges
+
+    def set_range(self, field: str, low: float | None, high: float | None) -> None:
+        """Set (or with both ends None, clear) one range predicate."""
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        if low is None and high is None:
+            self.ranges.pop(field, None)
+        elif low is not None and high is not None and low > high:
+            self.ranges[field] = (high, low)
+        else:
+            self.ranges[field] = (low, high)
+
+    def describe(self) -> List[str]:
+        """One human-readable part per predicate, for the "Active filters" line."""
+        parts = []
+        if self.engines is not None:
+            names = sorted(self.engines)
+            shown = ", ".join(names[:5]) + (f" (+{len(names) - 5} more)" if len(names) > 5 else "")
+            parts.append(f"engines {shown}")
+        if self.title:
+            parts.append(f"title contains '{self.title}'")
+        for field, (low, high) in self.ranges.items():
+            lo = "-∞" if low is None else f"{low:.15g}"
+            hi = "+∞" if high is None else f"{high:.15g}"
+            parts.append(f"{QUERY_FIELDS[field]} {lo}–{hi}")
+        return parts
+
+    def to_text(self) -> str:
+        """Query text that parse_query turns back into this query."""
+        terms = []
+        if self.engines is not None:
+            terms.append(shlex.quote("engine=" + ",".join(sorted(self.engines))))
+        if self.title:
+            terms.append(shlex.quote("title~" + self.title))
+        for field, (low, high) in self.ranges.items():
+            lo = "" if low is None else _number_text(low)
+            hi = "" if high is None else _number_text(high)
+            terms.append(f"{field}={lo}" if low == high else f"{field}={lo}..{hi}")
+        return " ".join(terms)
+
+
+def _number_text(value: float) -> str:
+    """Shortest text that reads back as exactly value."""
+    short = f"{value:.15g}"
+    return short if float(short) == value else repr(float(value))
+
+
+def _number(text: str, field: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"'{text}' is not a number (in {field})") from None
+
+
+def parse_query(text: str, resolve_engine: Callable[[str], str | None] | None = None) -> GameQuery:
+    """
+    Build a GameQuery from query text (see the module header).
+    resolve_engine maps typed engine names to exact ones (e.g.
+    EngineDataset.resolve); unknown engines raise ValueError.
+    """
+    query = GameQuery()
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Bad query: {e}") from None
+
+    for term in terms:
+        match = _TERM.match(term)
+        if match is None:
+            raise ValueError(f"Bad term '{term}' (expected e.g. rating>=80)")
+        field, op, value = match.group(1).lower(), match.group(2), match.group(3)
+
+        if field == "title":
+            if op not in ("~", "=", "=="):
+                raise ValueError("title only supports title~text")
+            query.title = value     # as typed: quoted spaces are part of the text
+        elif field in ("engine", "engines"):
+            if op not in ("=", "=="):
+                raise ValueError("engine only supports engine=name1,name2")
+            engines = set()
+            for raw in value.split(","):
+                if not raw.strip():
+                    continue
+                name = resolve_engine(raw) if resolve_engine else raw.strip()
+                if name is None:
+                    raise ValueError(f"Unknown engine: {raw.strip()}")
+                engines.add(name)
+            query.engines = engines
+        elif field in QUERY_FIELDS:
+            low, high = query.ranges.get(field, (None, None))
+            if op in ("=", "=="):
+                value = value.strip()
+                if ".." in value:
+                    lo_text, _, hi_text = value.partition("..")
+                    low = _number(lo_text, field) if lo_text.strip() else None
+                    high = _number(hi_text, field) if hi_text.strip() else None
+                else:
+                    low = high = _number(value, field)
+            elif op in (">=", ">"):
+                low = _number(value, field)
+            elif op in ("<=", "<"):
+                high = _number(value, field)
+            else:
+                raise ValueError(f"'{op}' is not supported for {field}")
+            query.set_range(field, low, high)
+        else:
+            raise ValueError(f"Unknown field '{field}' (use engine, title, "
+                             f"{', '.join(QUERY_FIELDS)})")
+    return query
+
+
+class QueryResult:
+    """Matching (engine_name, Game) rows plus how they were found."""
+
+    def __init__(self, rows: List[Tuple[str, Game]], total: int, plan: str, seconds: float):
+        self.rows = rows
+        self.total = total      # rows in the corpus
+        self.plan = plan
+        self.seconds = seconds
+
+    def __len__(self):
+        return len(self.rows)
+
+    def summary(self) -> str:
+        return (f"{len(self.rows):,} of {self.total:,} games matched in "
+                f"{self.seconds * 1000:.2f} ms ({self.plan})")
+
+
+class QueryIndex:
+    """
+    Column view of a corpus for evaluating GameQuery plans. Build one per
+    loaded dataset; call set_revenue() when the revenue model changes.
+    """
+
+    def __init__(self, engine_dict: Dict[str, List[Game]], columns: GameColumns | None = None,
+                 revenue: List[float] | None = None):
+        self.columns = columns if columns is not None else GameColumns(engine_dict)
+        cols = self.columns
+        self.rows: List[Tuple[str, Game]] = [(name, g) for name, games in engine_dict.items()
+                                             for g in games]
+        self.titles: List[str] = [g.title.casefold() for _, g in self.rows]
+        years = [datetime.fromtimestamp(ts).year if ts >= 0 else -1 for ts in cols.release_ts]
+        if revenue is None:
+            revenue = [c * p if c >= 0 and p >= 0 else -1 for c, p in zip(cols.cost, cols.peak)]
+        self.values: Dict[str, List[float]] = {
+            "rating": cols.rating,
+            "price": cols.cost,
+            "year": years,
+            "players": cols.peak,
+            "revenue": revenue,
+        }
+        self._sorted: Dict[str, Tuple[List[float], List[int]]] = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_revenue(self, revenue: List[float]) -> None:
+        """Swap in another revenue model's per-row values (GameColumns order)."""
+        self.values["revenue"] = revenue
+        self._sorted.pop("revenue", None)
+
+    def _sorted_index(self, field: str) -> Tuple[List[float], List[int]]:
+        """(sorted known values, their row ids) for field, built on first use."""
+        if field not in self._sorted:
+            pairs = sorted((v, i) for i, v in enumerate(self.values[field]) if v >= 0)
+            self._sorted[field] = ([v for v, _ in pairs], [i for _, i in pairs])
+        return self._sorted[field]
+
+    def _index_range(self, field: str, low, high) -> Tuple[int, int]:
+        keys, _ = self._sorted_index(field)
+        lo = bisect_left(keys, low) if low is not None else 0
+        hi = bisect_right(keys, high) if high is not None else len(keys)
+        return lo, max(lo, hi)
+
+    def run(self, query: GameQuery) -> QueryResult:
+        start = time.perf_counter()
+        ranges = dict(query.ranges)
+
+        # 1. candidate rows
+        if query.engines is not None:
+            row_ids = [i for name in query.engines
+                       for i in range(*self.columns.engine_ranges.get(name, (0, 0)))]
+            count = len(query.engines)
+            plan = f"engine ranges ({count} engine{'' if count == 1 else 's'})"
+        else:
+            best = None
+            for field, (low, high) in ranges.items():
+                lo, hi = self._index_range(field, low, high)
+                if best is None or hi - lo < best[1]:
+                    best = (field, hi - lo, lo, hi)
+            if best is not None and best[1] <= INDEX_PLAN_MAX_FRACTION * len(self.rows):
+                field, _, lo, hi = best
+                row_ids = sorted(self._sorted_index(field)[1][lo:hi])
+                del ranges[field]   # fully answered by the index
+                plan = f"{field} index"
+            else:
+                row_ids = range(len(self.rows))
+                plan = "scan"
+
+        # 2. remaining predicates, one column pass each
+        for field, (low, high) in ranges.items():
+            col = self.values[field]
+            lo = 0.0 if low is None else max(low, 0.0)
+            if high is None:
+                row_ids = [i for i in row_ids if col[i] >= lo]
+            else:
+                row_ids = [i for i in row_ids if lo <= col[i] <= high]
+        if query.title:
+            needle = query.title.casefold()
+            titles = self.titles
+            row_ids = [i for i in row_ids if needle in titles[i]]
+        if ranges or query.title:
+            plan += " + " + ", ".join(list(ranges) + (["title"] if query.title else []))
+
+        rows = [self.rows[i] for i in row_ids]
+        rows.sort(key=lambda row: (row[0], row[1].title))
+        return QueryResult(rows, len(self.rows), plan, time.perf_counter() - start)
@@ -0,0 +1,144 @@
+# revenue_models.py
+#
+# Pluggable revenue estimators.
+#
+# Each estimator is a plain function that takes the GameColumns of the whole
+# dataset and returns one value per game (-1 = can't estimate), computed in a
+# single batch over the columns. RevenueModels caches the result per model,
+# so switching models only computes the revenue column for the new model
+# (once) and never rebuilds the Game objects or the other stats.
+#
+# To add a model, write a function with that signature and register it in
+# REVENUE_MODELS.
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from GroupProject_Main import Game
+
+
+# A rough rule of thumb: each Steam follower stands for about this many owners.
+OWNERS_PER_FOLLOWER = 10.0
+
+# Half-life (years) used by the age-decayed model.
+REVENUE_HALF_LIFE_YEARS = 2.0
+
+DEFAULT_REVENUE_MODEL = "peak_x_price"
+
+
+class GameColumns:
+    """
+    Column view of an engine_dict: one list per field, one entry per game,
+    with each engine's games in a contiguous row range.
+    """
+
+    def __init__(self, engine_dict: Dict[str, List[Game]]):
+        self.engine_ranges: Dict[str, Tuple[int, int]] = {}
+        self.cost: List[float] = []
+        self.rating: List[float] = []
+        self.peak: List[float] = []
+        self.follows: List[float] = []
+        self.release_ts: List[float] = []   # -1 when unreleased
+
+        for engine_name, games in engine_dict.items():
+            start = len(self.cost)
+            for g in games:
+                self.cost.append(g.cost)
+                self.rating.append(g.rating)
+                self.peak.append(g.topPlayerCount)
+                self.follows.append(getattr(g, "follows", -1))
+                rd = g.releaseDate
+                self.release_ts.append(rd.timestamp() if isinstance(rd, datetime) else -1)
+            self.engine_ranges[engine_name] = (start, len(self.cost))
+
+    def __len__(self):
+        return len(self.cost)
+
+
+# ---------- Estimators ----------
+
+def peak_x_price(cols: GameColumns) -> List[float]:
+    """Price x peak concurrent players (the original estimate)."""
+    return [c * p if c >= 0 and p >= 0 else -1
+            for c, p in zip(cols.cost, cols.peak)]
+
+
+def followers_x_price(cols: GameColumns) -> List[float]:
+    """
+    Price x estimated owners, with owners = followers x OWNERS_PER_FOLLOWER.
+    (SteamDB pages don't carry review counts; followers are the closest
+    audience-size signal the parser has.)
+    """
+    k = OWNERS_PER_FOLLOWER
+    return [c * f * k if c >= 0 and f >= 0 else -1
+            for c, f in zip(cols.cost, cols.follows)]
+
+
+def age_decayed(cols: GameColumns) -> List[float]:
+    """
+    Current earning power: price x peak players, halved every
+    REVENUE_HALF_LIFE_YEARS since release. Unreleased games can't be estimated.
+    """
+    now = time.time()
+    seconds_per_half_life = REVENUE_HALF_LIFE_YEARS * 365.25 * 24 * 3600
+    return [c * p * 0.5 ** (max(now - ts, 0.0) / seconds_per_half_life)
+            if c >= 0 and p >= 0 and ts >= 0 else -1
+            for c, p, ts in zip(cols.cost, cols.peak, cols.release_ts)]
+
+
+# model name -> (label for the UI, estimator)
+REVENUE_MODELS: Dict[str, Tuple[str, Callable[[GameColumns], List[float]]]] = {
+    "peak_x_price": ("Peak players x price", peak_x_price),
+    "followers_x_price": ("Followers x price", followers_x_price),
+    "age_decayed": ("Peak x price, age-decayed", age_decayed),
+}
+
+
+# ---------- Cached evaluation ----------
+
+class RevenueModels:
+    """
+    Revenue estimates for one dataset, cached per model.
+
+    The columns are built once; each model's per-game column and its
+    per-engine (avg, max) are computed the first time they are asked for.
+    Build a new RevenueModels when the data changes.
+    """
+
+    def __init__(self, engine_dict: Dict[str, List[Game]]):
+        self.columns = GameColumns(engine_dict)
+        self._values: Dict[str, List[float]] = {}
+        self._engine_stats: Dict[str, Dict[str, Tuple[float | None, float | None]]] = {}
+
+    def values(self, model: str) -> List[float]:
+        """Per-game revenue for model, aligned with GameColumns rows."""
+        if model not in REVENUE_MODELS:
+            raise ValueError(f"Unknown revenue model: {model}")
+        if model not in self._values:
+            self._values[model] = REVENUE_MODELS[model][1](self.columns)
+        return self._values[model]
+
+    def engine_stats(self, model: str) -> Dict[str, Tuple[float | None, float | None]]:
+        """{engine_name: (avg_revenue, max_revenue)} under model (None = no estimate)."""
+        if model not in self._engine_stats:
+            values = self.values(model)
+            result = {}
+            for engine_name, (start, end) in self.columns.engine_ranges.items():
+                usable = [v for v in values[start:end] if v >= 0]
+                if usable:
+                    result[engine_name] = (sum(usable) / len(usable), max(usable))
+                else:
+                    result[engine_name] = (None, None)
+            self._engine_stats[model] = result
+        return self._engine_stats[model]
+
+    def apply(self, stats_list: List[dict], model: str) -> List[dict]:
+        """
+        Overwrite avg_revenue / max_revenue in stats dicts (in place) with the
+        model's values; every other column is left as it is.
+        """
+        per_engine = self.engine_stats(model)
+        for s in stats_list:
+            s["avg_revenue"], s["max_revenue"] = per_engine.get(s["engine_name"], (None, None))
+        return stats_list
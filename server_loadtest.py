@@ -0,0 +1,109 @@
+# server_loadtest.py
+#
+# Load test for engine_server.py: several client threads send a mix of
+# queries for a fixed time and the script reports latency percentiles and
+# throughput.
+#
+# Usage:
+#     python engine_server.py . --quiet          (in another terminal)
+#     python server_loadtest.py [--url http://127.0.0.1:8538] [--clients 8] [--seconds 10]
+
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+from engine_server import DEFAULT_PORT
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return resp.status, resp.read()
+
+
+def _query_mix(base, engines):
+    """A list of (label, url) pairs covering every endpoint."""
+    picks = random.sample(engines, min(5, len(engines)))
+    return [
+        ("stats", f"{base}/stats?engine={quote(picks[0])}"),
+        ("compare", f"{base}/compare?engines={quote(','.join(picks))}&sort=avg_rating"),
+        ("top", f"{base}/top?metric=avg_players&k=10"),
+        ("filter", f"{base}/filter?min_rating=85&max_rating=100&max_price=20&limit=50"),
+        ("filter_engine", f"{base}/filter?engine={quote(picks[1 % len(picks)])}&limit=50"),
+        ("engines", f"{base}/engines"),
+    ]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def run(base, clients, seconds):
+    status, body = _get(f"{base}/engines")
+    engines = json.loads(body)
+    if not engines:
+        raise SystemExit("Server has no engines loaded.")
+
+    latencies = {}   # label -> [seconds]
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        mine = {}
+        while time.perf_counter() < deadline:
+            for label, url in _query_mix(base, engines):
+                start = time.perf_counter()
+                try:
+                    _get(url)
+                except (urllib.error.URLError, OSError) as e:
+                    with lock:
+                        errors.append(f"{label}: {e}")
+                    continue
+                mine.setdefault(label, []).append(time.perf_counter() - start)
+        with lock:
+            for label, values in mine.items():
+                latencies.setdefault(label, []).extend(values)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    wall_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall_start
+
+    all_values = sorted(v for values in latencies.values() for v in values)
+    print(f"{clients} clients, {wall:.1f}s, {len(all_values)} requests, {len(errors)} errors")
+    print(f"Throughput: {len(all_values) / wall:,.1f} requests/s\n")
+    print(f"{'Endpoint':14s} {'Count':>7s} {'p50 (ms)':>10s} {'p99 (ms)':>10s} {'max (ms)':>10s}")
+    print("-" * 55)
+    for label in sorted(latencies):
+        values = sorted(latencies[label])
+        print(f"{label:14s} {len(values):>7d} {_percentile(values, 50) * 1000:>10.2f} "
+              f"{_percentile(values, 99) * 1000:>10.2f} {values[-1] * 1000:>10.2f}")
+    print("-" * 55)
+    print(f"{'all':14s} {len(all_values):>7d} {_percentile(all_values, 50) * 1000:>10.2f} "
+          f"{_percentile(all_values, 99) * 1000:>10.2f} {all_values[-1] * 1000 if all_values else 0:>10.2f}")
+    for e in errors[:5]:
+        print("  error:", e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for engine_server.py")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    run(args.url.rstrip("/"), args.clients, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
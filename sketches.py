@@ -0,0 +1,462 @@
+# sketches.py
+#
+# Bounded-memory, mergeable per-engine summaries (approximate stats mode).
+#
+# compute_stats_matrix needs every Game in memory. For years of snapshots
+# that is too much, so an EngineSketch keeps a fixed-size summary per engine
+# instead, and summaries for the same engine from different pages, folders
+# or worker processes are merged with EngineSketch.merge():
+#
+#   RunningStats     count / mean / variance (Welford, Chan et al. merge),
+#                    min and max. Exact up to floating point.
+#   KLLSketch        quantiles (p50 / p90 / p99). With k items per level the
+#                    normalized rank error is O(1/k) with high probability
+#                    (Karnin, Lang & Liberty 2016); for the default k = 200 it
+#                    is typically below 1% of n. Exact while n <= k.
+#   HyperLogLog      distinct app ids, 2**p one-byte registers. Relative
+#                    standard error 1.04 / sqrt(2**p): 1.6% for p = 12.
+#   CountMinSketch   per-app totals (peak players) and the heavy hitters.
+#                    Estimates never undercount; with width ceil(e/eps) and
+#                    depth ceil(ln(1/delta)) they overcount by at most
+#                    eps * (total weight) with probability 1 - delta.
+#
+# Sketches are fed straight from the page parser: each ingest worker parses
+# one page, folds its games into an EngineSketch and hands back only the
+# sketch (see sketch_folders), so no Game list outlives its page.
+#
+# bench_sketches.py measures speed, memory and the actual errors against the
+# exact compute_engine_stats.
+#
+# Usage:
+#     python sketches.py FOLDER [FOLDER ...] [--sort avg_players] [--top 20]
+
+import argparse
+import math
+import random
+from array import array
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, List, Tuple
+
+from GroupProject_Main import STAT_COLUMNS, Game, ParseReport, _fmt, htmlToList, rank_stats
+
+
+KLL_K = 200
+HLL_PRECISION = 12
+CM_EPSILON = 0.01
+CM_DELTA = 0.01
+HEAVY_HITTERS = 10
+
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
+SKETCH_METRICS = ("cost", "rating", "players", "revenue")
+
+# columns of to_stats() that can be sorted on: STAT_COLUMNS plus the sketch-only ones
+SKETCH_COLUMNS = STAT_COLUMNS + [
+    f"{prefix}_{metric}"
+    for metric in SKETCH_METRICS
+    for prefix in ["std"] + [f"p{round(q * 100)}" for q in SKETCH_QUANTILES]
+] + ["distinct_apps"]
+
+
+def hash64(key: str) -> int:
+    """Stable 64-bit hash (unlike hash(), the same in every worker process)."""
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ---------- Mean / variance ----------
+
+class RunningStats:
+    """Streaming count, mean, variance, min and max (Welford)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStats") -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float | None:
+        """Sample variance (None for fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self) -> float | None:
+        v = self.variance
+        return math.sqrt(v) if v is not None else None
+
+
+# ---------- Quantiles ----------
+
+class KLLSketch:
+    """
+    KLL quantile sketch. Level h holds items of weight 2**h; a full level is
+    sorted and every other item (random offset) is promoted to the next one.
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int | None = None):
+        self.k = k
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity_total()
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _capacity_total(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def add(self, x: float) -> None:
+        self.levels[0].append(x)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        for h in range(len(self.levels)):
+            items = self.levels[h]
+            if len(items) < self._capacity(h):
+                continue
+            if h + 1 == len(self.levels):
+                self.levels.append([])
+                self._max_size = self._capacity_total()
+            items.sort()
+            keep = [items.pop()] if len(items) % 2 else []
+            self.levels[h + 1].extend(items[self._rng.random() < 0.5::2])
+            self.levels[h] = keep
+            self._size = sum(len(level) for level in self.levels)
+            if self._size < self._max_size:
+                break
+
+    def merge(self, other: "KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        self._max_size = self._capacity_total()
+        self._size = sum(len(level) for level in self.levels)
+        while self._size >= self._max_size:
+            before = self._size
+            self._compress()
+            if self._size == before:
+                break
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        pairs = [(x, 1 << h) for h, items in enumerate(self.levels) for x in items]
+        pairs.sort()
+        return pairs
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate q-quantile (0 <= q <= 1), or None when empty."""
+        if self.n == 0:
+            return None
+        pairs = self._weighted()
+        total = sum(w for _, w in pairs)
+        target = q * total
+        seen = 0
+        for x, w in pairs:
+            seen += w
+            if seen >= target:
+                return x
+        return pairs[-1][0]
+
+    def rank(self, x: float) -> float:
+        """Approximate fraction of values <= x."""
+        pairs = self._weighted()
+        total = sum(w for _, w in pairs)
+        return sum(w for v, w in pairs if v <= x) / total if total else 0.0
+
+
+# ---------- Distinct counts ----------
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes."""
+
+    def __init__(self, p: int = HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add_hash(self, h: int) -> None:
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, key: str) -> None:
+        self.add_hash(hash64(key))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)   # linear counting for small sets
+        return estimate
+
+
+# ---------- Heavy hitters ----------
+
+class CountMinSketch:
+    """
+    Count-min sketch of weighted keys, plus a small candidate set of the
+    heaviest keys seen. Candidates carry the estimate from their last update
+    (a lower bound, as estimates only grow) and are re-ranked on query.
+    """
+
+    def __init__(self, epsilon: float = CM_EPSILON, delta: float = CM_DELTA,
+                 top_k: int = HEAVY_HITTERS):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1.0 / delta)))
+        self.table = [array("d", bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0.0
+        self.top_k = top_k
+        self.candidates: Dict[str, List] = {}   # key -> [estimate, label]
+        self._floor = 0.0                        # smallest estimate kept by the last prune
+
+    def _cells(self, h: int) -> List[int]:
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, weight: float = 1.0, label: str | None = None,
+            h: int | None = None) -> None:
+        est = None
+        for row, col in zip(self.table, self._cells(hash64(key) if h is None else h)):
+            row[col] += weight
+            if est is None or row[col] < est:
+                est = row[col]
+        self.total += weight
+
+        entry = self.candidates.get(key)
+        if entry is not None:
+            entry[0] = est
+        elif est > self._floor or len(self.candidates) < self.top_k:
+            self.candidates[key] = [est, label if label is not None else key]
+            if len(self.candidates) > 4 * self.top_k:
+                self._prune()
+
+    def estimate(self, key: str) -> float:
+        return min(row[col] for row, col in zip(self.table, self._cells(hash64(key))))
+
+    def _prune(self) -> None:
+        keep = sorted(self.candidates.items(), key=lambda kv: kv[1][0], reverse=True)[:self.top_k]
+        self.candidates = dict(keep)
+        self._floor = keep[-1][1][0] if keep else 0.0
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches of different shapes")
+        for mine, theirs in zip(self.table, other.table):
+            for i, v in enumerate(theirs):
+                if v:
+                    mine[i] += v
+        self.total += other.total
+        for key, (_, label) in other.candidates.items():
+            self.candidates.setdefault(key, [0.0, label])
+        for key, entry in self.candidates.items():
+            entry[0] = self.estimate(key)
+        if len(self.candidates) > 4 * self.top_k:
+            self._prune()
+
+    def heavy_hitters(self, k: int | None = None) -> List[Tuple[str, str, float]]:
+        """[(key, label, estimated weight)], heaviest first."""
+        ranked = sorted(((self.estimate(key), key) for key in self.candidates), reverse=True)
+        return [(key, self.candidates[key][1], est) for est, key in ranked[:k or self.top_k]]
+
+    @property
+    def error_bound(self) -> float:
+        """Maximum overcount (holds with probability 1 - delta)."""
+        return self.epsilon * self.total
+
+
+# ---------- Per-engine summary ----------
+
+class MetricSketch:
+    """Moments plus quantiles for one metric."""
+
+    def __init__(self, k: int = KLL_K):
+        self.moments = RunningStats()
+        self.quantiles = KLLSketch(k)
+
+    def add(self, x: float) -> None:
+        self.moments.add(x)
+        self.quantiles.add(x)
+
+    def merge(self, other: "MetricSketch") -> None:
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+
+
+class EngineSketch:
+    """
+    Mergeable summary of one engine's games. Missing values (< 0) are
+    ignored per metric, as in compute_stats_matrix; revenue is price x peak
+    players when both are known. Games without an app id (-1) count towards
+    the metrics but not distinct_apps / top_apps.
+    """
+
+    def __init__(self, engine_name: str):
+        self.engine_name = engine_name
+        self.num_games = 0
+        self.metrics = {m: MetricSketch() for m in SKETCH_METRICS}
+        self.app_ids = HyperLogLog()
+        self.top_apps = CountMinSketch()   # app id weighted by peak players
+
+    def add_game(self, g: Game) -> None:
+        self.num_games += 1
+        c = g.cost
+        p = g.topPlayerCount
+        for metric, v in (("cost", c), ("rating", g.rating), ("players", p)):
+            if v is not None and v >= 0:
+                self.metrics[metric].add(v)
+        if c is not None and c >= 0 and p is not None and p >= 0:
+            self.metrics["revenue"].add(c * p)
+
+        if g.id < 0:
+            return  # no app id: not an app we can count or tell apart
+        key = str(g.id)
+        h = hash64(key)
+        self.app_ids.add_hash(h)
+        if p is not None and p > 0:
+            self.top_apps.add(key, p, label=g.title, h=h)
+
+    def add_games(self, games: Iterable[Game]) -> "EngineSketch":
+        for g in games:
+            self.add_game(g)
+        return self
+
+    def merge(self, other: "EngineSketch") -> None:
+        self.num_games += other.num_games
+        for metric, sketch in self.metrics.items():
+            sketch.merge(other.metrics[metric])
+        self.app_ids.merge(other.app_ids)
+        self.top_apps.merge(other.top_apps)
+
+    def to_stats(self) -> Dict[str, Any]:
+        """
+        Stats dict with the STAT_COLUMNS keys (avg / max are exact) plus
+        std_<metric>, p50/p90/p99_<metric>, distinct_apps and top_apps.
+        """
+        stats: Dict[str, Any] = {"engine_name": self.engine_name, "num_games": self.num_games}
+        for metric, sketch in self.metrics.items():
+            moments = sketch.moments
+            stats[f"avg_{metric}"] = moments.mean if moments.count else None
+            stats[f"max_{metric}"] = moments.max
+            stats[f"std_{metric}"] = moments.std
+            for q in SKETCH_QUANTILES:
+                stats[f"p{round(q * 100)}_{metric}"] = sketch.quantiles.quantile(q)
+        stats["distinct_apps"] = round(self.app_ids.count())
+        stats["top_apps"] = [(label, est) for _, label, est in self.top_apps.heavy_hitters()]
+        return stats
+
+
+# ---------- Building sketches ----------
+
+def merge_sketches(into: Dict[str, EngineSketch], sketches: Iterable[EngineSketch]) -> Dict[str, EngineSketch]:
+    """Merge sketches into the {engine_name: EngineSketch} dict (in place)."""
+    for sketch in sketches:
+        mine = into.get(sketch.engine_name)
+        if mine is None:
+            into[sketch.engine_name] = sketch
+        else:
+            mine.merge(sketch)
+    return into
+
+
+def sketch_engine_dict(engine_dict: Dict[str, List[Game]]) -> Dict[str, EngineSketch]:
+    """Sketches for an already loaded engine_dict."""
+    return {name: EngineSketch(name).add_games(games) for name, games in engine_dict.items()}
+
+
+def _sketch_page(text: str) -> Tuple[EngineSketch, ParseReport]:
+    """Ingest worker: parse one page and keep only its sketch."""
+    reports: List[ParseReport] = []
+    entry = htmlToList([text], reports)[0]
+    return EngineSketch(entry[0]).add_games(entry[1:]), reports[0]
+
+
+def sketch_folders(folders: Iterable[str], reports: List[ParseReport] | None = None,
+                   **ingest_kwargs) -> Dict[str, EngineSketch]:
+    """
+    Stream every engine page under the folders through the ingest pipeline
+    and merge the per-page sketches by engine name. ingest_kwargs are passed
+    to ingest.ingest_folder (executor, workers, ...).
+    """
+    from ingest import ingest_folder
+
+    sketches: Dict[str, EngineSketch] = {}
+    for folder in folders:
+        merge_sketches(sketches, ingest_folder(folder, reports, parse=_sketch_page, **ingest_kwargs))
+    return sketches
+
+
+def approximate_stats_matrix(sketches: Dict[str, EngineSketch],
+                             engine_names: List[str] | None = None) -> List[Dict[str, Any]]:
+    """Like compute_stats_matrix, but from sketches."""
+    if engine_names is None:
+        engine_names = list(sketches.keys())
+    return [sketches[n].to_stats() for n in engine_names if n in sketches]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximate per-engine stats from sketches")
+    parser.add_argument("folders", nargs="+")
+    parser.add_argument("--sort", default="avg_players", choices=SKETCH_COLUMNS, metavar="COLUMN",
+                        help="stats column to sort by, e.g. avg_players or p50_players")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--executor", default="process", choices=("process", "thread"))
+    args = parser.parse_args()
+
+    sketches = sketch_folders(args.folders, executor=args.executor)
+    ranked = rank_stats(approximate_stats_matrix(sketches), args.sort, columns=SKETCH_COLUMNS)
+
+    print(f"{'#':>3s} {'Engine':30s} {'Games':>7s} {'Apps~':>7s} {'Avg players':>12s} "
+          f"{'p50':>9s} {'p99':>10s} {'Std':>10s}")
+    for s in ranked[:args.top]:
+        print(f"{s['rank']:>3d} {s['engine_name'][:30]:30s} {s['num_games']:>7d} "
+              f"{s['distinct_apps']:>7d} {_fmt(s['avg_players']):>12s} "
+              f"{_fmt(s['p50_players']):>9s} {_fmt(s['p99_players']):>10s} "
+              f"{_fmt(s['std_players']):>10s}")
+
+
+if __name__ == "__main__":
+    main()
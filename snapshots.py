@@ -0,0 +1,256 @@
+# snapshots.py
+#
+# Several dated scrape folders loaded as one corpus.
+#
+# Each folder (e.g. scrapes/2026-10-17, scrapes/2026-10-18) is a shard: the
+# shards are read and parsed in parallel worker processes, and each comes
+# back as an EngineDataset tagged with its snapshot date. Pages for the same
+# engine inside one shard (e.g. "HashLink Engine" saved as both .htm and
+# .html) are merged on app id instead of the later file overwriting the
+# earlier one, as build_engine_dict does.
+#
+# Cross-snapshot questions ("how did each game's peak players change?") are
+# answered with a hash join on app id: the older snapshot is hashed once and
+# the newer one probes it, so the cost is linear in the number of games.
+#
+# Usage:
+#     python snapshots.py scrapes/2026-10-17 scrapes/2026-10-18 [--top 20]
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Tuple
+
+from GroupProject_Main import Game, ParseReport, fileRead, htmlToList
+from engine_core import EngineDataset
+
+
+_DATE_RE = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+
+
+def snapshot_date(folder: str) -> date:
+    """Date from the folder name (2026-10-18 or 20261018), else the folder's mtime."""
+    match = _DATE_RE.search(os.path.basename(os.path.normpath(folder)))
+    if match:
+        try:
+            return date(*(int(part) for part in match.groups()))
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(folder)).date()
+
+
+def merge_engine_list(engineList) -> Dict[str, List[Game]]:
+    """
+    Like build_engine_dict, but pages for the same engine are merged:
+    games are appended in file order, and an app id already seen for that
+    engine is not added twice. Rows without an app id (-1) are told apart
+    by title.
+    """
+    engine_dict: Dict[str, List[Game]] = {}
+    seen: Dict[str, set] = {}   # engine -> app ids, (-1, title) for rows without one
+    for entry in engineList:
+        if not entry:
+            continue
+        engine_name = entry[0]
+        games = engine_dict.setdefault(engine_name, [])
+        ids = seen.setdefault(engine_name, set())
+        for g in entry[1:]:
+            key = g.id if g.id >= 0 else (g.id, g.title)
+            if key in ids:
+                continue
+            ids.add(key)
+            games.append(g)
+    return engine_dict
+
+
+def _load_shard(folder: str) -> Tuple[Dict[str, List[Game]], List[ParseReport]]:
+    """Read and parse one snapshot folder (runs in a worker process)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine_file_list = fileRead(folder)
+    reports: List[ParseReport] = []
+    engine_dict = merge_engine_list(htmlToList(engine_file_list, reports))
+    return engine_dict, reports
+
+
+class Snapshot:
+    """One shard: the parsed dataset plus its date."""
+
+    def __init__(self, taken: date, data: EngineDataset):
+        self.date = taken
+        self.data = data
+        self._by_app_id: Dict[int, Tuple[Game, List[str]]] | None = None
+
+    @property
+    def folder(self) -> str | None:
+        return self.data.folder
+
+    def by_app_id(self) -> Dict[int, Tuple[Game, List[str]]]:
+        """
+        Hash table {app_id: (Game, [engine names])}, built on first use.
+        A game made with several engines appears once, with all its engines.
+        Rows without an app id (-1) cannot be matched across snapshots and
+        are left out.
+        """
+        if self._by_app_id is None:
+            table: Dict[int, Tuple[Game, List[str]]] = {}
+            for engine_name, g in self.data.all_games():
+                if g.id < 0:
+                    continue
+                entry = table.get(g.id)
+                if entry is None:
+                    table[g.id] = (g, [engine_name])
+                elif engine_name not in entry[1]:
+                    entry[1].append(engine_name)
+            self._by_app_id = table
+        return self._by_app_id
+
+
+class SnapshotCorpus:
+    """Snapshots ordered by date (oldest first)."""
+
+    def __init__(self, snapshots: List[Snapshot]):
+        self.snapshots: List[Snapshot] = sorted(snapshots, key=lambda s: s.date)
+
+    @classmethod
+    def from_folders(cls, folders: List[str], workers: int | None = None) -> "SnapshotCorpus":
+        """Load every folder as a shard, parsing the shards in parallel."""
+        workers = workers or min(len(folders), os.cpu_count() or 1) or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            loaded = list(pool.map(_load_shard, folders))
+        snapshots = []
+        for folder, (engine_dict, reports) in zip(folders, loaded):
+            # titles come back from the workers as fresh copies; share them again
+            for games in engine_dict.values():
+                for g in games:
+                    g.title = sys.intern(g.title)
+            snapshots.append(Snapshot(snapshot_date(folder),
+                                      EngineDataset(engine_dict, reports, folder)))
+        return cls(snapshots)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    @property
+    def dates(self) -> List[date]:
+        return [s.date for s in self.snapshots]
+
+    @property
+    def latest(self) -> EngineDataset:
+        return self.snapshots[-1].data
+
+    def snapshot(self, taken: date) -> Snapshot:
+        for s in self.snapshots:
+            if s.date == taken:
+                return s
+        raise KeyError(taken)
+
+    def games(self) -> Iterator[Tuple[date, str, Game]]:
+        """Every (snapshot date, engine name, Game) row across all shards."""
+        for s in self.snapshots:
+            for engine_name, g in s.data.all_games():
+                yield s.date, engine_name, g
+
+    # --- joins across snapshots ---
+
+    def peak_changes(self, older: date | None = None,
+                     newer: date | None = None) -> List[dict]:
+        """
+        Per-game change in peak players between two snapshots (default: the
+        first and the last), via a hash join on app id. Games missing from
+        either snapshot, without an app id, or without a peak count in
+        either, are left out.
+        """
+        if len(self.snapshots) < 2:
+            return []
+        old = self.snapshot(older) if older else self.snapshots[0]
+        new = self.snapshot(newer) if newer else self.snapshots[-1]
+
+        build = old.by_app_id()
+        changes = []
+        for app_id, (g_new, engines) in new.by_app_id().items():
+            match = build.get(app_id)
+            if match is None:
+                continue
+            g_old = match[0]
+            if g_old.topPlayerCount < 0 or g_new.topPlayerCount < 0:
+                continue
+            delta = g_new.topPlayerCount - g_old.topPlayerCount
+            changes.append({
+                "app_id": app_id,
+                "title": g_new.title,
+                "engines": engines,
+                "from_date": old.date,
+                "to_date": new.date,
+                "peak_from": g_old.topPlayerCount,
+                "peak_to": g_new.topPlayerCount,
+                "change": delta,
+                "pct_change": delta / g_old.topPlayerCount * 100 if g_old.topPlayerCount else None,
+            })
+        return changes
+
+    def engine_peak_changes(self, older: date | None = None,
+                            newer: date | None = None) -> List[dict]:
+        """Total peak-player change per engine (from peak_changes), biggest gain first."""
+        totals: Dict[str, dict] = {}
+        for row in self.peak_changes(older, newer):
+            for engine_name in row["engines"]:
+                t = totals.setdefault(engine_name, {
+                    "engine_name": engine_name, "games": 0,
+                    "peak_from": 0.0, "peak_to": 0.0, "change": 0.0,
+                })
+                t["games"] += 1
+                t["peak_from"] += row["peak_from"]
+                t["peak_to"] += row["peak_to"]
+                t["change"] += row["change"]
+        return sorted(totals.values(), key=lambda t: t["change"], reverse=True)
+
+    def peak_history(self, app_id: int) -> List[Tuple[date, float]]:
+        """(date, peak players) for one app across every snapshot that has it."""
+        if app_id < 0:
+            return []
+        history = []
+        for s in self.snapshots:
+            entry = s.by_app_id().get(app_id)
+            if entry is not None:
+                history.append((s.date, entry[0].topPlayerCount))
+        return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare dated SteamDB scrape folders")
+    parser.add_argument("folders", nargs="+", help="snapshot folders (dates in the names)")
+    parser.add_argument("--top", type=int, default=15, help="rows to show per list")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    corpus = SnapshotCorpus.from_folders(args.folders, args.workers)
+    for s in corpus.snapshots:
+        print(f"{s.date}: {len(s.data)} engines, {s.data.num_games} games ({s.folder})")
+    if len(corpus) < 2:
+        print("\nNeed at least two snapshots to compare.")
+        return
+
+    changes = corpus.peak_changes()
+    first, last = corpus.dates[0], corpus.dates[-1]
+    print(f"\n{len(changes)} games present in both {first} and {last}\n")
+
+    changes.sort(key=lambda r: r["change"], reverse=True)
+    print("Biggest peak-player gains:")
+    for r in changes[:args.top]:
+        print(f"  {r['change']:>+12,.0f}  {r['title']} ({', '.join(r['engines'])})")
+    print("\nBiggest peak-player drops:")
+    for r in changes[::-1][:args.top]:
+        print(f"  {r['change']:>+12,.0f}  {r['title']} ({', '.join(r['engines'])})")
+
+    print("\nPeak-player change by engine:")
+    for t in corpus.engine_peak_changes()[:args.top]:
+        print(f"  {t['change']:>+12,.0f}  {t['engine_name']} ({t['games']} games)")
+
+
+if __name__ == "__main__":
+    main()
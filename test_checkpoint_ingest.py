@@ -0,0 +1,75 @@
+# test_checkpoint_ingest.py
+#
+# Regression tests for checkpoint_ingest: every parsed page must reach the
+# store, however the futures complete, and a failed commit must surface as is.
+#
+# Usage:
+#     python -m pytest -q test_checkpoint_ingest.py
+
+import concurrent.futures
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import checkpoint_ingest
+from GroupProject_Main import find_engine_files
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _wait_all(fs, return_when=None):
+    """wait() that only returns once every future is done."""
+    return concurrent.futures.wait(fs)
+
+
+class CheckpointIngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="checkpoint_test_")
+        self.folder = os.path.join(self.tmp, "pages")
+        os.mkdir(self.folder)
+        for path in sorted(find_engine_files(HERE))[:4]:
+            shutil.copy(path, self.folder)
+        self.store = os.path.join(self.tmp, "store.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_all_futures_finishing_in_one_wait(self):
+        # workers=1 -> 2 pages in flight: the last pages fill the window and
+        # all complete in the same wait, with no full checkpoint batch yet
+        with mock.patch.object(checkpoint_ingest, "wait", _wait_all):
+            engine_list = checkpoint_ingest.ingest_checkpointed(self.folder, self.store,
+                                                                workers=1, batch_files=32)
+        self.assertEqual(len(engine_list), 4)
+        conn = checkpoint_ingest.open_store(self.store)
+        try:
+            stored = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(stored, 4)
+
+    def test_failed_commit_is_not_retried(self):
+        error = sqlite3.OperationalError("database or disk is full")
+        with mock.patch.object(checkpoint_ingest, "_commit_batch", side_effect=error) as commit:
+            with self.assertRaises(sqlite3.OperationalError) as raised:
+                checkpoint_ingest.ingest_checkpointed(self.folder, self.store,
+                                                      workers=1, batch_files=2)
+        self.assertIs(raised.exception, error)
+        self.assertEqual(commit.call_count, 1)
+
+    def test_rerun_reuses_store(self):
+        first = checkpoint_ingest.ingest_checkpointed(self.folder, self.store, workers=1)
+        with mock.patch.object(checkpoint_ingest, "_parse_file",
+                               side_effect=AssertionError("parsed again")):
+            second = checkpoint_ingest.ingest_checkpointed(self.folder, self.store, workers=1)
+        self.assertEqual([e[0] for e in first], [e[0] for e in second])
+        self.assertEqual([len(e) for e in first], [len(e) for e in second])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# test_snapshots.py
+#
+# Regression tests for the cross-snapshot join in snapshots: rows without an
+# app id (-1) must never be matched with each other.
+#
+# Usage:
+#     python -m pytest -q test_snapshots.py
+
+import unittest
+from datetime import date
+
+from GroupProject_Main import Game
+from engine_core import EngineDataset
+from snapshots import Snapshot, SnapshotCorpus, merge_engine_list
+
+
+def _game(app_id, title, peak):
+    return Game(app_id, title, 9.99, 80.0, "", peak, -1, -1)
+
+
+def _snapshot(day, games):
+    return Snapshot(date(2026, 10, day), EngineDataset(merge_engine_list([["Test Engine"] + games])))
+
+
+class PeakChangesTest(unittest.TestCase):
+
+    def setUp(self):
+        older = _snapshot(17, [_game(-1, "A", 100), _game(-1, "B", 50), _game(10, "Known", 1000)])
+        newer = _snapshot(18, [_game(-1, "C", 7), _game(-1, "A", 120), _game(10, "Known", 1500)])
+        self.corpus = SnapshotCorpus([newer, older])
+
+    def test_rows_without_app_id_are_not_joined(self):
+        changes = self.corpus.peak_changes()
+        self.assertEqual([(r["app_id"], r["change"]) for r in changes], [(10, 500)])
+
+    def test_engine_totals_only_count_joined_games(self):
+        (totals,) = self.corpus.engine_peak_changes()
+        self.assertEqual((totals["games"], totals["change"]), (1, 500))
+
+    def test_peak_history(self):
+        self.assertEqual(self.corpus.peak_history(-1), [])
+        self.assertEqual([peak for _, peak in self.corpus.peak_history(10)], [1000, 1500])
+
+
+if __name__ == "__main__":
+    unittest.main()